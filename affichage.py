@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Affichage
+Description : Console créée au premier affichage, pour ne pas importer Rich au chargement des
+              modules, et console texte de secours lorsque Rich n'est pas installé (service,
+              traitement par lot).
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import re
+import sys
+
+# Définition des constantes
+BALISES_RICH = re.compile(r"\[/?[a-zA-Z#][^\[\]]*\]|\[/\]") # Balises de style Rich ([green], [/bold], [/]...)
+
+
+# Définition des classes
+class ConsoleTexte:
+    """Classe représentant une console minimale, sans couleurs, utilisée lorsque Rich est absent."""
+
+    def __init__(self, stderr=False, **options):
+        """Constructeur de la console.
+
+        Args:
+            stderr (bool): Écrire sur la sortie d'erreur plutôt que sur la sortie standard.
+            options: Options de `rich.console.Console`, ignorées.
+        """
+        self.stderr = stderr
+        self._fichier = options.get("file")
+
+    @property
+    def file(self):
+        return self._fichier or (sys.stderr if self.stderr else sys.stdout)
+
+    def print(self, *objets, **options):
+        """Méthode pour afficher des textes, balises Rich retirées."""
+        print(*(BALISES_RICH.sub("", str(objet)) for objet in objets), file=self.file)
+
+    def print_json(self, json):
+        """Méthode pour afficher un texte JSON."""
+        print(json, file=self.file)
+
+
+class ConsoleParesseuse:
+    """Classe représentant une console dont la création (et l'import de Rich) est différée.
+
+    Elle s'utilise comme `rich.console.Console` : le premier attribut lu ou modifié crée
+    la vraie console Rich, ou une `ConsoleTexte` si Rich n'est pas installé.
+    """
+
+    def __init__(self, **options):
+        """Constructeur de la console.
+
+        Args:
+            options: Options transmises à `rich.console.Console` lors de sa création.
+        """
+        object.__setattr__(self, "_options", options)
+        object.__setattr__(self, "_console", None)
+
+    def obtenir(self):
+        """Méthode pour obtenir la console réelle, en la créant si nécessaire.
+
+        Returns:
+            Console: Console Rich, ou `ConsoleTexte` sans Rich.
+        """
+        if self._console is None:
+            try:
+                from rich.console import Console
+            except ImportError: # Rich absent : affichage en texte brut
+                Console = ConsoleTexte
+            object.__setattr__(self, "_console", Console(**self._options))
+        return self._console
+
+    def __getattr__(self, nom):
+        return getattr(self.obtenir(), nom)
+
+    def __setattr__(self, nom, valeur):
+        setattr(self.obtenir(), nom, valeur)
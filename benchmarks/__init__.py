@@ -0,0 +1 @@
+"""Mesures de performance de la bibliothèque numérique (voir `python -m benchmarks --help`)."""
@@ -0,0 +1,15 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Lancement des mesures de performance
+Description : Point d'entrée de `python -m benchmarks`.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+from benchmarks.executer import main
+
+# Programme principal
+if __name__ == "__main__":
+    main()
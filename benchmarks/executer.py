@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Mesures de performance
+Description : Mesures répétables des fonctions de `bibliotheque.py` sur des catalogues
+              synthétiques de 10^3 à 10^6 livres, dans un dossier temporaire et avec une
+              console muette, et résultats en JSON pour comparer deux versions.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from rich.console import Console
+import bibliotheque
+from benchmarks.generateur import ecrire_catalogue
+
+# Définition des constantes
+TAILLES = (1000, 10000, 100000) # Tailles mesurées par défaut (jusqu'à 1000000 avec --tailles)
+REPETITIONS = 5 # Nombre de mesures par fonction, dont on garde le minimum et la médiane
+RECHERCHES = (("titre", "dragon"), ("auteur", "hugo"), ("genre", "fantasy"), ("titre", "tome 3"))
+REQUETES = ( # Requêtes multicritères : plusieurs index, un seul intervalle, aucun index
+    {"genre": "Fantasy", "disponible": True, "annee_min": 1990, "annee_max": 2005, "prix_max": 15},
+    {"prix_min": 10, "prix_max": 11},
+    {"note_min": 4},
+)
+RECHERCHES_APPROCHEES = ("tolkein", "dragon tome", "emile zola policier") # Fautes de frappe, plusieurs mots, accents omis
+
+
+# Définition des fonctions
+def mesurer(fonction, repetitions=REPETITIONS, preparer=None):
+    """Fonction pour mesurer la durée d'une fonction sur plusieurs répétitions.
+
+    Args:
+        fonction (callable): Fonction mesurée, sans argument.
+        repetitions (int): Nombre de mesures.
+        preparer (callable): Fonction appelée avant chaque mesure, hors chronométrage.
+    Returns:
+        dict: Durées `min`, `mediane` et `max` (secondes) et nombre de `repetitions`.
+    """
+    durees = []
+    for _ in range(repetitions):
+        if preparer is not None:
+            preparer()
+        debut = time.perf_counter()
+        fonction()
+        durees.append(time.perf_counter() - debut)
+    return {"min": min(durees), "mediane": statistics.median(durees), "max": max(durees), "repetitions": repetitions}
+
+
+def _vider_caches_tri(livres):
+    livres.invalider_tris() # Mesure à froid : le tri est refait
+
+
+def mesurer_taille(taille, dossier, repetitions=REPETITIONS, graine=0):
+    """Fonction pour mesurer toutes les fonctions sur un catalogue synthétique d'une taille donnée.
+
+    Args:
+        taille (int): Nombre de livres du catalogue.
+        dossier (str): Dossier de travail (temporaire).
+        repetitions (int): Nombre de mesures par fonction.
+        graine (int): Graine du générateur de catalogue.
+    Returns:
+        list: Résultats, un dictionnaire par fonction mesurée.
+    """
+    chemin = os.path.join(dossier, f"catalogue_{taille}.json")
+    chemin_journal = os.path.join(dossier, f"catalogue_{taille}.journal")
+    ecrire_catalogue(chemin, taille, graine)
+    resultats = []
+
+    def ajouter(nom, mesure, **details):
+        resultats.append({"taille": taille, "fonction": nom, **details, **mesure})
+
+    # Chargement depuis le JSON puis depuis le cache binaire (le journal est vidé avant chaque mesure pour ne rien rejouer)
+    def vider_journal():
+        if os.path.exists(chemin_journal):
+            os.remove(chemin_journal)
+
+    ajouter("charger_bibliotheque", mesurer(lambda: bibliotheque.charger_bibliotheque(chemin, chemin_journal, utiliser_cache=False).journal.fermer(), repetitions, vider_journal), source="json")
+    livres = bibliotheque.charger_bibliotheque(chemin, chemin_journal) # Écriture du cache binaire
+    livres.journal.fermer()
+    ajouter("charger_bibliotheque", mesurer(lambda: bibliotheque.charger_bibliotheque(chemin, chemin_journal).journal.fermer(), repetitions, vider_journal), source="cache")
+    livres = bibliotheque.charger_bibliotheque(chemin, chemin_journal)
+
+    # Sauvegarde complète de l'instantané, après une modification journalisée
+    ajouter("sauvegarder_bibliotheque", mesurer(lambda: bibliotheque.sauvegarder_bibliotheque(livres, chemin, forcer=True), repetitions, lambda: livres.ajouter_note(1, 4)))
+
+    # Recherche, filtre, rapport
+    for critere, valeur in RECHERCHES:
+        ajouter("rechercher_livre", mesurer(lambda: bibliotheque.rechercher_livre(livres, critere, valeur), repetitions), critere=critere, valeur=valeur)
+    ajouter("construction_index_approche", mesurer(lambda: bibliotheque.rechercher_approchee(bibliotheque.Catalogue(livres), "x"), repetitions))
+    for valeur in RECHERCHES_APPROCHEES: # L'index du catalogue est construit par la première mesure
+        ajouter("rechercher_approchee", mesurer(lambda: bibliotheque.rechercher_approchee(livres, valeur), repetitions), valeur=valeur)
+    ajouter("filtrer_par_genre", mesurer(lambda: bibliotheque.filtrer_par_genre(livres, "Policier"), repetitions))
+    for criteres in REQUETES: # Les index des requêtes sont construits par la première mesure
+        ajouter("filtrer_livres", mesurer(lambda: bibliotheque.filtrer_livres(livres, **criteres), repetitions), criteres=json.dumps(criteres))
+    ajouter("generer_rapport", mesurer(lambda: bibliotheque.generer_rapport(livres), repetitions))
+
+    # Affichage d'une page, tri refait (à froid) ou en cache (à chaud)
+    for critere in ("ID", "titre", "prix"):
+        ajouter("afficher_tous_les_livres", mesurer(lambda: bibliotheque.afficher_tous_les_livres(livres, critere), repetitions, lambda: _vider_caches_tri(livres)), critere=critere, cache="froid")
+        ajouter("afficher_tous_les_livres", mesurer(lambda: bibliotheque.afficher_tous_les_livres(livres, critere), repetitions), critere=critere, cache="chaud")
+
+    # Export
+    chemin_csv = os.path.join(dossier, f"catalogue_{taille}.csv")
+    ajouter("export_csv", mesurer(lambda: bibliotheque.export_csv(livres, chemin_csv), repetitions))
+    livres.journal.fermer()
+    return resultats
+
+
+def _version_git():
+    """Fonction pour identifier le commit mesuré (None hors d'un dépôt git)."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def executer(tailles=TAILLES, repetitions=REPETITIONS, graine=0):
+    """Fonction pour lancer toutes les mesures, dans un dossier temporaire et avec une console muette.
+
+    Args:
+        tailles (iterable): Tailles de catalogue à mesurer.
+        repetitions (int): Nombre de mesures par fonction.
+        graine (int): Graine du générateur de catalogue.
+    Returns:
+        dict: Contexte de la mesure (commit, Python, machine, date) et liste des `resultats`.
+    """
+    console_origine = bibliotheque.console
+    resultats = []
+    with open(os.devnull, "w", encoding="utf-8") as nul, tempfile.TemporaryDirectory(prefix="bibliotheque_bench_") as dossier:
+        bibliotheque.console = Console(file=nul, width=120) # Le rendu Rich est fait, mais rien n'est affiché
+        try:
+            for taille in tailles:
+                resultats.extend(mesurer_taille(taille, dossier, repetitions, graine))
+        finally:
+            bibliotheque.console = console_origine
+    return {
+        "commit": _version_git(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "graine": graine,
+        "resultats": resultats,
+    }
+
+
+def _cle(resultat):
+    """Fonction pour identifier une mesure (taille, fonction et paramètres) entre deux fichiers."""
+    return tuple(sorted((cle, str(valeur)) for cle, valeur in resultat.items() if cle not in ("min", "mediane", "max", "repetitions")))
+
+
+def comparer(reference, actuel):
+    """Fonction pour comparer deux fichiers de résultats, mesure par mesure.
+
+    Args:
+        reference (dict): Résultats de référence (version précédente).
+        actuel (dict): Nouveaux résultats.
+    Returns:
+        list: Couples (mesure, rapport des durées minimales actuel / référence), du plus lent au plus rapide.
+    """
+    anciens = {_cle(resultat): resultat for resultat in reference["resultats"]}
+    rapports = []
+    for resultat in actuel["resultats"]:
+        ancien = anciens.get(_cle(resultat))
+        if ancien is not None and ancien["min"] > 0:
+            rapports.append((resultat, resultat["min"] / ancien["min"]))
+    return sorted(rapports, key=lambda rapport: rapport[1], reverse=True)
+
+
+def main():
+    """Fonction principale : lancement des mesures en ligne de commande."""
+    analyseur = argparse.ArgumentParser(description="Mesures de performance de la bibliothèque numérique.")
+    analyseur.add_argument("--tailles", type=int, nargs="+", default=TAILLES, help="Tailles de catalogue (nombre de livres)")
+    analyseur.add_argument("--repetitions", type=int, default=REPETITIONS, help="Nombre de mesures par fonction")
+    analyseur.add_argument("--graine", type=int, default=0, help="Graine du générateur de catalogue")
+    analyseur.add_argument("--sortie", default="resultats_benchmarks.json", help="Fichier JSON des résultats")
+    analyseur.add_argument("--comparer", help="Fichier de résultats de référence à comparer")
+    arguments = analyseur.parse_args()
+
+    console = Console()
+    resultats = executer(arguments.tailles, arguments.repetitions, arguments.graine)
+    with open(arguments.sortie, "w", encoding="utf-8") as f:
+        json.dump(resultats, f, ensure_ascii=False, indent=4)
+    for resultat in resultats["resultats"]:
+        details = ", ".join(f"{cle}={valeur}" for cle, valeur in resultat.items() if cle not in ("taille", "fonction", "min", "mediane", "max", "repetitions"))
+        console.print(f"{resultat['taille']:>8} {resultat['fonction']:<26} {resultat['min'] * 1000:>10.2f} ms  {details}")
+    console.print(f"[green]Résultats écrits dans '{arguments.sortie}'.[/green]")
+
+    if arguments.comparer: # Comparaison avec une version précédente
+        with open(arguments.comparer, "r", encoding="utf-8") as f:
+            reference = json.load(f)
+        for resultat, rapport in comparer(reference, resultats):
+            couleur = "red" if rapport > 1.1 else "green" if rapport < 0.9 else "white"
+            console.print(f"[{couleur}]{rapport:>6.2f}×[/{couleur}] {resultat['taille']:>8} {resultat['fonction']}")
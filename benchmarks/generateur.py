@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Générateur de catalogues synthétiques
+Description : Génération déterministe (graine fixe) de catalogues réalistes pour les mesures
+              de performance : titres composés, auteurs et genres répartis selon une loi de
+              Zipf, années, prix et notes plausibles.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import itertools
+import json
+import random
+from notation import calculer_moyenne
+
+# Définition des constantes
+GENRES = (
+    "Roman", "Fantasy", "Science-fiction", "Policier", "Thriller", "Jeunesse", "Biographie",
+    "Histoire", "Poésie", "Théâtre", "Bande dessinée", "Essai", "Horreur", "Aventure",
+    "Philosophie", "Cuisine", "Voyage", "Sciences", "Art", "Humour",
+)
+PRENOMS = (
+    "Jean", "Marie", "Pierre", "Anne", "Victor", "Émile", "Albert", "Simone", "George", "Agatha",
+    "Jules", "Marguerite", "Antoine", "Colette", "Stephen", "Haruki", "Isaac", "Ursula", "Boris", "Amélie",
+)
+NOMS = (
+    "Hugo", "Zola", "Camus", "Beauvoir", "Sand", "Christie", "Verne", "Duras", "Saint-Exupéry", "Dumas",
+    "King", "Murakami", "Asimov", "Le Guin", "Vian", "Nothomb", "Balzac", "Flaubert", "Proust", "Rowling",
+    "Tolkien", "Herbert", "Orwell", "Huxley", "Martin", "Pennac", "Modiano", "Ernaux", "Musso", "Levy",
+)
+DEBUTS_TITRE = ("Le", "La", "Les", "Un", "Une", "L'Ombre du", "Le Secret de la", "Les Chroniques de", "Le Dernier", "La Nuit du")
+MOTS_TITRE = (
+    "voyage", "château", "mer", "forêt", "étoile", "silence", "jardin", "royaume", "mémoire", "tempête",
+    "miroir", "dragon", "horizon", "cité", "désert", "hiver", "printemps", "labyrinthe", "passager", "océan",
+    "lumière", "sorcier", "prince", "archipel", "montagne", "rivière", "empire", "oracle", "enquête", "île",
+)
+SUITES_TITRE = ("", "", "", " perdu", " oublié", " éternel", " de minuit", " des ombres", " d'argent", " sans fin")
+ANNEE_MIN, ANNEE_MAX = 1850, 2024
+
+
+# Définition des fonctions
+def _poids_zipf(nombre, exposant=1.1):
+    """Fonction pour calculer les poids cumulés d'une loi de Zipf sur `nombre` valeurs."""
+    return list(itertools.accumulate(1 / rang ** exposant for rang in range(1, nombre + 1)))
+
+
+def generer_livres(nombre, graine=0, ancien_format=False):
+    """Fonction pour générer des livres synthétiques de façon déterministe.
+
+    Une même graine produit toujours le même catalogue. Quelques genres et auteurs
+    concentrent la plupart des livres (loi de Zipf), les années suivent une répartition
+    plus dense pour les livres récents et environ un livre sur trois a reçu des notes.
+
+    Args:
+        nombre (int): Nombre de livres à générer.
+        graine (int): Graine du générateur aléatoire.
+        ancien_format (bool): Générer la liste `notes` de l'ancien format plutôt que la répartition.
+    Yields:
+        dict: Livre au format du fichier `bibliotheque.json`, IDs de 1 à `nombre`.
+    """
+    generateur = random.Random(graine)
+    auteurs = [f"{prenom} {nom}" for nom in NOMS for prenom in PRENOMS]
+    generateur.shuffle(auteurs)
+    poids_auteurs, poids_genres = _poids_zipf(len(auteurs)), _poids_zipf(len(GENRES))
+    for id_livre in range(1, nombre + 1):
+        titre = f"{generateur.choice(DEBUTS_TITRE)} {generateur.choice(MOTS_TITRE)}{generateur.choice(SUITES_TITRE)}"
+        if generateur.random() < 0.3: # Suites et tomes
+            titre += f", tome {generateur.randint(1, 12)}"
+        annee = ANNEE_MAX - int(generateur.expovariate(1 / 25)) % (ANNEE_MAX - ANNEE_MIN)
+        prix = round(min(generateur.lognormvariate(2.6, 0.5), 150.0), 2)
+        notes = [min(5, max(1, round(generateur.gauss(3.6, 1.0)))) for _ in range(generateur.choice((0, 0, 1, 3, 8)))]
+        livre = {
+            "id": id_livre,
+            "titre": titre,
+            "auteur": generateur.choices(auteurs, cum_weights=poids_auteurs)[0],
+            "genre": generateur.choices(GENRES, cum_weights=poids_genres)[0],
+            "année_publication": annee,
+            "prix": prix,
+            "disponible": generateur.random() < 0.85,
+        }
+        if ancien_format:
+            livre["notes"] = notes
+        else:
+            repartition = [notes.count(etoiles) for etoiles in range(1, 6)]
+            livre["repartition_notes"] = repartition
+            livre["note_moyenne"] = calculer_moyenne(repartition)
+        yield livre
+
+
+def ecrire_catalogue(chemin, nombre, graine=0, ancien_format=False):
+    """Fonction pour écrire un catalogue synthétique au format de `bibliotheque.json`, en flux.
+
+    Le fichier est indenté comme celui de l'application, sans garder les livres en mémoire.
+
+    Args:
+        chemin (str): Chemin du fichier JSON à écrire.
+        nombre (int): Nombre de livres.
+        graine (int): Graine du générateur aléatoire.
+        ancien_format (bool): Générer la liste `notes` de l'ancien format.
+    """
+    with open(chemin, "w", encoding="utf-8") as f:
+        f.write("[")
+        for index, livre in enumerate(generer_livres(nombre, graine, ancien_format)):
+            texte = json.dumps(livre, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            f.write(("," if index else "") + "\n    " + texte)
+        f.write("\n]" if nombre else "]")
@@ -8,73 +8,163 @@ Date : 2025
 """
 
 # Importation des modules nécessaires
-import csv
-import datetime
-import json
 import os
-from rich.console import Console
-from rich.table import Table
-from rich.prompt import Prompt
-from rich.panel import Panel
+import shutil
+import sqlite3
+from affichage import ConsoleParesseuse
+from catalogue import Catalogue
+from journal import Journal, empreinte_instantane
+from index_texte import IndexTrigrammes
+from recherche_approchee import NOMBRE_RESULTATS, IndexApproche
+from requetes import CRITERES, IndexRequetes
+from chargement import LecteurLivres
+from statistiques import Statistiques
+from notation import HistoriqueNotes, ajouter_note, migrer_notes, note_moyenne
+from livre import Livre, valider_livre
+from exportation import SORTIE_STANDARD, exporter_livres
+from stockage import MOTEURS, StatistiquesSQLite, StockageSQLite
+from operations import attribuer_note, changer_disponibilite, creer_livre, retirer_livre
+from instrumentation import compter_octets, mesure
+from cache_instantane import chemin_cache, charger_cache, ecrire_cache
+from sauvegarde import ecrire_instantane_atomique, installer_instantane
 
 
 # Définition des constantes
-console = Console()
+console = ConsoleParesseuse() # Rich n'est importé qu'au premier affichage
+FICHIER_BIBLIOTHEQUE = "bibliotheque.json" # Instantané complet de la bibliothèque
+FICHIER_JOURNAL = "bibliotheque.journal" # Journal des modifications depuis le dernier instantané (`chemin_journal(FICHIER_BIBLIOTHEQUE)`)
+FICHIER_HISTORIQUE_NOTES = "bibliotheque_notes.jsonl" # Historique détaillé des notes (facultatif)
+FICHIER_CSV = "bibliotheque.csv" # Destination par défaut de l'export
+FICHIER_SQLITE = "bibliotheque.db" # Base du moteur de stockage SQLite
+MOTEUR_STOCKAGE = os.environ.get("BIBLIOTHEQUE_MOTEUR", "json") # Moteur de stockage par défaut ("json" ou "sqlite")
+SEUIL_POINT_CONTROLE = 500 # Nombre d'opérations journalisées avant compaction dans l'instantané
+SEUIL_PROGRESSION = 10 << 20 # Taille de fichier (octets) à partir de laquelle la progression du chargement s'affiche
+PAS_PROGRESSION = 10000 # Nombre de livres chargés entre deux mises à jour de la progression
+TAILLE_PAGE = 20 # Nombre de livres affichés par page
 
 # Définition des fonctions
+def chemin_journal(chemin):
+    """Fonction pour obtenir le chemin du journal associé à un instantané JSON.
+
+    Chaque instantané a son propre journal (`bibliotheque.json` → `bibliotheque.journal`) :
+    charger un autre fichier ne touche jamais au journal de la bibliothèque principale.
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+    Returns:
+        str: Chemin du journal.
+    """
+    return os.path.splitext(chemin)[0] + ".journal"
+
+
+def _trouver_livre(livres, id_livre):
+    """Fonction pour retrouver un livre par son ID, en temps constant sur un `Catalogue`.
+
+    Args:
+        livres (Catalogue | list): Livres dans lesquels chercher.
+        id_livre (int): ID du livre recherché.
+    Returns:
+        dict: Le livre trouvé, ou None.
+    """
+    if isinstance(livres, Catalogue): # Accès direct par l'index du catalogue
+        return livres.get(id_livre)
+    return next((livre for livre in livres if livre["id"] == id_livre), None) # Parcours d'une simple liste
+
+
+def _definir_disponibilite(livres, livre, disponible):
+    """Fonction pour changer la disponibilité d'un livre, en passant par le catalogue s'il y en a un.
+
+    Avec le stockage SQLite, le changement est d'abord validé dans la base par un
+    comparer-et-échanger : si un autre poste a modifié le livre entre-temps, le catalogue
+    est simplement remis à jour et le changement est refusé.
+
+    Returns:
+        bool: True si la disponibilité a changé.
+    """
+    if isinstance(livres, Catalogue): # Comparer-et-échanger, le catalogue notifie le journal
+        return changer_disponibilite(livres, livre["id"], disponible)
+    livre["disponible"] = disponible
+    return True
+
+
+def _signaler_echec_journal(livres, erreur):
+    """Fonction pour signaler qu'une modification faite dans le catalogue n'a pas pu être écrite dans le journal.
+
+    La modification reste en mémoire et sera intégrée à la prochaine sauvegarde.
+    """
+    chemin = getattr(getattr(livres, "journal", None), "chemin", FICHIER_JOURNAL)
+    console.print(f"[red]Erreur : Impossible de sauvegarder dans '{chemin}' ({erreur}). La modification sera enregistrée à la prochaine sauvegarde.[/red]")
+
+
+@mesure
 def ajouter_livre(livres, titre, auteur, genre, annee, prix):
     """Fonction pour ajouter un nouveau livre à la bibliothèque avec ID unique.
     
     Args:
+        livres (list): Liste des livres.
         titre (str): Titre du livre.
         auteur (str): Auteur du livre.
         genre (str): Genre du livre.
         annee (int): Année de publication.
         prix (float): Prix du livre.
     """
-    # Vérification des données manquantes
-    donnees_manquantes = [nom for nom, val in {"titre": titre, "auteur": auteur, "genre": genre, "année de publication": annee, "prix": prix}.items() if not val]
-    # Si des données sont manquantes, on affiche un message d'erreur clair
-    if donnees_manquantes:
-        console.print(f"[red]Erreur : Les données suivantes sont manquantes :[/red] {', '.join(donnees_manquantes)}")
-        return
-    
-    # Vérification de la validité des données (année, prix positif, etc.)
-    if not isinstance(annee, int) or annee < 1000 or annee > datetime.datetime.now().year:
-        console.print("[red]Erreur : L'année de publication doit être un entier valide entre 0 et l'année actuelle.[/red]")
-        return
-    if not isinstance(prix, (int, float)) or prix < 0:
-        console.print("[red]Erreur : Le prix doit être un nombre positif.[/red]")
+    # Vérification des données manquantes et de leur validité (année, prix positif, etc.)
+    erreur = valider_livre(titre, auteur, genre, annee, prix)
+    if erreur: # Affichage d'un message d'erreur clair
+        console.print(f"[red]Erreur : {erreur}[/red]")
         return
-    
-    # Ajout du livre avec un ID unique
-    livre_id = len(livres) + 1
-    livres.append({
-        "id": livre_id,
-        "titre": titre, 
-        "auteur": auteur, 
-        "genre": genre, 
-        "année_publication": annee, 
-        "prix": prix, 
-        "disponible": True, # Livre disponible par défaut
-        "notes": [] # Liste pour stocker les notes des utilisateurs
-    })
+
+    # Ajout du livre avec un ID unique, disponible par défaut et sans note
+    if isinstance(livres, Catalogue): # ID jamais attribué, pris dans la base avec le stockage SQLite
+        try:
+            livre_id = creer_livre(livres, titre, auteur, genre, annee, prix)["id"]
+        except sqlite3.Error as erreur_base:
+            console.print(f"[red]Erreur : Impossible d'ajouter le livre dans la base ({erreur_base}).[/red]")
+            return
+        except OSError as erreur: # Catalogue modifié, mais journal non écrit
+            _signaler_echec_journal(livres, erreur)
+            return
+    else:
+        livre_id = max((livre["id"] for livre in livres), default=0) + 1
+        livres.append(Livre(livre_id, titre, auteur, genre, annee, prix))
     console.print(f"[green]Livre '{titre}' ajouté avec l'ID {livre_id}.[/green]")
 
 
-def afficher_tous_les_livres(livres, critere_tri="ID"):
-    """Fonction pour afficher tous les livres de la bibliothèque de manière lisible, triers par un critère spécifié (ID, titre, auteur, prix).
+@mesure
+def afficher_tous_les_livres(livres, critere_tri="ID", page=1, taille_page=TAILLE_PAGE):
+    """Fonction pour afficher une page des livres de la bibliothèque de manière lisible, triers par un critère spécifié (ID, titre, auteur, prix).
+
+    Seules les lignes de la page demandée sont mises en forme. Sur un `Catalogue`, l'ordre
+    de tri est mis en cache jusqu'au prochain ajout ou suppression.
 
     Args:
         livres (list): Liste des livres à afficher.
-        critere_tri (str): Critère de tri ("ID", "titre", "auteur", "prix").
+        critere_tri (str): Critère de tri ("ID", "titre", "auteur", "prix", ou "pertinence" pour garder l'ordre reçu).
+        page (int): Numéro de la page à afficher (à partir de 1).
+        taille_page (int): Nombre de livres par page.
+    Returns:
+        int: Nombre total de pages (0 si aucun livre).
     """
     # Vérification si la liste des livres est vide
     if not livres:
         console.print("[yellow]Aucun livre dans la bibliothèque.[/yellow]")
-        return
-    
+        return 0
+
+    # Tri des livres selon le critère, mis en cache par le catalogue
+    champ = critere_tri.lower()
+    if champ == "pertinence": # Résultats déjà classés par la recherche approchée
+        livres_tries = list(livres)
+    elif isinstance(livres, Catalogue):
+        livres_tries = livres.trier(champ, lambda x: x[champ] if champ in x else x["id"])
+    else:
+        livres_tries = sorted(livres, key=lambda x: x[champ] if champ in x else x["id"])
+    # Sélection des seules lignes de la page demandée
+    nombre_pages = (len(livres_tries) + taille_page - 1) // taille_page
+    page = min(max(page, 1), nombre_pages)
+    debut = (page - 1) * taille_page
+
     # Création du tableau avec Rich
+    from rich.table import Table
     table = Table(title="📚 Liste des livres")
     table.add_column("ID", justify="center")
     table.add_column("Titre")
@@ -89,20 +179,22 @@ def afficher_tous_les_livres(livres, critere_tri="ID"):
     couleur_pairs = "on #2c2c2c"      # gris foncé
     couleur_impairs = "on #1f1f1f"    # encore plus foncé
 
-    # Ajout des lignes au tableau
-    livres_tries = sorted(livres, key=lambda x: x[critere_tri.lower()] if critere_tri.lower() in x else x["id"]) # Tri des livres selon le critère
-    for index, livre in enumerate(livres_tries): # Parcours des livres triés avec index pour les couleurs
+    # Ajout des lignes de la page au tableau
+    for index, livre in enumerate(livres_tries[debut:debut + taille_page]): # Parcours des livres de la page avec index pour les couleurs
         dispo = "[green]✔[/]" if livre["disponible"] else "[red]✘[/]" # Indicateur de disponibilité
-        if livre.get("notes"): # Calcul de la note moyenne si des notes existent
-            note_moyenne = f"{sum(livre['notes']) / len(livre['notes']):.2f}/5 ⭐"
+        moyenne = note_moyenne(livre) # Moyenne en cache dans le livre
+        if moyenne is not None: # Affichage de la note moyenne si des notes existent
+            moyenne = f"{moyenne:.2f}/5 ⭐"
         else: # Pas de notes disponibles
-            note_moyenne = "N/A"
+            moyenne = "N/A"
         # Ajout de la ligne avec la couleur appropriée
-        table.add_row(str(livre["id"]), livre["titre"], livre["auteur"], livre["genre"], str(livre["année_publication"]), f"{livre['prix']:.2f}", dispo, note_moyenne, style=couleur_pairs if index % 2 == 0 else couleur_impairs)
+        table.add_row(str(livre["id"]), livre["titre"], livre["auteur"], livre["genre"], str(livre["année_publication"]), f"{livre['prix']:.2f}", dispo, moyenne, style=couleur_pairs if index % 2 == 0 else couleur_impairs)
     console.print(table) # Affichage du tableau
-    console.print(f"[blue]Trié par : {critere_tri}[/blue]") # Affichage du critère de tri
+    console.print(f"[blue]Trié par : {critere_tri} — page {page}/{nombre_pages} ({len(livres_tries)} livres)[/blue]") # Affichage du critère de tri et de la page
+    return nombre_pages
 
 
+@mesure
 def rechercher_livre(livres, critere, valeur):
     """Fonction pour rechercher par titre, auteur ou genre (case-insensitive).
 
@@ -119,6 +211,14 @@ def rechercher_livre(livres, critere, valeur):
         console.print("[red]Erreur : Critère de recherche invalide. Utilisez 'titre', 'auteur' ou 'genre'.[/red]")
         return []
     target = valeur.strip().casefold() # Valeur cible en minuscules pour comparaison
+    # Recherche via l'index de trigrammes lorsque le catalogue en possède un
+    index = getattr(livres, "index_texte", None)
+    if index is not None:
+        ids = index.rechercher(champ, target)
+        stockage = getattr(livres, "stockage", None)
+        if stockage is not None: # Livres ajoutés par un autre poste lus dans la base
+            return stockage.obtenir_livres(livres, ids)
+        return [livres.get(id_livre) for id_livre in ids]
     # Recherche des livres correspondant au critère et à la valeur
     try:
         resultats = [livre for livre in livres if target in str(livre.get(champ, "")).casefold()]
@@ -128,6 +228,30 @@ def rechercher_livre(livres, critere, valeur):
     return resultats
 
 
+@mesure
+def rechercher_approchee(livres, valeur, nombre=NOMBRE_RESULTATS):
+    """Fonction pour rechercher dans le titre, l'auteur et le genre à la fois, en tolérant les fautes de frappe et les accents.
+
+    L'index de la recherche approchée est construit à la première recherche puis tenu à
+    jour par le catalogue ; seuls les `nombre` meilleurs livres sont classés.
+
+    Args:
+        livres (Catalogue | list): Livres dans lesquels chercher.
+        valeur (str): Texte recherché ("tolkein", "miserables"...).
+        nombre (int): Nombre maximal de résultats.
+    Returns:
+        list: Livres les plus proches, du plus pertinent au moins pertinent.
+    """
+    index = getattr(livres, "index_approche", None)
+    if index is None: # Première recherche : construction de l'index
+        index = IndexApproche(livres)
+        if isinstance(livres, Catalogue): # Index conservé et mis à jour à chaque modification
+            livres.index_approche = index
+            livres.abonner(index)
+    return [_trouver_livre(livres, id_livre) for id_livre, _ in index.rechercher(valeur, nombre)]
+
+
+@mesure
 def supprimer_livre(livres, id_livre):
     """Fonction pour supprimer un livre après confirmation.
 
@@ -135,21 +259,31 @@ def supprimer_livre(livres, id_livre):
         livres (list): Liste des livres.
         id_livre (int): ID du livre à supprimer.
     """
-    # Recherche du livre par ID
-    for i, livre in enumerate(livres):
-        if livre["id"] == id_livre: # Livre trouvé
-            # Demander confirmation avant suppression
-            confirmation = Prompt.ask(f"Confirmez-vous la suppression du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
-            if confirmation.lower() == 'oui': # Suppression confirmée
-                del livres[i] # Suppression du livre de la liste
-                console.print(f"[green]Livre ID {id_livre} supprimé.[/green]")
-            else: # Suppression annulée
-                console.print("[yellow]Suppression annulée.[/yellow]")
-            return
-    console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
-    return
-
-
+    livre = _trouver_livre(livres, id_livre) # Recherche du livre par ID
+    if livre is None: # Livre non trouvé
+        console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
+        return
+    # Demander confirmation avant suppression
+    from rich.prompt import Prompt
+    confirmation = Prompt.ask(f"Confirmez-vous la suppression du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
+    if confirmation.lower() == 'oui': # Suppression confirmée
+        if isinstance(livres, Catalogue): # Suppression en temps constant, d'abord dans la base avec le stockage SQLite
+            try:
+                retirer_livre(livres, id_livre)
+            except sqlite3.Error as erreur_base:
+                console.print(f"[red]Erreur : Impossible de supprimer le livre de la base ({erreur_base}).[/red]")
+                return
+            except OSError as erreur: # Catalogue modifié, mais journal non écrit
+                _signaler_echec_journal(livres, erreur)
+                return
+        else: # Suppression dans une simple liste
+            livres.remove(livre)
+        console.print(f"[green]Livre ID {id_livre} supprimé.[/green]")
+    else: # Suppression annulée
+        console.print("[yellow]Suppression annulée.[/yellow]")
+
+
+@mesure
 def emprunter_livre(livres, id_livre):
     """Fonction pour emprunter un livre si disponible, change le statut à "emprunté" avec validation.
 
@@ -157,23 +291,34 @@ def emprunter_livre(livres, id_livre):
         livres (list): Liste des livres.
         id_livre (int): ID du livre à emprunter.
     """
-    # Recherche du livre par ID
-    for livre in livres:
-        if livre["id"] == id_livre: # Livre trouvé
-            if livre["disponible"]: # Vérification de la disponibilité
-                # Demander confirmation avant emprunt
-                confirmation = Prompt.ask(f"Confirmez-vous l'emprunt du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
-                if confirmation.lower() == 'oui': # Emprunt confirmé
-                    livre["disponible"] = False # Changement du statut à emprunté
-                    console.print(f"[green]Livre ID {id_livre} emprunté avec succès.[/green]")
-                else: # Emprunt annulé
-                    console.print("[yellow]Emprunt annulé.[/yellow]")
-            else: # Livre non disponible
-                console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) n'est pas disponible pour l'emprunt.[/red]")
-            return
-    console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
-
-
+    livre = _trouver_livre(livres, id_livre) # Recherche du livre par ID
+    if livre is None: # Livre non trouvé
+        console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
+        return
+    if livre["disponible"]: # Vérification de la disponibilité
+        # Demander confirmation avant emprunt
+        from rich.prompt import Prompt
+        confirmation = Prompt.ask(f"Confirmez-vous l'emprunt du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
+        if confirmation.lower() == 'oui': # Emprunt confirmé
+            try:
+                emprunte = _definir_disponibilite(livres, livre, False) # Changement du statut à emprunté
+            except sqlite3.Error as erreur_base:
+                console.print(f"[red]Erreur : Impossible d'enregistrer l'emprunt dans la base ({erreur_base}).[/red]")
+                return
+            except OSError as erreur: # Catalogue modifié, mais journal non écrit
+                _signaler_echec_journal(livres, erreur)
+                return
+            if emprunte:
+                console.print(f"[green]Livre ID {id_livre} emprunté avec succès.[/green]")
+            else: # Emprunté depuis un autre poste entre-temps
+                console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) vient d'être emprunté depuis un autre poste.[/red]")
+        else: # Emprunt annulé
+            console.print("[yellow]Emprunt annulé.[/yellow]")
+    else: # Livre non disponible
+        console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) n'est pas disponible pour l'emprunt.[/red]")
+
+
+@mesure
 def retourner_livre(livres, id_livre):
     """Fonction pour retourner un livre emprunté, change le statut à "disponible" avec validation.
 
@@ -181,23 +326,35 @@ def retourner_livre(livres, id_livre):
         livres (list): Liste des livres.
         id_livre (int): ID du livre à retourner.
     """
-    for livre in livres: # Recherche du livre par ID
-        if livre["id"] == id_livre: # Livre trouvé
-            if not livre["disponible"]: # Vérification si le livre est emprunté
-                # Demander confirmation avant retour
-                confirmation = Prompt.ask(f"Confirmez-vous le retour du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
-                if confirmation.lower() == 'oui': # Retour confirmé
-                    livre["disponible"] = True # Changement du statut à disponible
-                    noter_livre(livres, id_livre) # Appel de la fonction pour noter le livre après retour
-                    console.print(f"[green]Livre ID {id_livre} retourné avec succès.[/green]")
-                else: # Retour annulé
-                    console.print("[yellow]Retour annulé.[/yellow]")
-            else: # Livre déjà disponible
-                console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) n'était pas emprunté.[/red]")
-            return
-    console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
-
-
+    livre = _trouver_livre(livres, id_livre) # Recherche du livre par ID
+    if livre is None: # Livre non trouvé
+        console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
+        return
+    if not livre["disponible"]: # Vérification si le livre est emprunté
+        # Demander confirmation avant retour
+        from rich.prompt import Prompt
+        confirmation = Prompt.ask(f"Confirmez-vous le retour du livre '{livre['titre']}' (ID {id_livre}) ?", choices=["Oui", "Non"], default="Non")
+        if confirmation.lower() == 'oui': # Retour confirmé
+            try:
+                retourne = _definir_disponibilite(livres, livre, True) # Changement du statut à disponible
+            except sqlite3.Error as erreur_base:
+                console.print(f"[red]Erreur : Impossible d'enregistrer le retour dans la base ({erreur_base}).[/red]")
+                return
+            except OSError as erreur: # Catalogue modifié, mais journal non écrit
+                _signaler_echec_journal(livres, erreur)
+                return
+            if not retourne:
+                console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) vient d'être retourné depuis un autre poste.[/red]")
+                return
+            noter_livre(livres, id_livre) # Appel de la fonction pour noter le livre après retour
+            console.print(f"[green]Livre ID {id_livre} retourné avec succès.[/green]")
+        else: # Retour annulé
+            console.print("[yellow]Retour annulé.[/yellow]")
+    else: # Livre déjà disponible
+        console.print(f"[red]Erreur : Le livre '{livre['titre']}' (ID {id_livre}) n'était pas emprunté.[/red]")
+
+
+@mesure
 def filtrer_par_genre(livres, genre):
     """Fonction pour filtrer les livres par un genre spécifique.
 
@@ -209,10 +366,51 @@ def filtrer_par_genre(livres, genre):
     """
     # Normalisation du genre pour la comparaison insensible à la casse
     genre_cible = genre.strip().casefold()
+    stockage = getattr(livres, "stockage", None)
+    if stockage is not None: # Filtrage par l'index SQL sur le genre
+        return stockage.obtenir_livres(livres, stockage.filtrer_genre(genre_cible))
     livres_filtres = [livre for livre in livres if livre["genre"].casefold() == genre_cible] # Filtrage des livres par genre
     return livres_filtres
 
 
+@mesure
+def filtrer_livres(livres, expliquer=False, **criteres):
+    """Fonction pour filtrer les livres sur plusieurs critères à la fois.
+
+    Les index des requêtes sont construits au premier filtrage puis tenus à jour par le
+    catalogue ; les critères sont combinés en partant de l'index le plus sélectif.
+
+    Args:
+        livres (Catalogue | list): Livres à filtrer.
+        expliquer (bool): Afficher le plan d'exécution (index utilisés, livres restants à chaque étape).
+        criteres: Critères facultatifs `genre` (exact), `auteur` (contenu dans le nom), `annee_min`,
+            `annee_max`, `prix_min`, `prix_max` (bornes incluses), `disponible` (bool) et `note_min`.
+    Returns:
+        list: Livres qui vérifient tous les critères, par ID croissant.
+    """
+    inconnus = set(criteres) - set(CRITERES)
+    if inconnus: # Vérification des critères valides
+        console.print(f"[red]Erreur : Critère(s) inconnu(s) : {', '.join(sorted(inconnus))}.[/red]")
+        return []
+    index = getattr(livres, "index_requetes", None)
+    if index is None: # Premier filtrage : construction des index
+        index = IndexRequetes(livres)
+        if isinstance(livres, Catalogue): # Index conservés et mis à jour à chaque modification
+            livres.index_requetes = index
+            livres.abonner(index)
+    if isinstance(livres, Catalogue):
+        ids, plan = index.rechercher(criteres, livres.get, livres.index_texte)
+        resultats = [livres.get(id_livre) for id_livre in ids]
+    else:
+        par_id = {livre["id"]: livre for livre in livres}
+        ids, plan = index.rechercher(criteres, par_id.get)
+        resultats = [par_id[id_livre] for id_livre in ids]
+    if expliquer: # Affichage du plan d'exécution
+        console.print("[blue]Plan : " + " → ".join(f"{nom} ({methode}, {nombre} livres)" for nom, methode, nombre in plan) + "[/blue]")
+    return resultats
+
+
+@mesure
 def noter_livre(livres, id_livre):
     """Fonction pour noter un livre sur une échelle de 1 à 5.
 
@@ -221,65 +419,60 @@ def noter_livre(livres, id_livre):
         id_livre (int): ID du livre à noter.
         note (int): Note à attribuer (1 à 5).
     """
+    from rich.panel import Panel
+    from rich.prompt import Prompt
     console.print(Panel.fit(f"[bold]Notation du livre ID {id_livre}[/bold]", style="green"))
     console.print("Qu'avez-vous pensé de ce livre ?")
     note = int(Prompt.ask("Entrez la note (1 à 5)")) # Note à attribuer
     if note < 1 or note > 5: # Vérification de la validité de la note
         console.print("[red]Erreur : La note doit être entre 1 et 5.[/red]")
         return
-    for livre in livres: # Recherche du livre par ID
-        if livre["id"] == id_livre: # Livre trouvé
-            livre.setdefault("notes", []).append(note) # Ajout de la note à la liste des notes
-            note_emoji = "⭐" * note # Représentation visuelle de la note
-            console.print(f"[green]Livre ID {id_livre} noté {note}/5 {note_emoji}.[/green]")
+    livre = _trouver_livre(livres, id_livre) # Recherche du livre par ID
+    if livre is None: # Livre non trouvé
+        console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
+        return
+    if isinstance(livres, Catalogue): # Ajout de la note via le catalogue, qui notifie le journal
+        try:
+            attribuer_note(livres, id_livre, note)
+        except sqlite3.Error as erreur_base:
+            console.print(f"[red]Erreur : Impossible d'enregistrer la note dans la base ({erreur_base}).[/red]")
+            return
+        except OSError as erreur: # Catalogue modifié, mais journal non écrit
+            _signaler_echec_journal(livres, erreur)
             return
-    console.print(f"[red]Erreur : Livre avec ID {id_livre} non trouvé.[/red]")
+    else: # Ajout de la note à la répartition des notes du livre
+        ajouter_note(livre, note)
+    note_emoji = "⭐" * note # Représentation visuelle de la note
+    console.print(f"[green]Livre ID {id_livre} noté {note}/5 {note_emoji}.[/green]")
 
 
+@mesure
 def generer_rapport(livres):
     """Fonction pour afficher des statistiques sur la bibliothèque : nombre total, disponibles, empruntés, prix total, genre le plus représenté, livres les plus/moins chers.
 
     Args:
         livres (list): Liste des livres.
     """
-    # Calcul des statistiques de base
-    total_livres = len(livres)
-    livres_disponibles = sum(1 for livre in livres if livre["disponible"])
+    # Statistiques tenues à jour par le catalogue, ou calculées en un seul passage pour une simple liste
+    stats = getattr(livres, "statistiques", None) or Statistiques(livres)
+    total_livres = stats.total
+    livres_disponibles = stats.disponibles
     livres_empruntes = total_livres - livres_disponibles  # Calcul des livres empruntés
-    prix_total = sum(livre["prix"] for livre in livres) # Somme des prix de tous les livres
-    
-    # Calcul du genre le plus représenté
-    genres_count = {}
-    for livre in livres: # Comptage des genres
-        genre = livre["genre"] # Récupération du genre du livre
-        genres_count[genre] = genres_count.get(genre, 0) + 1 # Incrémentation du compteur pour le genre
-    genre_plus_represente = max(genres_count, key=genres_count.get) if genres_count else "N/A" # Genre avec le maximum de livres
-    
+    prix_total = stats.prix_total # Somme des prix de tous les livres
+    genre_plus_represente = stats.genre_plus_represente() or "N/A" # Genre avec le maximum de livres
+
     # Livres les plus chers et les moins chers
-    if livres: # Vérification si la liste des livres n'est pas vide
-        livre_plus_cher = max(livres, key=lambda x: x["prix"]) # Livre avec le prix maximum
-        livre_moins_cher = min(livres, key=lambda x: x["prix"]) # Livre avec le prix minimum
-    else: # Liste vide
-        livre_plus_cher = livre_moins_cher = {"titre": "N/A", "prix": 0}
-
-    # Livre le plus apprécié
-    livres_avec_notes = [livre for livre in livres if livre.get("notes")]
-    if livres_avec_notes: # Vérification si des livres ont des notes
-        livre_plus_apprecie = max(livres_avec_notes, key=lambda x: sum(x["notes"]) / len(x["notes"])) # Livre avec la note moyenne la plus élevée
-        note_moyenne = sum(livre_plus_apprecie["notes"]) / len(livre_plus_apprecie["notes"]) # Calcul de la note moyenne
-    else: # Aucun livre n'a de notes
-        livre_plus_apprecie = {"titre": "N/A"}
-        note_moyenne = 0
-    
-    # Livre le moins apprécié
-    if livres_avec_notes: # Vérification si des livres ont des notes
-        livre_moins_apprecie = min(livres_avec_notes, key=lambda x: sum(x["notes"]) / len(x["notes"])) # Livre avec la note moyenne la plus basse
-        note_moyenne_moins = sum(livre_moins_apprecie["notes"]) / len(livre_moins_apprecie["notes"]) # Calcul de la note moyenne
-    else: # Aucun livre n'a de notes
-        livre_moins_apprecie = {"titre": "N/A"}
-        note_moyenne_moins = 0
-    
+    livre_plus_cher = stats.livre_plus_cher() or {"titre": "N/A", "prix": 0}
+    livre_moins_cher = stats.livre_moins_cher() or {"titre": "N/A", "prix": 0}
+
+    # Livres les plus et les moins appréciés
+    livre_plus_apprecie = stats.livre_plus_apprecie() or {"id": None, "titre": "N/A"}
+    note_moyenne = stats.note_moyenne(livre_plus_apprecie["id"])
+    livre_moins_apprecie = stats.livre_moins_apprecie() or {"id": None, "titre": "N/A"}
+    note_moyenne_moins = stats.note_moyenne(livre_moins_apprecie["id"])
+
     # Affichage du rapport
+    from rich.panel import Panel
     console.print(Panel.fit(f"[bold]📊 Rapport de la Bibliothèque Numérique[/bold]", style="cyan"))
     console.print(f"Nombre total de livres : [bold]{total_livres}[/bold]")
     console.print(f"Livres disponibles : [bold]{livres_disponibles}[/bold]")
@@ -292,65 +485,259 @@ def generer_rapport(livres):
     console.print(f"Livre le moins apprécié : [bold underline]{livre_moins_apprecie['titre']}[/underline bold] avec une note moyenne de [bold]{note_moyenne_moins:.2f}/5 ⭐[/bold]")
 
 
-def charger_bibliotheque():
-    """Fonction pour charger les livres depuis `bibliotheque.json`.
+class _SansProgression:
+    """Classe représentant une barre de progression inactive, sans import de Rich (petits fichiers)."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        return False
+
+    def add_task(self, *args, **kwargs):
+        return None
+
+    def update(self, *args, **kwargs):
+        pass
+
+
+def _barre_progression(taille):
+    """Fonction pour créer la barre de progression du chargement, affichée seulement pour les gros fichiers.
+
+    Args:
+        taille (int): Taille du fichier chargé, en octets.
+    Returns:
+        Progress: Barre de progression Rich, ou barre inactive.
+    """
+    if taille < SEUIL_PROGRESSION:
+        return _SansProgression()
+    try:
+        from rich.progress import Progress
+    except ImportError: # Rich absent : chargement sans barre de progression
+        return _SansProgression()
+    return Progress(console=console.obtenir() if isinstance(console, ConsoleParesseuse) else console, transient=True)
+
+
+def _nouveau_catalogue():
+    """Fonction pour créer un catalogue vide relié à l'index de trigrammes et aux statistiques, alimentés au fil des ajouts.
 
     Returns:
-        list: Liste des livres chargés.
+        Catalogue: Catalogue vide.
     """
+    livres = Catalogue()
+    livres.index_texte = IndexTrigrammes()
+    livres.abonner(livres.index_texte)
+    livres.statistiques = Statistiques()
+    livres.abonner(livres.statistiques)
+    return livres
+
+
+@mesure
+def charger_bibliotheque(chemin=FICHIER_BIBLIOTHEQUE, chemin_journal=FICHIER_JOURNAL, ignorer_corrompus=False, progression=None, historique_notes=False, moteur=MOTEUR_STOCKAGE, chemin_sqlite=FICHIER_SQLITE, utiliser_cache=True):
+    """Fonction pour charger les livres depuis `bibliotheque.json` puis rejouer le journal des modifications.
+
+    Le fichier est lu livre par livre : les index sont construits au fil de la lecture et
+    une barre de progression s'affiche pour les fichiers volumineux. Les livres à l'ancien
+    format (liste `notes`) sont convertis en répartition de notes, puis l'instantané est
+    réécrit au nouveau format. Tant que l'instantané ne change pas, le catalogue et ses
+    index sont relus depuis un cache binaire (`bibliotheque.json.cache`) sans analyser
+    le JSON. Avec le moteur "sqlite", les livres sont lus depuis la base
+    `bibliotheque.db` (voir `_charger_sqlite`).
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+        chemin_journal (str): Chemin du journal des modifications.
+        ignorer_corrompus (bool): Ignorer les livres corrompus au lieu d'abandonner tout le fichier.
+        progression (callable): Fonction appelée régulièrement avec le `LecteurLivres` en cours.
+        historique_notes (bool): Conserver chaque note dans `bibliotheque_notes.jsonl`.
+        moteur (str): Moteur de stockage, "json" (par défaut) ou "sqlite".
+        chemin_sqlite (str): Chemin de la base du moteur SQLite.
+        utiliser_cache (bool): Lire et écrire le cache binaire de l'instantané.
+    Returns:
+        Catalogue: Catalogue des livres chargés, relié au journal et à l'index de recherche.
+    Raises:
+        ValueError: Si le moteur de stockage est inconnu.
+    """
+    if moteur not in MOTEURS:
+        raise ValueError(f"Moteur de stockage inconnu : '{moteur}' (moteurs disponibles : {', '.join(MOTEURS)})")
+    if moteur == "sqlite":
+        return _charger_sqlite(chemin_sqlite, chemin, chemin_journal, ignorer_corrompus, historique_notes)
+    empreinte = empreinte_instantane(chemin) # Calculée une seule fois pour le cache et le journal
+    livres = charger_cache(chemin, empreinte) if utiliser_cache else None # Catalogue et index déjà construits
+    notes_migrees = [] # Notes de l'ancien format, (ID, note)
+    livres_migres = 0
+    if livres is not None: # Instantané inchangé depuis l'écriture du cache
+        console.print(f"[green]Bibliothèque chargée depuis '{chemin}' (cache '{chemin_cache(chemin)}').[/green]")
     # Vérification de l'existence du fichier
-    if os.path.exists("bibliotheque.json"):
-        try: # Chargement des données depuis le fichier JSON
-            with open("bibliotheque.json", "r", encoding="utf-8") as f:
-                livres = json.load(f)
-            console.print("[green]Bibliothèque chargée depuis 'bibliotheque.json'.[/green]")
-            return livres
-        except json.JSONDecodeError: # Gestion d'erreur si le fichier JSON est corrompu ou mal formaté
-            console.print("[red]Erreur : Le fichier 'bibliotheque.json' est corrompu ou mal formaté.[/red]")
-            return []
+    elif os.path.exists(chemin):
+        livres = _nouveau_catalogue()
+        lecteur = LecteurLivres(chemin, ignorer_corrompus)
+        try: # Chargement des données depuis le fichier JSON, livre par livre
+            with _barre_progression(lecteur.taille) as barre:
+                tache = barre.add_task("Chargement de la bibliothèque", total=lecteur.taille)
+                for livre in lecteur:
+                    if "repartition_notes" not in livre: # Migration de l'ancienne liste de notes
+                        livres_migres += 1
+                        notes_migrees.extend((livre["id"], note) for note in migrer_notes(livre))
+                    try:
+                        livres.append(livre)
+                    except ValueError: # ID en double
+                        if not ignorer_corrompus:
+                            raise
+                        lecteur.nombre_ignores += 1
+                        continue
+                    if lecteur.nombre_lus % PAS_PROGRESSION == 0: # Suivi de la progression
+                        barre.update(tache, completed=lecteur.octets_lus)
+                        if progression is not None:
+                            progression(lecteur)
+            if progression is not None:
+                progression(lecteur)
+            id_max = lecteur.metadonnees.get("id_max")
+            if isinstance(id_max, int): # IDs déjà attribués à des livres supprimés depuis (absent de l'ancien format)
+                livres.avancer_ids(id_max)
+            console.print(f"[green]Bibliothèque chargée depuis '{chemin}'.[/green]")
+            if lecteur.nombre_ignores: # Conservation du fichier d'origine avant qu'il soit réécrit
+                shutil.copyfile(chemin, chemin + ".corrompu")
+                console.print(f"[yellow]Attention : {lecteur.nombre_ignores} livre(s) corrompu(s) ignoré(s). Copie du fichier d'origine dans '{chemin}.corrompu'.[/yellow]")
+            elif utiliser_cache and not livres_migres: # Le prochain démarrage n'aura pas à analyser le JSON
+                ecrire_cache(livres, chemin, empreinte)
+        except ValueError: # Gestion d'erreur si le fichier JSON est corrompu ou mal formaté
+            console.print(f"[red]Erreur : Le fichier '{chemin}' est corrompu ou mal formaté.[/red]")
+            livres = _nouveau_catalogue()
+            livres_migres = 0
     else: # Fichier non trouvé, initialisation d'une bibliothèque vide
-        console.print("[yellow]Aucun fichier 'bibliotheque.json' trouvé. Bibliothèque vide initialisée.[/yellow]")
-        return []
-
+        livres = _nouveau_catalogue()
+        console.print(f"[yellow]Aucun fichier '{chemin}' trouvé. Bibliothèque vide initialisée.[/yellow]")
+
+    # Rejeu des modifications journalisées depuis le dernier instantané
+    journal = Journal(chemin_journal, chemin)
+    operations = journal.rejouer(livres, empreinte)
+    if operations:
+        console.print(f"[green]{operations} opération(s) rejouée(s) depuis '{chemin_journal}'.[/green]")
+    if journal.orphelin: # Journal d'un autre instantané : rien n'est rejoué ni effacé
+        console.print(f"[yellow]Attention : le journal ne correspond pas à '{chemin}' et n'a pas été rejoué. Il est conservé dans '{journal.orphelin}'.[/yellow]")
+    livres.journal = journal
+    livres.abonner(journal) # Chaque modification suivante est journalisée
+
+    # Historique détaillé des notes, stocké à part du catalogue
+    if historique_notes:
+        historique = HistoriqueNotes(FICHIER_HISTORIQUE_NOTES)
+        historique.enregistrer(notes_migrees) # Les notes migrées n'ont pas de date connue
+        livres.abonner(historique)
+    if livres_migres: # Réécriture de l'instantané au nouveau format
+        console.print(f"[yellow]{livres_migres} livre(s) converti(s) au format de notes par répartition.[/yellow]")
+        _ecrire_instantane(livres, chemin)
+    return livres
+
+
+def _charger_sqlite(chemin_sqlite, chemin, chemin_journal, ignorer_corrompus, historique_notes):
+    """Fonction pour charger les livres depuis la base SQLite.
+
+    À la première utilisation, la base est créée à partir de l'instantané JSON et de son
+    journal. Le catalogue est ensuite relié à la base : chaque modification y est écrite
+    dans une transaction, et la recherche, le filtre par genre et le rapport sont
+    calculés par SQL plutôt que par des index en mémoire.
 
-def sauvegarder_bibliotheque(livres):
+    Args:
+        chemin_sqlite (str): Chemin de la base SQLite.
+        chemin (str): Chemin de l'instantané JSON à reprendre si la base est vide.
+        chemin_journal (str): Chemin du journal associé à l'instantané JSON.
+        ignorer_corrompus (bool): Ignorer les livres corrompus de l'instantané JSON.
+        historique_notes (bool): Conserver chaque note dans `bibliotheque_notes.jsonl`.
+    Returns:
+        Catalogue: Catalogue des livres chargés, relié à la base.
+    """
+    stockage = StockageSQLite(chemin_sqlite)
+    if stockage.est_vide() and os.path.exists(chemin): # Reprise de la bibliothèque JSON existante
+        ancienne = charger_bibliotheque(chemin, chemin_journal, ignorer_corrompus, historique_notes=historique_notes, moteur="json")
+        ancienne.journal.fermer()
+        nombre = stockage.importer(ancienne, ancienne.id_max)
+        console.print(f"[green]{nombre} livre(s) repris de '{chemin}' dans '{chemin_sqlite}'.[/green]")
+    livres = Catalogue()
+    livres.extend(stockage) # Aucun observateur encore abonné : rien n'est réécrit
+    livres.avancer_ids(stockage.id_max()) # IDs des livres supprimés : jamais réattribués
+    livres.stockage = stockage
+    livres.index_texte = stockage # Recherche par SQL, même interface que l'index de trigrammes
+    livres.statistiques = StatistiquesSQLite(stockage, livres)
+    livres.abonner(stockage) # Chaque modification suivante est écrite dans la base
+    if historique_notes:
+        livres.abonner(HistoriqueNotes(FICHIER_HISTORIQUE_NOTES))
+    console.print(f"[green]Bibliothèque chargée depuis '{chemin_sqlite}'.[/green]")
+    return livres
+
+
+@mesure
+def sauvegarder_bibliotheque(livres, chemin=FICHIER_BIBLIOTHEQUE, forcer=False):
     """Fonction pour sauvegarder les livres dans `bibliotheque.json`.
 
+    Avec le moteur SQLite, les modifications sont déjà validées dans la base et seul un
+    point de contrôle SQLite est fait si `forcer` est vrai. Lorsque le catalogue est
+    relié à un journal, les modifications sont déjà durables :
+    l'instantané n'est réécrit (point de contrôle) que lorsque le journal dépasse
+    `SEUIL_POINT_CONTROLE` opérations ou si `forcer` est vrai.
+
     Args:
         livres (list): Liste des livres à sauvegarder.
+        chemin (str): Chemin de l'instantané JSON.
+        forcer (bool): Écrire l'instantané même si le seuil n'est pas atteint.
     """
-    try: # Sauvegarde des données dans le fichier JSON
-        with open("bibliotheque.json", "w", encoding="utf-8") as f:
-            json.dump(livres, f, ensure_ascii=False, indent=4)
-        console.print("[green]Bibliothèque sauvegardée dans 'bibliotheque.json'.[/green]")
+    stockage = getattr(livres, "stockage", None)
+    if stockage is not None: # Moteur SQLite : chaque modification est déjà validée dans la base
+        if forcer:
+            livres.compacter()
+            stockage.synchroniser()
+        return
+    journal = getattr(livres, "journal", None)
+    if journal is not None and not forcer and journal.nombre_entrees < SEUIL_POINT_CONTROLE:
+        return # Rien à écrire : le journal contient déjà les modifications
+    if journal is not None and forcer and journal.nombre_entrees == 0 and os.path.exists(chemin):
+        return # Instantané déjà à jour
+    _ecrire_instantane(livres, chemin)
+
+
+def _ecrire_instantane(livres, chemin):
+    """Fonction pour réécrire l'instantané JSON complet et vider le journal qu'il intègre.
+
+    L'instantané est écrit dans un fichier temporaire qui le remplace une fois complet :
+    un arrêt pendant l'écriture ne tronque jamais la bibliothèque.
+
+    Args:
+        livres (list): Liste des livres à sauvegarder.
+        chemin (str): Chemin de l'instantané JSON.
+    """
+    journal = getattr(livres, "journal", None)
+    if isinstance(livres, Catalogue): # Retrait des emplacements laissés par les suppressions
+        livres.compacter()
+    empreinte = None # Calculée par le cache lorsque aucun journal ne l'a déjà fait
+    try: # Sauvegarde des données dans le fichier JSON, par remplacement atomique
+        temporaire = ecrire_instantane_atomique(chemin, livres, remplacer=journal is None, id_max=getattr(livres, "id_max", None))
+        if journal is not None: # Le journal est intégré à l'instantané : il repart de zéro
+            empreinte = installer_instantane(chemin, temporaire, journal, journal.nombre_entrees, livres.id_max)
+        if isinstance(livres, Catalogue): # Cache binaire du nouvel instantané
+            ecrire_cache(livres, chemin, empreinte)
+        console.print(f"[green]Bibliothèque sauvegardée dans '{chemin}'.[/green]")
     except IOError: # Gestion d'erreur si le fichier ne peut pas être écrit
-        console.print("[red]Erreur : Impossible de sauvegarder dans 'bibliotheque.json'.[/red]")
+        console.print(f"[red]Erreur : Impossible de sauvegarder dans '{chemin}'.[/red]")
+
 
+@mesure
+def export_csv(livres, chemin=FICHIER_CSV, format_export=None, compression=None):
+    """Fonction pour exporter la bibliothèque, ou n'importe quelle sélection de livres, au format CSV ou JSON Lines.
 
-def export_csv(livres):
-    """Fonction pour exporter la bibliothèque au format CSV.
+    L'export se fait en flux, par blocs : la mémoire utilisée ne dépend pas du nombre de
+    livres. Une extension `.gz` ou `.xz` active la compression, et le chemin "-" écrit
+    sur la sortie standard (sans message, pour pouvoir enchaîner avec d'autres outils).
 
     Args:
-        livres (list): Liste des livres à exporter.
+        livres (iterable): Livres à exporter (catalogue, résultats de `rechercher_livre` ou de `filtrer_par_genre`...).
+        chemin (str): Fichier de destination, ou "-" pour la sortie standard.
+        format_export (str): "csv" ou "jsonl" (déduit de l'extension par défaut).
+        compression (str): "gzip", "xz" ou None (déduit de l'extension par défaut).
     """
-    try: # Exportation des données dans un fichier CSV
-        with open('bibliotheque.csv', "w", newline='', encoding="utf-8") as csvfile:
-            # Définition des en-têtes du CSV
-            fieldnames = ["id", "titre", "auteur", "genre", "année_publication", "prix", "disponible"]
-            # Création de l'écrivain CSV avec les en-têtes définis
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader() # Écriture de l'en-tête dans le fichier CSV
-            # Écriture des données des livres dans le fichier CSV
-            for livre in livres:
-                writer.writerow({
-                    "id": livre["id"],
-                    "titre": livre["titre"],
-                    "auteur": livre["auteur"],
-                    "genre": livre["genre"],
-                    "année_publication": livre["année_publication"],
-                    "prix": livre["prix"],
-                    "disponible": livre["disponible"]
-                })
-        console.print(f"[green]Bibliothèque exportée avec succès dans 'bibliotheque.csv'.[/green]")
+    try: # Exportation des données en flux
+        nombre = exporter_livres(livres, chemin, format_export, compression)
+        if chemin != SORTIE_STANDARD:
+            compter_octets("export", os.path.getsize(chemin))
+            console.print(f"[green]Bibliothèque exportée avec succès dans '{chemin}' ({nombre} livres).[/green]")
     except IOError: # Gestion d'erreur si le fichier ne peut pas être écrit
-        console.print(f"[red]Erreur : Impossible d'exporter dans 'bibliotheque.csv'.[/red]")
\ No newline at end of file
+        console.print(f"[red]Erreur : Impossible d'exporter dans '{chemin}'.[/red]")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Cache binaire de l'instantané
+Description : Copie binaire (pickle) du catalogue chargé depuis `bibliotheque.json`, avec son
+              index de recherche et ses statistiques, relue au démarrage à la place du JSON
+              tant que celui-ci n'a pas changé (taille, date de modification et empreinte).
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import os
+import pickle
+from journal import empreinte_instantane, identite_instantane
+
+# Définition des constantes
+EXTENSION_CACHE = ".cache" # Le cache de `bibliotheque.json` est `bibliotheque.json.cache`
+VERSION_CACHE = 4 # À incrémenter si la structure du catalogue ou de ses index change
+
+
+# Définition des fonctions
+def chemin_cache(chemin):
+    """Fonction pour obtenir le chemin du cache associé à un instantané JSON."""
+    return chemin + EXTENSION_CACHE
+
+
+def cle_cache(chemin, empreinte=None):
+    """Fonction pour calculer la clé qui associe le cache à une version précise de l'instantané.
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+        empreinte (str): Empreinte de l'instantané si l'appelant l'a déjà calculée (calculée sinon).
+    Returns:
+        list: `[version du cache, taille, mtime_ns, empreinte]`, ou None si l'instantané n'existe pas.
+    """
+    identite = identite_instantane(chemin)
+    if identite is None:
+        return None
+    return [VERSION_CACHE, *identite, empreinte if empreinte is not None else empreinte_instantane(chemin)]
+
+
+def charger_cache(chemin, empreinte=None):
+    """Fonction pour charger le catalogue depuis le cache, s'il correspond toujours à l'instantané.
+
+    L'en-tête du cache est lu en premier : la taille et la date de modification sont
+    comparées avant l'empreinte (calculée seulement si l'appelant ne la fournit pas), et
+    le catalogue n'est désérialisé que si tout correspond. Un cache absent, périmé ou illisible est simplement ignoré.
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+        empreinte (str): Empreinte de l'instantané si l'appelant l'a déjà calculée (calculée sinon).
+    Returns:
+        Catalogue: Catalogue avec son index de recherche et ses statistiques (sans journal),
+            ou None si le cache est inutilisable.
+    """
+    try:
+        with open(chemin_cache(chemin), "rb") as f:
+            cle = pickle.load(f)
+            identite = identite_instantane(chemin)
+            if identite is None or cle[:3] != [VERSION_CACHE, *identite] or cle[3] != (empreinte if empreinte is not None else empreinte_instantane(chemin)):
+                return None # Instantané modifié depuis l'écriture du cache
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError, IndexError): # Cache corrompu ou d'une ancienne version
+        return None
+
+
+def ecrire_cache(livres, chemin, empreinte=None):
+    """Fonction pour écrire le cache d'un catalogue identique à l'instantané JSON.
+
+    Le fichier est écrit à côté puis renommé : un arrêt pendant l'écriture ne laisse
+    jamais un cache partiel.
+
+    Args:
+        livres (Catalogue): Catalogue correspondant exactement à l'instantané (journal vide).
+        chemin (str): Chemin de l'instantané JSON.
+        empreinte (str): Empreinte de l'instantané si l'appelant l'a déjà calculée (calculée sinon).
+    """
+    cle = cle_cache(chemin, empreinte)
+    if cle is None:
+        return
+    destination = chemin_cache(chemin)
+    temporaire = destination + ".tmp"
+    try:
+        with open(temporaire, "wb") as f:
+            pickle.dump(cle, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(livres, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temporaire, destination)
+    except OSError: # Le cache n'est qu'une accélération : son échec n'empêche pas la sauvegarde
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Catalogue
+Description : Conteneur des livres avec index ID → livre maintenu à chaque modification.
+              Les observateurs abonnés sont notifiés de chaque modification (ajout,
+              suppression, emprunt, retour, note).
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import contextlib
+from notation import ajouter_note
+from livre import Livre
+
+# Définition des constantes
+SEUIL_COMPACTAGE = 1024 # Nombre minimal d'emplacements libérés avant un compactage automatique
+
+
+# Définition des classes
+class Catalogue:
+    """Classe représentant le catalogue des livres, utilisable comme une liste.
+
+    Les livres sont stockés dans une liste et un dictionnaire associe chaque ID à sa
+    position dans cette liste : la recherche, le changement de disponibilité et la
+    suppression d'un livre par ID se font en temps constant. Un livre supprimé laisse
+    un emplacement vide (pierre tombale) : l'ordre d'ajout est conservé, et la liste est
+    compactée à la sauvegarde ou lorsque les emplacements vides en occupent la moitié.
+    Les IDs ne sont jamais réattribués, même après la suppression du dernier livre.
+    """
+
+    def __init__(self, livres=()):
+        """Constructeur du catalogue.
+
+        Args:
+            livres (iterable): Livres initiaux du catalogue.
+        """
+        self._livres = [] # Livres dans l'ordre d'ajout, None pour un livre supprimé
+        self._positions = {} # Index ID → position dans self._livres
+        self._supprimes = 0 # Nombre d'emplacements vides dans self._livres
+        self._id_max = 0 # Plus grand ID attribué, même à un livre supprimé depuis
+        self._observateurs = [] # Fonctions appelées à chaque modification
+        self.version = 0 # Incrémentée à chaque ajout ou suppression
+        self._tris = {} # Critère de tri → (version, livres triés)
+        self.journal = None # Journal des modifications associé, le cas échéant
+        self.index_texte = None # Index de trigrammes pour la recherche, le cas échéant
+        self.index_approche = None # Index de la recherche approchée, construit à la première utilisation
+        self.index_requetes = None # Index des requêtes multicritères, construits à la première utilisation
+        self.statistiques = None # Statistiques tenues à jour pour le rapport, le cas échéant
+        self.stockage = None # Stockage SQLite associé, le cas échéant
+        self.extend(livres)
+
+    # Accès en lecture, comme une liste
+    def __len__(self):
+        return len(self._livres) - self._supprimes
+
+    def __iter__(self):
+        if not self._supprimes:
+            return iter(self._livres)
+        return (livre for livre in self._livres if livre is not None)
+
+    def __getitem__(self, index):
+        self.compacter() # Positions des livres restants
+        return self._livres[index]
+
+    def __repr__(self):
+        return f"Catalogue({list(self)!r})"
+
+    def __getstate__(self):
+        """Méthode pour la mise en cache (pickle) du catalogue et de ses index.
+
+        Seuls les index de recherche et les statistiques, qui ne dépendent que des livres,
+        sont conservés ; le journal, le stockage et les autres observateurs liés à des
+        fichiers sont rattachés à nouveau au chargement.
+        """
+        etat = self.__dict__.copy()
+        etat["journal"] = etat["stockage"] = None
+        conserves = (self.index_texte, self.index_approche, self.index_requetes, self.statistiques)
+        etat["_observateurs"] = [observateur for observateur in self._observateurs if any(observateur is index for index in conserves)]
+        return etat
+
+    def get(self, id_livre, defaut=None):
+        """Méthode pour récupérer un livre par son ID en temps constant.
+
+        Args:
+            id_livre (int): ID du livre recherché.
+            defaut: Valeur renvoyée si l'ID est inconnu.
+        Returns:
+            Livre: Le livre correspondant, ou `defaut`.
+        """
+        position = self._positions.get(id_livre)
+        return defaut if position is None else self._livres[position]
+
+    def contient_id(self, id_livre):
+        """Méthode pour savoir si un ID est présent dans le catalogue.
+
+        Args:
+            id_livre (int): ID à tester.
+        Returns:
+            bool: True si un livre porte cet ID.
+        """
+        return id_livre in self._positions
+
+    @property
+    def id_max(self):
+        """Plus grand ID déjà attribué, y compris à un livre supprimé depuis (0 si aucun)."""
+        return self._id_max
+
+    def prochain_id(self):
+        """Méthode pour obtenir un ID libre pour un nouveau livre.
+
+        Returns:
+            int: ID strictement supérieur à tous les IDs déjà attribués.
+        """
+        return self._id_max + 1
+
+    def avancer_ids(self, id_max):
+        """Méthode pour ne plus proposer d'ID inférieur ou égal à un ID déjà attribué.
+
+        Utilisée au chargement pour reprendre l'allocateur enregistré, qui tient compte
+        des livres supprimés depuis.
+
+        Args:
+            id_max (int): Plus grand ID déjà attribué.
+        """
+        self._id_max = max(self._id_max, id_max)
+
+    def trier(self, critere, cle):
+        """Méthode pour obtenir les livres triés selon un critère, avec mise en cache.
+
+        L'ordre calculé est conservé tant que la version du catalogue ne change pas : seuls
+        un ajout ou une suppression l'invalident, les champs triables (ID, titre, auteur,
+        prix) n'étant jamais modifiés ensuite.
+
+        Args:
+            critere (str): Nom du critère, utilisé comme clé du cache.
+            cle (callable): Fonction de tri associée au critère.
+        Returns:
+            list: Livres triés (à ne pas modifier).
+        """
+        cache = self._tris.get(critere)
+        if cache is None or cache[0] != self.version: # Ordre absent ou périmé : nouveau tri
+            cache = self._tris[critere] = (self.version, sorted(self, key=cle))
+        return cache[1]
+
+    def invalider_tris(self):
+        """Méthode pour oublier les ordres de tri en cache : le prochain `trier` refait le tri."""
+        self._tris.clear()
+
+    # Observateurs
+    def abonner(self, observateur):
+        """Méthode pour abonner un observateur aux modifications du catalogue.
+
+        L'observateur est appelé avec `(operation, livre, **details)` après chaque
+        modification, où `operation` vaut "ajout", "suppression", "emprunt", "retour"
+        ou "note".
+
+        Args:
+            observateur (callable): Fonction à appeler.
+        """
+        self._observateurs.append(observateur)
+
+    def desabonner(self, observateur):
+        """Méthode pour désabonner un observateur.
+
+        Args:
+            observateur (callable): Observateur précédemment abonné.
+        """
+        self._observateurs.remove(observateur)
+
+    @contextlib.contextmanager
+    def lot(self):
+        """Méthode (gestionnaire de contexte) pour regrouper une série de modifications.
+
+        Les observateurs qui le permettent (méthode `lot`, comme le journal ou le stockage
+        SQLite) écrivent alors toutes les modifications du bloc en une seule fois.
+        """
+        with contextlib.ExitStack() as pile:
+            for observateur in self._observateurs:
+                if hasattr(observateur, "lot"):
+                    pile.enter_context(observateur.lot())
+            yield self
+
+    def _notifier(self, operation, livre, **details):
+        erreur = None
+        for observateur in self._observateurs:
+            try:
+                observateur(operation, livre, **details)
+            except Exception as exception: # Les observateurs suivants (index...) restent à jour
+                erreur = erreur or exception
+        if erreur is not None: # Échec d'écriture (journal, base) signalé à l'appelant
+            raise erreur
+
+    def reserver_ids(self, nombre):
+        """Méthode pour attribuer d'un seul coup un bloc d'IDs consécutifs à de nouveaux livres.
+
+        Args:
+            nombre (int): Nombre d'IDs à réserver.
+        Returns:
+            range: IDs réservés, qui ne seront plus proposés par `prochain_id`.
+        """
+        premier = self._id_max + 1
+        self._id_max += nombre
+        return range(premier, premier + nombre)
+
+    # Modifications
+    def append(self, livre):
+        """Méthode pour ajouter un livre à la fin du catalogue.
+
+        Un livre fourni sous forme de dictionnaire est converti en `Livre`.
+
+        Args:
+            livre (Livre | dict): Livre à ajouter, avec un ID unique.
+        Raises:
+            ValueError: Si un livre portant le même ID existe déjà.
+        """
+        if not isinstance(livre, Livre): # Représentation compacte en mémoire
+            livre = Livre.depuis_dict(livre)
+        id_livre = livre["id"]
+        if id_livre in self._positions: # Un ID doit rester unique pour que l'index reste fiable
+            raise ValueError(f"Un livre avec l'ID {id_livre} existe déjà dans le catalogue.")
+        self._positions[id_livre] = len(self._livres)
+        self._livres.append(livre)
+        self._id_max = max(self._id_max, id_livre)
+        self.version += 1
+        self._notifier("ajout", livre)
+
+    def extend(self, livres):
+        """Méthode pour ajouter plusieurs livres à la fin du catalogue.
+
+        Args:
+            livres (iterable): Livres à ajouter.
+        """
+        for livre in livres:
+            self.append(livre)
+
+    def supprimer(self, id_livre):
+        """Méthode pour supprimer un livre par son ID en temps constant.
+
+        L'emplacement du livre est seulement marqué comme vide, sans décaler les livres
+        suivants ; la liste est compactée lorsque les emplacements vides en occupent la
+        moitié, ce qui garde un coût constant en moyenne.
+
+        Args:
+            id_livre (int): ID du livre à supprimer.
+        Returns:
+            Livre: Le livre supprimé, ou None si l'ID est inconnu.
+        """
+        position = self._positions.pop(id_livre, None)
+        if position is None: # ID inconnu
+            return None
+        livre = self._livres[position]
+        self._livres[position] = None # Pierre tombale
+        self._supprimes += 1
+        self.version += 1
+        self._notifier("suppression", livre)
+        if self._supprimes >= SEUIL_COMPACTAGE and 2 * self._supprimes >= len(self._livres):
+            self.compacter()
+        return livre
+
+    def compacter(self):
+        """Méthode pour retirer les emplacements vides laissés par les suppressions.
+
+        Returns:
+            int: Nombre d'emplacements libérés.
+        """
+        liberes = self._supprimes
+        if liberes:
+            self._livres = [livre for livre in self._livres if livre is not None]
+            self._positions = {livre["id"]: position for position, livre in enumerate(self._livres)}
+            self._supprimes = 0
+        return liberes
+
+    def definir_disponibilite(self, id_livre, disponible):
+        """Méthode pour emprunter ou retourner un livre par son ID.
+
+        Args:
+            id_livre (int): ID du livre.
+            disponible (bool): Nouveau statut (False pour un emprunt, True pour un retour).
+        Returns:
+            Livre: Le livre modifié, ou None si l'ID est inconnu.
+        """
+        livre = self.get(id_livre)
+        if livre is not None and livre["disponible"] != disponible: # Seul un vrai changement est notifié
+            livre["disponible"] = disponible
+            self._notifier("retour" if disponible else "emprunt", livre)
+        return livre
+
+    def ajouter_note(self, id_livre, note):
+        """Méthode pour ajouter une note (1 à 5) à un livre par son ID.
+
+        Args:
+            id_livre (int): ID du livre.
+            note (int): Note à ajouter.
+        Returns:
+            Livre: Le livre modifié, ou None si l'ID est inconnu.
+        """
+        livre = self.get(id_livre)
+        if livre is not None:
+            ajouter_note(livre, note) # Mise à jour de la répartition et de la moyenne
+            self._notifier("note", livre, note=note)
+        return livre
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Chargement
+Description : Lecture incrémentale de `bibliotheque.json`, livre par livre, sans
+              matérialiser le document complet en mémoire.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import codecs
+import json
+import os
+from notation import NOMBRE_ETOILES
+
+# Définition des constantes
+TAILLE_BLOC = 1 << 20 # Taille des blocs lus sur le disque (1 Mio)
+CHAMPS_OBLIGATOIRES = ("id", "titre", "auteur", "genre", "année_publication", "prix", "disponible")
+ESPACES = " \t\r\n"
+CLE_LIVRES = "livres" # Clé de la liste des livres dans le format objet, placée après les métadonnées
+
+
+# Définition des fonctions
+def valider_enregistrement(livre):
+    """Fonction pour vérifier qu'un enregistrement lu est un livre exploitable.
+
+    Args:
+        livre: Valeur JSON décodée.
+    Raises:
+        ValueError: Si l'enregistrement n'est pas un objet, s'il manque des champs ou si un champ n'a pas le bon type.
+    """
+    if not isinstance(livre, dict):
+        raise ValueError("L'enregistrement n'est pas un objet JSON.")
+    manquants = [champ for champ in CHAMPS_OBLIGATOIRES if champ not in livre]
+    if manquants:
+        raise ValueError(f"Champs manquants : {', '.join(manquants)}.")
+    if not isinstance(livre["id"], int) or isinstance(livre["id"], bool):
+        raise ValueError("L'ID doit être un entier.")
+    for champ in ("titre", "auteur", "genre"):
+        if not isinstance(livre[champ], str):
+            raise ValueError(f"Le champ '{champ}' doit être une chaîne.")
+    if not isinstance(livre["année_publication"], int) or isinstance(livre["année_publication"], bool):
+        raise ValueError("L'année de publication doit être un entier.")
+    if not isinstance(livre["prix"], (int, float)) or isinstance(livre["prix"], bool): # True est aussi un int
+        raise ValueError("Le prix doit être un nombre.")
+    if not isinstance(livre["disponible"], bool):
+        raise ValueError("La disponibilité doit être un booléen.")
+    # Champs de notation facultatifs (ancien ou nouveau format)
+    if livre.get("notes") is not None and not isinstance(livre["notes"], list):
+        raise ValueError("Les notes doivent être une liste ou null.")
+    if "repartition_notes" in livre:
+        repartition = livre["repartition_notes"]
+        if not isinstance(repartition, list) or len(repartition) != NOMBRE_ETOILES or any(type(compte) is not int or compte < 0 for compte in repartition):
+            raise ValueError(f"La répartition des notes doit compter {NOMBRE_ETOILES} entiers positifs ou nuls.")
+    moyenne = livre.get("note_moyenne")
+    if moyenne is not None and (not isinstance(moyenne, (int, float)) or isinstance(moyenne, bool)):
+        raise ValueError("La note moyenne doit être un nombre ou null.")
+
+
+def _fin_element(texte, debut):
+    """Fonction pour trouver la fin d'un élément JSON en équilibrant crochets et accolades.
+
+    Utilisée uniquement lorsque le décodage d'un élément échoue, pour savoir si
+    l'élément est complet (donc corrompu) ou s'il faut lire davantage de données.
+
+    Args:
+        texte (str): Tampon courant.
+        debut (int): Position du premier caractère de l'élément.
+    Returns:
+        int: Position qui suit l'élément, ou -1 si le tampon s'arrête avant sa fin.
+    """
+    profondeur = 0
+    dans_chaine = echappe = False
+    for position in range(debut, len(texte)):
+        caractere = texte[position]
+        if dans_chaine:
+            if echappe:
+                echappe = False
+            elif caractere == "\\":
+                echappe = True
+            elif caractere == '"':
+                dans_chaine = False
+        elif caractere == '"':
+            dans_chaine = True
+        elif caractere in "{[":
+            profondeur += 1
+        elif caractere in "}]":
+            profondeur -= 1
+            if profondeur <= 0:
+                return position + 1
+        elif profondeur == 0 and caractere == ",": # Élément scalaire
+            return position
+    return -1
+
+
+# Définition des classes
+class LecteurLivres:
+    """Classe pour itérer sur les livres d'un fichier JSON au fil de la lecture.
+
+    Le fichier est soit un tableau de livres (ancien format), soit un objet dont les
+    métadonnées (`id_max`...) précèdent la liste des livres, sous la clé "livres" : les
+    métadonnées sont disponibles dans `metadonnees` dès le premier livre rendu.
+    Chaque élément du tableau est décodé dès qu'il est complet dans le tampon, puis le
+    tampon est libéré : la mémoire utilisée ne dépend pas de la taille du fichier.
+    En mode `ignorer_corrompus`, un élément illisible ou incomplet est compté puis
+    ignoré au lieu d'interrompre la lecture.
+    """
+
+    def __init__(self, chemin, ignorer_corrompus=False, taille_bloc=TAILLE_BLOC):
+        """Constructeur du lecteur.
+
+        Args:
+            chemin (str): Chemin du fichier JSON.
+            ignorer_corrompus (bool): Ignorer les enregistrements corrompus.
+            taille_bloc (int): Nombre d'octets lus à chaque accès disque.
+        """
+        self.chemin = chemin
+        self.ignorer_corrompus = ignorer_corrompus
+        self.taille_bloc = taille_bloc
+        self.taille = os.path.getsize(chemin) # Taille totale, pour le suivi de progression
+        self.octets_lus = 0
+        self.nombre_lus = 0 # Livres valides rendus
+        self.nombre_ignores = 0 # Enregistrements corrompus ignorés
+        self.metadonnees = {} # Valeurs placées avant la liste des livres (format objet)
+
+    def __iter__(self):
+        decodeur = json.JSONDecoder()
+        utf8 = codecs.getincrementaldecoder("utf-8")()
+        with open(self.chemin, "rb") as f:
+            def lire():
+                bloc = f.read(self.taille_bloc)
+                self.octets_lus += len(bloc)
+                return utf8.decode(bloc, final=not bloc), not bloc
+
+            tampon, fin_fichier = lire()
+            position = 0
+            # Recherche du crochet ouvrant du tableau
+            while True:
+                while position < len(tampon) and tampon[position] in ESPACES:
+                    position += 1
+                if position < len(tampon) or fin_fichier:
+                    break
+                tampon, fin_fichier = lire()
+                position = 0
+            if position < len(tampon) and tampon[position] == "{": # Format objet : métadonnées puis livres
+                position += 1
+                while True:
+                    while position < len(tampon) and (tampon[position] in ESPACES or tampon[position] in ",:"):
+                        position += 1
+                    try:
+                        cle, fin = decodeur.raw_decode(tampon, position)
+                        while fin < len(tampon) and (tampon[fin] in ESPACES or tampon[fin] == ":"):
+                            fin += 1
+                        if fin < len(tampon) and cle == CLE_LIVRES:
+                            position = fin
+                            break
+                        valeur, fin = decodeur.raw_decode(tampon, fin)
+                        if fin >= len(tampon) and not fin_fichier: # Un nombre coupé par la fin du bloc se décoderait
+                            raise json.JSONDecodeError("Métadonnée incomplète", tampon, fin)
+                    except json.JSONDecodeError:
+                        if fin_fichier:
+                            raise
+                        suite, fin_fichier = lire() # Métadonnées coupées par la fin du bloc
+                        tampon = tampon[position:] + suite
+                        position = 0
+                        continue
+                    if not isinstance(cle, str):
+                        raise json.JSONDecodeError("Clé de métadonnée invalide", tampon, position)
+                    self.metadonnees[cle] = valeur
+                    position = fin
+            if position >= len(tampon) or tampon[position] != "[":
+                raise json.JSONDecodeError("Le fichier doit contenir un tableau de livres", tampon, position)
+            position += 1
+
+            while True:
+                # Passage des espaces et virgules entre deux éléments
+                while position < len(tampon) and (tampon[position] in ESPACES or tampon[position] == ","):
+                    position += 1
+                if position >= len(tampon):
+                    if fin_fichier: # Tableau non terminé : fichier tronqué
+                        if self.ignorer_corrompus:
+                            return
+                        raise json.JSONDecodeError("Fin de fichier inattendue", tampon, position)
+                    tampon, fin_fichier = lire()
+                    position = 0
+                    continue
+                if tampon[position] == "]": # Fin du tableau
+                    return
+
+                try:
+                    livre, fin = decodeur.raw_decode(tampon, position)
+                except json.JSONDecodeError as erreur:
+                    fin = _fin_element(tampon, position)
+                    if fin < 0 and not fin_fichier: # Élément simplement coupé par la fin du bloc
+                        suite, fin_fichier = lire()
+                        tampon = tampon[position:] + suite
+                        position = 0
+                        continue
+                    if not self.ignorer_corrompus:
+                        raise erreur
+                    self.nombre_ignores += 1
+                    if fin < 0: # Élément tronqué en fin de fichier
+                        return
+                    position = fin
+                    continue
+
+                position = fin
+                if position > self.taille_bloc: # Libération de la partie déjà décodée du tampon
+                    tampon = tampon[position:]
+                    position = 0
+                try:
+                    valider_enregistrement(livre)
+                except ValueError:
+                    if not self.ignorer_corrompus:
+                        raise
+                    self.nombre_ignores += 1
+                    continue
+                self.nombre_lus += 1
+                yield livre
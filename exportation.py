@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Export
+Description : Export en flux de n'importe quel ensemble de livres (catalogue, résultats de
+              recherche ou de filtre) en CSV ou JSON Lines, éventuellement compressé
+              (gzip, xz) ou vers la sortie standard.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import contextlib
+import csv
+import gzip
+import io
+import itertools
+import json
+import lzma
+import sys
+from livre import CHAMPS_CSV, Livre
+
+# Définition des constantes
+TAILLE_BLOC = 10000 # Nombre de livres écrits par bloc
+TAILLE_TAMPON = 1 << 20 # Taille du tampon d'écriture (1 Mio)
+SORTIE_STANDARD = "-"
+
+
+# Définition des fonctions
+def deduire_compression(chemin):
+    """Fonction pour déduire la compression de l'extension du fichier.
+
+    Args:
+        chemin (str): Chemin du fichier de destination.
+    Returns:
+        str: "gzip", "xz" ou None.
+    """
+    if chemin.endswith(".gz"):
+        return "gzip"
+    if chemin.endswith(".xz"):
+        return "xz"
+    return None
+
+
+def deduire_format(chemin):
+    """Fonction pour déduire le format d'export de l'extension du fichier (hors compression).
+
+    Args:
+        chemin (str): Chemin du fichier de destination.
+    Returns:
+        str: "jsonl" pour un fichier `.jsonl`, "csv" sinon.
+    """
+    base = chemin[:-3] if chemin.endswith((".gz", ".xz")) else chemin
+    return "jsonl" if base.endswith(".jsonl") else "csv"
+
+
+@contextlib.contextmanager
+def _ouvrir_destination(chemin, compression):
+    """Fonction (gestionnaire de contexte) pour ouvrir la destination en écriture texte tamponnée.
+
+    La sortie standard n'est jamais fermée, seulement vidée.
+    """
+    if chemin == SORTIE_STANDARD and compression is None: # Sortie standard texte
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+    with contextlib.ExitStack() as pile:
+        if chemin == SORTIE_STANDARD:
+            binaire = sys.stdout.buffer
+            pile.callback(binaire.flush)
+        else:
+            binaire = pile.enter_context(open(chemin, "wb", buffering=TAILLE_TAMPON))
+        if compression == "gzip":
+            binaire = pile.enter_context(gzip.GzipFile(fileobj=binaire, mode="wb"))
+        elif compression == "xz":
+            binaire = pile.enter_context(lzma.LZMAFile(binaire, mode="wb"))
+        texte = io.TextIOWrapper(binaire, encoding="utf-8", newline="")
+        try:
+            yield texte
+        finally:
+            texte.flush()
+            texte.detach() # La fermeture des flux sous-jacents revient à la pile
+
+
+def _ligne_csv(livre):
+    """Fonction pour obtenir les colonnes CSV d'un livre (objet `Livre` ou dictionnaire)."""
+    if isinstance(livre, Livre):
+        return livre.en_ligne_csv()
+    return tuple(livre[champ] for champ in CHAMPS_CSV)
+
+
+def _ligne_json(livre):
+    """Fonction pour obtenir la ligne JSON d'un livre (objet `Livre` ou dictionnaire)."""
+    return json.dumps(livre.en_dict() if isinstance(livre, Livre) else livre, ensure_ascii=False) + "\n"
+
+
+def exporter_livres(livres, chemin, format_export=None, compression=None, taille_bloc=TAILLE_BLOC):
+    """Fonction pour exporter des livres en flux, bloc par bloc, à mémoire constante.
+
+    Args:
+        livres (iterable): Livres à exporter (catalogue, liste, générateur...).
+        chemin (str): Fichier de destination, ou "-" pour la sortie standard.
+        format_export (str): "csv" ou "jsonl" (déduit de l'extension par défaut).
+        compression (str): "gzip", "xz" ou None (déduit de l'extension par défaut).
+        taille_bloc (int): Nombre de livres écrits à la fois.
+    Returns:
+        int: Nombre de livres exportés.
+    """
+    format_export = format_export or deduire_format(chemin)
+    if compression is None:
+        compression = deduire_compression(chemin)
+    nombre = 0
+    iterateur = iter(livres)
+    with _ouvrir_destination(chemin, compression) as sortie:
+        if format_export == "csv":
+            writer = csv.writer(sortie)
+            writer.writerow(CHAMPS_CSV) # Écriture de l'en-tête
+        while True:
+            bloc = list(itertools.islice(iterateur, taille_bloc))
+            if not bloc:
+                break
+            if format_export == "csv":
+                writer.writerows(map(_ligne_csv, bloc))
+            else:
+                sortie.writelines(map(_ligne_json, bloc))
+            nombre += len(bloc)
+    return nombre
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Import en masse
+Description : Import de flux éditeurs (CSV ou JSON Lines) : analyse et validation par lots
+              (dans un pool de processus pour le JSON Lines), dédoublonnage, attribution des IDs par bloc et
+              fichier des lignes rejetées.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import collections
+import concurrent.futures
+import csv
+import datetime
+import itertools
+import json
+import os
+import time
+from livre import Livre, valider_livre
+
+# Définition des constantes
+TAILLE_LOT = 5000 # Nombre de lignes analysées par tâche
+COLONNES_CSV = ("titre", "auteur", "genre", "année_publication", "prix")
+
+
+# Définition des fonctions
+def cle_doublon(titre, auteur, annee):
+    """Fonction pour calculer la clé de dédoublonnage d'un livre.
+
+    Args:
+        titre (str): Titre du livre.
+        auteur (str): Auteur du livre.
+        annee (int): Année de publication.
+    Returns:
+        tuple: Titre et auteur normalisés, et année.
+    """
+    return (titre.strip().casefold(), auteur.strip().casefold(), annee)
+
+
+def _convertir(donnees, texte):
+    """Fonction pour convertir les valeurs d'une ligne en types Python.
+
+    Args:
+        donnees (dict): Valeurs de la ligne.
+        texte (bool): True si les valeurs sont des chaînes (CSV).
+    Returns:
+        tuple: (titre, auteur, genre, année, prix, disponible).
+    Raises:
+        ValueError: Si l'année ou le prix ne sont pas des nombres (un booléen JSON n'en est
+            pas un), ou un texte n'en est pas un.
+    """
+    annee, prix = donnees.get("année_publication"), donnees.get("prix")
+    disponible = donnees.get("disponible", True)
+    if texte:
+        annee = int(annee) if annee else annee
+        prix = float(prix) if prix else prix
+        disponible = disponible not in ("False", "false", "0")
+    elif isinstance(annee, bool) or isinstance(prix, bool): # True et False sont aussi des int
+        raise ValueError("L'année et le prix doivent être des nombres, pas des booléens.")
+    textes = (donnees.get("titre"), donnees.get("auteur"), donnees.get("genre"))
+    if not all(isinstance(valeur, str) or valeur is None for valeur in textes):
+        raise ValueError("Le titre, l'auteur et le genre doivent être du texte.")
+    return textes + (annee, prix, bool(disponible))
+
+
+def _traiter_lot(lignes, format_source, annee_max):
+    """Fonction exécutée dans un processus de travail : analyse et validation d'un lot de lignes.
+
+    Args:
+        lignes (list): Couples (numéro de ligne, contenu brut). Le contenu est une ligne
+            JSON (texte) ou un dictionnaire déjà découpé par le lecteur CSV.
+        format_source (str): "csv" ou "jsonl".
+        annee_max (int): Année maximale acceptée, calculée une seule fois pour tout l'import.
+    Returns:
+        tuple: (livres valides, rejets). Les livres valides sont des couples (numéro de ligne,
+            valeurs) et les rejets des triplets (numéro de ligne, contenu brut, raison).
+    """
+    valides, rejets = [], []
+    for numero, brut in lignes:
+        try:
+            donnees = json.loads(brut) if format_source == "jsonl" else brut
+            if not isinstance(donnees, dict):
+                raise ValueError("La ligne n'est pas un objet.")
+            valeurs = _convertir(donnees, texte=format_source == "csv")
+        except ValueError as erreur:
+            rejets.append((numero, brut, f"Ligne illisible : {erreur}"))
+            continue
+        erreur = valider_livre(*valeurs[:5], annee_max=annee_max)
+        if erreur:
+            rejets.append((numero, brut, erreur))
+        else:
+            valides.append((numero, valeurs))
+    return valides, rejets
+
+
+def _lire_lignes(chemin, format_source):
+    """Fonction pour lire le fichier source ligne par ligne, sans le charger entièrement.
+
+    Args:
+        chemin (str): Chemin du fichier.
+        format_source (str): "csv" ou "jsonl".
+    Yields:
+        tuple: (numéro de ligne, contenu brut).
+    """
+    with open(chemin, "r", encoding="utf-8", newline="") as f:
+        if format_source == "csv":
+            lecteur = csv.DictReader(f)
+            manquantes = [colonne for colonne in COLONNES_CSV if colonne not in (lecteur.fieldnames or ())]
+            if manquantes:
+                raise ValueError(f"Colonnes manquantes dans '{chemin}' : {', '.join(manquantes)}")
+            for numero, ligne in enumerate(lecteur, start=2): # La ligne 1 est l'en-tête
+                yield numero, ligne
+        else:
+            for numero, ligne in enumerate(f, start=1):
+                if ligne.strip():
+                    yield numero, ligne.rstrip("\n")
+
+
+def _lots(iterable, taille):
+    """Fonction pour découper un itérable en listes de `taille` éléments."""
+    iterateur = iter(iterable)
+    while True:
+        lot = list(itertools.islice(iterateur, taille))
+        if not lot:
+            return
+        yield lot
+
+
+def _traiter_en_parallele(lots, format_source, annee_max, processus):
+    """Fonction pour traiter les lots dans un pool de processus, en conservant leur ordre.
+
+    Seuls quelques lots sont en cours à la fois, pour que la mémoire reste bornée.
+
+    Yields:
+        tuple: Résultat de `_traiter_lot` pour chaque lot, dans l'ordre du fichier.
+    """
+    processus = processus or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=processus) as pool:
+        en_cours = collections.deque()
+        for lot in lots:
+            en_cours.append(pool.submit(_traiter_lot, lot, format_source, annee_max))
+            if len(en_cours) >= 2 * processus: # Fenêtre pleine : attente du plus ancien lot
+                yield en_cours.popleft().result()
+        while en_cours:
+            yield en_cours.popleft().result()
+
+
+def importer_livres(livres, chemin, format_source=None, fichier_rejets=None, taille_lot=TAILLE_LOT, processus=None):
+    """Fonction pour importer en masse un flux de livres (CSV ou JSON Lines) dans le catalogue.
+
+    Les lignes JSON Lines sont analysées et validées par lots dans un pool de processus
+    (`processus=1` pour tout traiter dans le processus courant). Les lignes CSV sont
+    validées dans le processus courant : le lecteur CSV, qui gère les champs sur plusieurs
+    lignes, les a déjà découpées, et il ne resterait aux processus que la validation, moins
+    coûteuse que l'envoi des lignes au pool. Les livres déjà présents dans le
+    catalogue ou répétés dans le flux (même titre, auteur et année) sont rejetés. Les IDs
+    sont attribués en un seul bloc et les ajouts sont rendus durables en une seule fois. Rien n'est
+    affiché livre par livre : la fonction renvoie un résumé et écrit les lignes rejetées,
+    avec leur raison, dans un fichier JSON Lines.
+
+    Args:
+        livres (Catalogue): Catalogue dans lequel importer.
+        chemin (str): Fichier source (`.csv` ou `.jsonl`).
+        format_source (str): "csv" ou "jsonl" (déduit de l'extension par défaut).
+        fichier_rejets (str): Fichier des lignes rejetées (par défaut `<chemin>.rejets.jsonl`).
+        taille_lot (int): Nombre de lignes par lot.
+        processus (int): Nombre de processus pour le JSON Lines (par défaut, le nombre de processeurs).
+    Returns:
+        dict: Résumé (`lus`, `importes`, `rejetes`, `doublons`, `duree`, `fichier_rejets`).
+    """
+    debut = time.perf_counter()
+    if format_source is None:
+        format_source = "csv" if chemin.lower().endswith(".csv") else "jsonl"
+    if fichier_rejets is None:
+        fichier_rejets = chemin + ".rejets.jsonl"
+    annee_max = datetime.datetime.now().year # Calculée une seule fois pour tout l'import
+
+    # Analyse et validation des lots, en parallèle si nécessaire
+    lots = _lots(_lire_lignes(chemin, format_source), taille_lot)
+    if processus == 1 or format_source == "csv":
+        resultats = (_traiter_lot(lot, format_source, annee_max) for lot in lots)
+    else:
+        resultats = _traiter_en_parallele(lots, format_source, annee_max, processus)
+
+    # Dédoublonnage par rapport au catalogue existant et à l'intérieur du flux
+    connus = {cle_doublon(livre["titre"], livre["auteur"], livre["année_publication"]) for livre in livres}
+    a_importer = []
+    lus = rejetes = doublons = 0
+    with open(fichier_rejets, "w", encoding="utf-8") as rejets:
+        for valides, rejets_lot in resultats:
+            lus += len(valides) + len(rejets_lot)
+            for numero, brut, raison in rejets_lot:
+                rejets.write(json.dumps({"ligne": numero, "donnees": brut, "raison": raison}, ensure_ascii=False) + "\n")
+            rejetes += len(rejets_lot)
+            for numero, valeurs in valides:
+                cle = cle_doublon(valeurs[0], valeurs[1], valeurs[3])
+                if cle in connus:
+                    doublons += 1
+                    rejets.write(json.dumps({"ligne": numero, "donnees": dict(zip(COLONNES_CSV + ("disponible",), valeurs)), "raison": "Doublon d'un livre existant"}, ensure_ascii=False) + "\n")
+                    continue
+                connus.add(cle)
+                a_importer.append(valeurs)
+
+    # Attribution des IDs en un seul bloc (par la base, partagée entre les postes, avec le stockage SQLite) et ajout groupé au catalogue
+    stockage = getattr(livres, "stockage", None)
+    if stockage is not None and a_importer:
+        ids = stockage.reserver_ids(len(a_importer))
+        livres.avancer_ids(ids[-1])
+    else:
+        ids = livres.reserver_ids(len(a_importer))
+    with livres.lot(): # Une seule écriture durable pour tout le lot
+        for id_livre, (titre, auteur, genre, annee, prix, disponible) in zip(ids, a_importer):
+            livres.append(Livre(id_livre, titre, auteur, genre, annee, prix, disponible))
+
+    return {
+        "lus": lus,
+        "importes": len(a_importer),
+        "rejetes": rejetes + doublons,
+        "doublons": doublons,
+        "duree": time.perf_counter() - debut,
+        "fichier_rejets": fichier_rejets,
+    }
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Index texte
+Description : Index inversé de trigrammes sur le titre, l'auteur et le genre, pour la
+              recherche de sous-chaînes insensible à la casse.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Définition des constantes
+CHAMPS_INDEXES = ("titre", "auteur", "genre")
+TAILLE_NGRAMME = 3
+
+
+# Définition des fonctions
+def trigrammes(texte):
+    """Fonction pour extraire l'ensemble des trigrammes d'un texte déjà normalisé.
+
+    Args:
+        texte (str): Texte normalisé (casefold).
+    Returns:
+        set: Ensemble des sous-chaînes de longueur `TAILLE_NGRAMME`.
+    """
+    return {texte[i:i + TAILLE_NGRAMME] for i in range(len(texte) - TAILLE_NGRAMME + 1)}
+
+
+# Définition des classes
+class IndexTrigrammes:
+    """Classe représentant l'index de trigrammes du catalogue.
+
+    Pour chaque champ indexé, l'index conserve la valeur déjà normalisée (casefold) de
+    chaque livre et, pour chaque trigramme, l'ensemble des IDs qui le contiennent. Une
+    recherche intersecte les listes des trigrammes de la valeur cherchée, en commençant
+    par la plus courte, puis vérifie la sous-chaîne sur les seuls candidats.
+    L'index est abonné au catalogue et mis à jour à chaque ajout ou suppression.
+    """
+
+    def __init__(self):
+        """Constructeur de l'index."""
+        self._cles = {champ: {} for champ in CHAMPS_INDEXES} # champ → {ID: valeur normalisée}
+        self._listes = {champ: {} for champ in CHAMPS_INDEXES} # champ → {trigramme: {IDs}}
+        self._ordre = {} # ID → numéro d'insertion, pour rendre les résultats dans l'ordre d'ajout
+        self._compteur = 0
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "ajout":
+            self.indexer(livre)
+        elif operation == "suppression":
+            self.retirer(livre)
+
+    def indexer(self, livre):
+        """Méthode pour ajouter un livre à l'index.
+
+        Args:
+            livre (Livre): Livre à indexer.
+        """
+        id_livre = livre["id"]
+        self._ordre[id_livre] = self._compteur
+        self._compteur += 1
+        for champ in CHAMPS_INDEXES:
+            cle = str(livre.get(champ, "")).casefold()
+            self._cles[champ][id_livre] = cle
+            listes = self._listes[champ]
+            for trigramme in trigrammes(cle):
+                listes.setdefault(trigramme, set()).add(id_livre)
+
+    def retirer(self, livre):
+        """Méthode pour retirer un livre de l'index.
+
+        Args:
+            livre (Livre): Livre à retirer.
+        """
+        id_livre = livre["id"]
+        self._ordre.pop(id_livre, None)
+        for champ in CHAMPS_INDEXES:
+            cle = self._cles[champ].pop(id_livre, None)
+            if cle is None:
+                continue
+            listes = self._listes[champ]
+            for trigramme in trigrammes(cle):
+                ids = listes.get(trigramme)
+                if ids is not None:
+                    ids.discard(id_livre)
+                    if not ids: # Trigramme devenu inutilisé
+                        del listes[trigramme]
+
+    def estimer(self, champ, cible):
+        """Méthode pour majorer, sans la faire, le nombre de résultats d'une recherche.
+
+        Args:
+            champ (str): Champ indexé ("titre", "auteur", "genre").
+            cible (str): Valeur cherchée, déjà normalisée (casefold).
+        Returns:
+            int: Taille de la plus courte liste de trigrammes de la valeur (0 si un trigramme est absent).
+        """
+        if len(cible) < TAILLE_NGRAMME: # Trop court pour l'index : tous les livres sont candidats
+            return len(self._cles[champ])
+        listes = self._listes[champ]
+        return min(len(listes.get(trigramme, ())) for trigramme in trigrammes(cible))
+
+    def rechercher(self, champ, cible):
+        """Méthode pour trouver les livres dont le champ contient une valeur.
+
+        Args:
+            champ (str): Champ indexé ("titre", "auteur", "genre").
+            cible (str): Valeur cherchée, déjà normalisée (casefold).
+        Returns:
+            list: IDs des livres correspondants, dans l'ordre d'ajout.
+        """
+        cles = self._cles[champ]
+        if len(cible) < TAILLE_NGRAMME: # Trop court pour l'index : vérification des valeurs normalisées
+            ids = [id_livre for id_livre, cle in cles.items() if cible in cle]
+        else:
+            listes = self._listes[champ]
+            candidats = []
+            for trigramme in trigrammes(cible):
+                ids_trigramme = listes.get(trigramme)
+                if ids_trigramme is None: # Un trigramme absent suffit à exclure toute correspondance
+                    return []
+                candidats.append(ids_trigramme)
+            candidats.sort(key=len) # Intersection à partir de la liste la plus sélective
+            ids = candidats[0].intersection(*candidats[1:])
+            ids = [id_livre for id_livre in ids if cible in cles[id_livre]] # Vérification de la sous-chaîne
+        return sorted(ids, key=self._ordre.__getitem__)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Instrumentation
+Description : Mesures facultatives des opérations (histogrammes de latence, nombre d'appels,
+              taille du catalogue, octets écrits), exportées dans un fichier local au format
+              texte Prometheus ou JSON. Désactivées, elles ne coûtent qu'un test par appel.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import bisect
+import contextlib
+import functools
+import json
+import math
+import os
+import time
+
+# Définition des constantes
+FICHIER_METRIQUES = "bibliotheque_metriques.prom" # Fichier des mesures (JSON si l'extension est .json)
+VARIABLE_ACTIVATION = "BIBLIOTHEQUE_METRIQUES" # "1" pour activer, ou chemin du fichier des mesures
+LIMITES = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0) # Limites des classes de latence (secondes)
+
+# État des mesures
+_actif = False
+_chemin = FICHIER_METRIQUES
+_latences = {} # Nom de l'opération → Histogramme
+_octets = {} # Destination → octets écrits
+_jauges = {} # Nom → dernière valeur (taille du catalogue...)
+
+
+# Définition des classes
+class Histogramme:
+    """Classe représentant l'histogramme des latences d'une opération (classes fixes, comme Prometheus)."""
+
+    __slots__ = ("comptes", "nombre", "somme", "maximum")
+
+    def __init__(self):
+        """Constructeur de l'histogramme vide."""
+        self.comptes = [0] * (len(LIMITES) + 1) # Dernière classe : au-delà de la plus grande limite
+        self.nombre = 0
+        self.somme = 0.0
+        self.maximum = 0.0
+
+    def ajouter(self, duree):
+        """Méthode pour enregistrer une durée (secondes)."""
+        self.comptes[bisect.bisect_left(LIMITES, duree)] += 1
+        self.nombre += 1
+        self.somme += duree
+        self.maximum = max(self.maximum, duree)
+
+    def quantile(self, q):
+        """Méthode pour estimer un quantile par la limite supérieure de sa classe.
+
+        Args:
+            q (float): Quantile recherché, entre 0 et 1.
+        Returns:
+            float: Durée estimée (secondes), bornée par le maximum observé.
+        """
+        if not self.nombre:
+            return 0.0
+        rang, cumul = math.ceil(q * self.nombre), 0
+        for limite, compte in zip(LIMITES + (math.inf,), self.comptes):
+            cumul += compte
+            if cumul >= rang:
+                return min(limite, self.maximum)
+        return self.maximum
+
+
+# Définition des fonctions
+def activer(chemin=None):
+    """Fonction pour activer les mesures.
+
+    Args:
+        chemin (str): Fichier des mesures (par défaut `bibliotheque_metriques.prom`).
+    """
+    global _actif, _chemin
+    _actif = True
+    _chemin = chemin or _chemin
+
+
+def est_actif():
+    """Fonction pour savoir si les mesures sont activées."""
+    return _actif
+
+
+def chemin_metriques():
+    """Fonction pour obtenir le chemin du fichier des mesures."""
+    return _chemin
+
+
+@contextlib.contextmanager
+def chronometrer(nom):
+    """Fonction (gestionnaire de contexte) pour mesurer la durée d'un bloc sous le nom donné."""
+    if not _actif:
+        yield
+        return
+    debut = time.perf_counter()
+    try:
+        yield
+    finally:
+        _latences.setdefault(nom, Histogramme()).ajouter(time.perf_counter() - debut)
+
+
+def mesure(fonction):
+    """Décorateur pour mesurer la latence et le nombre d'appels d'une fonction, si les mesures sont activées."""
+    @functools.wraps(fonction)
+    def fonction_mesuree(*args, **kwargs):
+        if not _actif: # Mesures désactivées : appel direct
+            return fonction(*args, **kwargs)
+        with chronometrer(fonction.__name__):
+            return fonction(*args, **kwargs)
+    return fonction_mesuree
+
+
+def compter_octets(destination, nombre):
+    """Fonction pour ajouter des octets écrits sur disque.
+
+    Args:
+        destination (str): Type de fichier écrit ("instantane", "journal", "export"...).
+        nombre (int): Nombre d'octets écrits.
+    """
+    if _actif:
+        _octets[destination] = _octets.get(destination, 0) + nombre
+
+
+def definir_jauge(nom, valeur):
+    """Fonction pour enregistrer la valeur courante d'une grandeur (par exemple la taille du catalogue)."""
+    if _actif:
+        _jauges[nom] = valeur
+
+
+def instantane():
+    """Fonction pour obtenir toutes les mesures sous forme de dictionnaire.
+
+    Returns:
+        dict: `latences` (par opération : appels, somme, maximum, p50, p95, p99 et classes),
+            `octets_ecrits` et `jauges`.
+    """
+    return {
+        "latences": {
+            nom: {
+                "appels": histogramme.nombre,
+                "somme": histogramme.somme,
+                "maximum": histogramme.maximum,
+                "p50": histogramme.quantile(0.5),
+                "p95": histogramme.quantile(0.95),
+                "p99": histogramme.quantile(0.99),
+                "classes": dict(zip([str(limite) for limite in LIMITES] + ["+Inf"], histogramme.comptes)),
+            }
+            for nom, histogramme in sorted(_latences.items())
+        },
+        "octets_ecrits": dict(sorted(_octets.items())),
+        "jauges": dict(sorted(_jauges.items())),
+    }
+
+
+def _format_prometheus():
+    """Fonction pour mettre les mesures au format texte de Prometheus."""
+    lignes = ["# HELP bibliotheque_latence_secondes Durée des opérations de la bibliothèque.", "# TYPE bibliotheque_latence_secondes histogram"]
+    for nom, histogramme in sorted(_latences.items()):
+        cumul = 0
+        for limite, compte in zip([str(limite) for limite in LIMITES] + ["+Inf"], histogramme.comptes):
+            cumul += compte
+            lignes.append(f'bibliotheque_latence_secondes_bucket{{operation="{nom}",le="{limite}"}} {cumul}')
+        lignes.append(f'bibliotheque_latence_secondes_sum{{operation="{nom}"}} {histogramme.somme}')
+        lignes.append(f'bibliotheque_latence_secondes_count{{operation="{nom}"}} {histogramme.nombre}')
+    lignes += ["# HELP bibliotheque_octets_ecrits_total Octets écrits sur disque.", "# TYPE bibliotheque_octets_ecrits_total counter"]
+    lignes += [f'bibliotheque_octets_ecrits_total{{destination="{destination}"}} {nombre}' for destination, nombre in sorted(_octets.items())]
+    for nom, valeur in sorted(_jauges.items()):
+        lignes += [f"# TYPE bibliotheque_{nom} gauge", f"bibliotheque_{nom} {valeur}"]
+    return "\n".join(lignes) + "\n"
+
+
+def ecrire_metriques(chemin=None):
+    """Fonction pour écrire les mesures dans le fichier local (remplacé d'un seul coup).
+
+    Args:
+        chemin (str): Fichier de destination (par défaut celui donné à `activer`). Une
+            extension `.json` donne du JSON, toute autre le format texte de Prometheus.
+    """
+    if not _actif:
+        return
+    chemin = chemin or _chemin
+    contenu = json.dumps(instantane(), ensure_ascii=False, indent=4) if chemin.endswith(".json") else _format_prometheus()
+    temporaire = chemin + ".tmp"
+    with open(temporaire, "w", encoding="utf-8") as f:
+        f.write(contenu)
+    os.replace(temporaire, chemin) # Un lecteur (Prometheus, node_exporter) ne voit jamais un fichier partiel
+
+
+# Activation par variable d'environnement
+if os.environ.get(VARIABLE_ACTIVATION):
+    activer(None if os.environ[VARIABLE_ACTIVATION] == "1" else os.environ[VARIABLE_ACTIVATION])
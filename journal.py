@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Journal
+Description : Journal des modifications (write-ahead log) ajouté et synchronisé sur disque
+              à chaque opération, puis compacté périodiquement dans `bibliotheque.json`.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import contextlib
+import hashlib
+import json
+import os
+from notation import migrer_notes
+from livre import Livre
+from instrumentation import compter_octets, est_actif
+
+
+# Définition des constantes
+POINT_DE_CONTROLE = "point_de_controle" # Ligne écrite avant chaque remplacement de l'instantané
+EXTENSION_ORPHELIN = ".orphelin" # Journal qui ne correspond plus à l'instantané, mis de côté
+TAILLE_LECTURE = 1 << 20 # Taille des blocs lus pour calculer l'empreinte (1 Mio)
+
+
+# Définition des fonctions
+def identite_instantane(chemin):
+    """Fonction pour identifier une version du fichier instantané (taille et date de modification).
+
+    Args:
+        chemin (str): Chemin du fichier instantané.
+    Returns:
+        list: `[taille, mtime_ns]`, ou None si le fichier n'existe pas.
+    """
+    try:
+        stat = os.stat(chemin)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def empreinte_instantane(chemin):
+    """Fonction pour calculer l'empreinte (BLAKE2b) du contenu du fichier instantané.
+
+    Contrairement à la taille et à la date de modification, l'empreinte ne change pas
+    lorsque le fichier est copié, restauré ou simplement touché.
+
+    Args:
+        chemin (str): Chemin du fichier instantané.
+    Returns:
+        str: Empreinte hexadécimale, ou None si le fichier n'existe pas.
+    """
+    hachage = hashlib.blake2b(digest_size=16)
+    try:
+        with open(chemin, "rb") as f:
+            while bloc := f.read(TAILLE_LECTURE):
+                hachage.update(bloc)
+    except FileNotFoundError:
+        return None
+    return hachage.hexdigest()
+
+
+# Définition des classes
+class Journal:
+    """Classe représentant le journal des modifications du catalogue.
+
+    Chaque ligne du fichier est un objet JSON. La première ligne est un en-tête qui
+    identifie, par l'empreinte de son contenu, l'instantané sur lequel le journal
+    s'appuie. L'en-tête conserve aussi le plus grand ID attribué, pour qu'un ID supprimé
+    ne soit jamais réattribué après un redémarrage.
+
+    Chaque point de contrôle ajoute au journal, avant de remplacer l'instantané, une
+    ligne qui donne l'empreinte du futur instantané et le nombre d'opérations qu'il
+    intègre : si l'arrêt survient avant que le journal soit reparti de ce nouvel
+    instantané, seules les opérations suivantes sont rejouées. Un journal qui ne
+    correspond ni à l'instantané ni à l'un de ses points de contrôle (instantané remplacé
+    à la main, par exemple) n'est jamais effacé : il est mis de côté (`.orphelin`).
+    """
+
+    def __init__(self, chemin, chemin_instantane):
+        """Constructeur du journal.
+
+        Args:
+            chemin (str): Chemin du fichier journal.
+            chemin_instantane (str): Chemin de l'instantané JSON associé.
+        """
+        self.chemin = chemin
+        self.chemin_instantane = chemin_instantane
+        self.nombre_entrees = 0 # Nombre d'opérations depuis le dernier point de contrôle
+        self.orphelin = None # Chemin du journal mis de côté au dernier rejeu, le cas échéant
+        self._fichier = None
+        self._taille_durable = 0 # Taille du fichier à la dernière synchronisation réussie
+        self._entrees_durables = 0 # Valeur de `nombre_entrees` à la dernière synchronisation réussie
+        self._lot = 0 # Profondeur des lots en cours : la synchronisation est alors différée
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "ajout":
+            entree = {"op": operation, "livre": livre}
+        else:
+            entree = {"op": operation, "id": livre["id"], **details}
+        self._ecrire(entree)
+
+    def _ecrire(self, entree):
+        self._ajouter_ligne(json.dumps(entree, ensure_ascii=False, default=Livre.en_dict) + "\n")
+        self.nombre_entrees += 1
+        if not self._lot:
+            self.synchroniser() # L'opération est durable avant de rendre la main
+
+    def _ajouter_ligne(self, ligne):
+        if self._fichier is None: # Ouverture paresseuse du fichier en ajout
+            self._fichier = open(self.chemin, "a", encoding="utf-8")
+            self._taille_durable = os.fstat(self._fichier.fileno()).st_size
+            self._entrees_durables = self.nombre_entrees
+        try:
+            self._fichier.write(ligne)
+        except OSError:
+            self._annuler()
+            raise
+        if est_actif():
+            compter_octets("journal", len(ligne.encode("utf-8")))
+
+    def synchroniser(self):
+        """Méthode pour écrire sur disque (fsync) les entrées en attente.
+
+        Raises:
+            OSError: Si l'écriture échoue ; les entrées en attente sont alors retirées du journal.
+        """
+        if self._fichier is not None:
+            try:
+                self._fichier.flush()
+                os.fsync(self._fichier.fileno())
+            except OSError:
+                self._annuler()
+                raise
+            self._taille_durable = os.fstat(self._fichier.fileno()).st_size
+            self._entrees_durables = self.nombre_entrees
+
+    def _annuler(self):
+        """Méthode pour ramener le journal à sa dernière synchronisation réussie après un échec d'écriture.
+
+        Une ligne écrite en partie rendrait illisibles les entrées suivantes : le fichier est
+        tronqué à sa taille synchronisée et rouvert à la prochaine entrée.
+        """
+        try:
+            self._fichier.close()
+        except OSError: # Entrées en attente abandonnées
+            pass
+        self._fichier = None
+        try:
+            os.truncate(self.chemin, self._taille_durable)
+        except OSError: # Ligne incomplète ignorée au prochain rejeu
+            pass
+        self.nombre_entrees = self._entrees_durables
+
+    @contextlib.contextmanager
+    def lot(self):
+        """Méthode (gestionnaire de contexte) pour regrouper plusieurs opérations en une seule synchronisation.
+
+        Les entrées écrites dans le bloc `with` sont synchronisées ensemble à sa sortie,
+        ce qui évite un `fsync` par livre lors d'un import ou d'un traitement par lot.
+        """
+        self._lot += 1
+        try:
+            yield self
+        finally:
+            self._lot -= 1
+            if not self._lot:
+                self.synchroniser()
+
+    def rejouer(self, catalogue, empreinte=None):
+        """Méthode pour rejouer le journal sur un catalogue chargé depuis l'instantané.
+
+        Une dernière ligne incomplète (arrêt brutal pendant l'écriture) est ignorée et
+        retirée du fichier.
+
+        Args:
+            catalogue (Catalogue): Catalogue à mettre à jour.
+            empreinte (str): Empreinte de l'instantané si l'appelant l'a déjà calculée (calculée sinon).
+        Returns:
+            int: Nombre d'opérations rejouées.
+        """
+        if empreinte is None:
+            empreinte = empreinte_instantane(self.chemin_instantane)
+        if not os.path.exists(self.chemin): # Aucun journal : on en démarre un nouveau
+            self.reinitialiser(catalogue.id_max, empreinte)
+            return 0
+        entrees = []
+        taille_valide = 0
+        with open(self.chemin, "rb") as f:
+            for ligne in f:
+                try:
+                    entrees.append(json.loads(ligne))
+                except ValueError: # Ligne incomplète : fin du journal exploitable
+                    break
+                taille_valide += len(ligne)
+        entete = entrees[0] if entrees and entrees[0].get("op") == "entete" else {}
+        points = [entree for entree in entrees[1:] if entree.get("op") == POINT_DE_CONTROLE]
+        operations = [entree for entree in entrees[1:] if entree.get("op") != POINT_DE_CONTROLE]
+        # IDs déjà attribués, y compris à des livres supprimés depuis : ils ne seront pas réattribués
+        catalogue.avancer_ids(max([entete.get("id_max", 0)] + [point["id_max"] for point in points] + [entree["livre"]["id"] for entree in operations if entree.get("op") == "ajout"]))
+        # Première opération que l'instantané n'intègre pas encore
+        debut = 0 if entete and self._correspond(entete, empreinte) else None
+        for point in points:
+            if point.get("empreinte") == empreinte: # Point de contrôle interrompu après le remplacement de l'instantané
+                debut = point["entrees"]
+        if debut is None:
+            if operations: # Journal d'un autre instantané : conservé à part plutôt qu'effacé
+                self.orphelin = self._mettre_de_cote()
+            self.reinitialiser(catalogue.id_max, empreinte)
+            return 0
+        if taille_valide < os.path.getsize(self.chemin): # Suppression de la ligne incomplète
+            with open(self.chemin, "r+b") as f:
+                f.truncate(taille_valide)
+        for entree in operations[debut:]:
+            appliquer_entree(catalogue, entree)
+        self.nombre_entrees = len(operations)
+        if debut: # Journal repris à partir de l'instantané actuel
+            self.rebaser(empreinte, debut, catalogue.id_max)
+        return self.nombre_entrees
+
+    def _correspond(self, entete, empreinte):
+        """Méthode pour vérifier que l'en-tête du journal désigne l'instantané actuel."""
+        if "instantane" in entete: # En-tête des versions précédentes (taille et date de modification)
+            return entete["instantane"] == identite_instantane(self.chemin_instantane)
+        return entete.get("empreinte") == empreinte
+
+    def _mettre_de_cote(self):
+        """Méthode pour renommer le journal en `.orphelin`, sans écraser un journal déjà mis de côté.
+
+        Returns:
+            str: Nouveau chemin du journal.
+        """
+        self.fermer()
+        destination = self.chemin + EXTENSION_ORPHELIN
+        numero = 1
+        while os.path.exists(destination):
+            destination = f"{self.chemin}{EXTENSION_ORPHELIN}.{numero}"
+            numero += 1
+        os.replace(self.chemin, destination)
+        return destination
+
+    def marquer(self, empreinte, entrees, id_max):
+        """Méthode pour annoncer, avant de remplacer l'instantané, le point de contrôle en cours.
+
+        Args:
+            empreinte (str): Empreinte (`empreinte_instantane`) du nouvel instantané, encore temporaire.
+            entrees (int): Nombre d'opérations du journal intégrées au nouvel instantané.
+            id_max (int): Plus grand ID attribué au moment de la copie.
+        """
+        self._ajouter_ligne(json.dumps({"op": POINT_DE_CONTROLE, "empreinte": empreinte, "entrees": entrees, "id_max": id_max}) + "\n")
+        self.synchroniser()
+
+    def rebaser(self, empreinte, entrees, id_max):
+        """Méthode pour faire repartir le journal d'un instantané qui intègre ses premières opérations.
+
+        Le journal est réécrit à côté puis renommé : il reste lisible à tout moment.
+
+        Args:
+            empreinte (str): Empreinte du nouvel instantané.
+            entrees (int): Nombre d'opérations du journal intégrées à l'instantané.
+            id_max (int): Plus grand ID attribué, conservé dans l'en-tête.
+        """
+        self.fermer()
+        with open(self.chemin, "r", encoding="utf-8") as f:
+            lignes = [ligne for ligne in f.readlines()[1:] if json.loads(ligne).get("op") != POINT_DE_CONTROLE]
+        temporaire = self.chemin + ".tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "entete", "empreinte": empreinte, "id_max": id_max}) + "\n")
+            f.writelines(lignes[entrees:])
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporaire, self.chemin)
+        self.nombre_entrees = len(lignes) - entrees
+
+    def reinitialiser(self, id_max=0, empreinte=None):
+        """Méthode pour démarrer un journal vide sur l'instantané actuel.
+
+        Args:
+            id_max (int): Plus grand ID attribué par le catalogue, conservé dans l'en-tête.
+            empreinte (str): Empreinte de l'instantané si l'appelant l'a déjà calculée (calculée sinon).
+        """
+        if empreinte is None:
+            empreinte = empreinte_instantane(self.chemin_instantane)
+        self.fermer()
+        with open(self.chemin, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "entete", "empreinte": empreinte, "id_max": id_max}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.nombre_entrees = 0
+
+    def fermer(self):
+        """Méthode pour fermer le fichier journal."""
+        if self._fichier is not None:
+            self._fichier.close()
+            self._fichier = None
+
+
+def appliquer_entree(catalogue, entree):
+    """Fonction pour appliquer une entrée du journal à un catalogue.
+
+    Les opérations sont idempotentes vis-à-vis des ajouts et suppressions déjà présents.
+
+    Args:
+        catalogue (Catalogue): Catalogue à modifier.
+        entree (dict): Entrée du journal.
+    """
+    operation = entree["op"]
+    if operation == "ajout":
+        if not catalogue.contient_id(entree["livre"]["id"]):
+            livre = entree["livre"]
+            migrer_notes(livre) # Entrée écrite avant le passage à la répartition des notes
+            catalogue.append(livre)
+    elif operation == "suppression":
+        catalogue.supprimer(entree["id"])
+    elif operation == "emprunt":
+        catalogue.definir_disponibilite(entree["id"], False)
+    elif operation == "retour":
+        catalogue.definir_disponibilite(entree["id"], True)
+    elif operation == "note":
+        catalogue.ajouter_note(entree["id"], entree["note"])
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Livre
+Description : Représentation compacte d'un livre (classe à `__slots__`), accessible comme
+              un dictionnaire et convertible sans perte vers les formats JSON et CSV.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import datetime
+import sys
+from array import array
+from notation import migrer_notes
+
+# Définition des constantes
+# Correspondance entre les clés du format JSON et les attributs de la classe
+CLES_ATTRIBUTS = {
+    "id": "id",
+    "titre": "titre",
+    "auteur": "auteur",
+    "genre": "genre",
+    "année_publication": "annee_publication",
+    "prix": "prix",
+    "disponible": "disponible",
+    "repartition_notes": "repartition_notes",
+    "note_moyenne": "note_moyenne",
+}
+CHAMPS_CSV = ("id", "titre", "auteur", "genre", "année_publication", "prix", "disponible")
+
+
+# Définition des fonctions
+def valider_livre(titre, auteur, genre, annee, prix, annee_max=None):
+    """Fonction pour valider les données d'un nouveau livre, sans affichage.
+
+    Args:
+        titre (str): Titre du livre.
+        auteur (str): Auteur du livre.
+        genre (str): Genre du livre.
+        annee (int): Année de publication.
+        prix (float): Prix du livre.
+        annee_max (int): Année maximale acceptée (par défaut l'année en cours), à calculer
+            une seule fois lors d'une validation en masse.
+    Returns:
+        str: Message d'erreur, ou None si les données sont valides.
+    """
+    # Vérification des données manquantes
+    donnees_manquantes = [nom for nom, val in {"titre": titre, "auteur": auteur, "genre": genre, "année de publication": annee, "prix": prix}.items() if not val]
+    if donnees_manquantes:
+        return f"Les données suivantes sont manquantes : {', '.join(donnees_manquantes)}"
+    # Vérification de la validité des données (année, prix positif, etc.)
+    if annee_max is None:
+        annee_max = datetime.datetime.now().year
+    if not isinstance(annee, int) or annee < 1000 or annee > annee_max:
+        return "L'année de publication doit être un entier valide entre 0 et l'année actuelle."
+    if not isinstance(prix, (int, float)) or prix < 0:
+        return "Le prix doit être un nombre positif."
+    return None
+
+
+# Définition des classes
+class Livre:
+    """Classe représentant un livre du catalogue.
+
+    Les attributs sont stockés dans des `__slots__` plutôt que dans un dictionnaire par
+    livre, la répartition des notes dans un `array` d'entiers, et les auteurs et genres,
+    très répétés, sont internés. Un livre reste utilisable comme le dictionnaire
+    d'origine (`livre["année_publication"]`, `livre.get("notes")`, `"prix" in livre`),
+    ce qui permet aux fonctions de `bibliotheque.py` de le manipuler sans changement.
+    Les clés inconnues sont conservées à part pour un aller-retour JSON sans perte.
+    """
+
+    __slots__ = ("id", "titre", "auteur", "genre", "annee_publication", "prix", "disponible", "repartition_notes", "note_moyenne", "_autres")
+
+    def __init__(self, id, titre, auteur, genre, annee_publication, prix, disponible=True, repartition_notes=None, note_moyenne=None):
+        """Constructeur du livre.
+
+        Args:
+            id (int): Identifiant unique du livre.
+            titre (str): Titre du livre.
+            auteur (str): Auteur du livre.
+            genre (str): Genre du livre.
+            annee_publication (int): Année de publication.
+            prix (float): Prix du livre.
+            disponible (bool): True si le livre est disponible.
+            repartition_notes (iterable): Nombre de notes pour 1 à 5 étoiles.
+            note_moyenne (float): Note moyenne, ou None sans note.
+        """
+        self.id = id
+        self.titre = titre
+        self.auteur = sys.intern(auteur) if isinstance(auteur, str) else auteur
+        self.genre = sys.intern(genre) if isinstance(genre, str) else genre
+        self.annee_publication = annee_publication
+        self.prix = prix
+        self.disponible = disponible
+        self.repartition_notes = array("i", repartition_notes if repartition_notes is not None else (0, 0, 0, 0, 0))
+        self.note_moyenne = note_moyenne
+        self._autres = None # Clés supplémentaires éventuelles du format JSON
+
+    # Conversions
+    @classmethod
+    def depuis_dict(cls, donnees):
+        """Méthode pour créer un livre à partir de son dictionnaire (format JSON).
+
+        Args:
+            donnees (dict): Livre au format dictionnaire (l'ancienne liste `notes` est convertie).
+        Returns:
+            Livre: Livre correspondant.
+        """
+        if "repartition_notes" not in donnees: # Ancien format : conversion de la liste de notes
+            donnees = dict(donnees)
+            migrer_notes(donnees)
+        livre = cls(donnees["id"], donnees["titre"], donnees["auteur"], donnees["genre"], donnees["année_publication"], donnees["prix"], donnees["disponible"], donnees.get("repartition_notes"), donnees.get("note_moyenne"))
+        autres = {cle: valeur for cle, valeur in donnees.items() if cle not in CLES_ATTRIBUTS}
+        if autres:
+            livre._autres = autres
+        return livre
+
+    def en_dict(self):
+        """Méthode pour convertir le livre en dictionnaire (format JSON).
+
+        Returns:
+            dict: Livre au format dictionnaire, clés dans l'ordre du fichier JSON.
+        """
+        donnees = {cle: getattr(self, attribut) for cle, attribut in CLES_ATTRIBUTS.items()}
+        donnees["repartition_notes"] = self.repartition_notes.tolist()
+        if self._autres:
+            donnees.update(self._autres)
+        return donnees
+
+    def en_ligne_csv(self):
+        """Méthode pour convertir le livre en ligne CSV, dans l'ordre de `CHAMPS_CSV`.
+
+        Returns:
+            tuple: Valeurs des colonnes.
+        """
+        return (self.id, self.titre, self.auteur, self.genre, self.annee_publication, self.prix, self.disponible)
+
+    # Mise en cache (pickle) : état compact, plus rapide à écrire et à relire que les slots un à un
+    def __getstate__(self):
+        return (self.id, self.titre, self.auteur, self.genre, self.annee_publication, self.prix, self.disponible, self.repartition_notes.tobytes(), self.note_moyenne, self._autres)
+
+    def __setstate__(self, etat):
+        self.id, self.titre, self.auteur, self.genre, self.annee_publication, self.prix, self.disponible, repartition, self.note_moyenne, self._autres = etat
+        self.repartition_notes = array("i")
+        self.repartition_notes.frombytes(repartition)
+
+    # Accès comme un dictionnaire
+    def __getitem__(self, cle):
+        attribut = CLES_ATTRIBUTS.get(cle)
+        if attribut is not None:
+            return getattr(self, attribut)
+        if self._autres and cle in self._autres:
+            return self._autres[cle]
+        raise KeyError(cle)
+
+    def __setitem__(self, cle, valeur):
+        attribut = CLES_ATTRIBUTS.get(cle)
+        if attribut is not None:
+            setattr(self, attribut, valeur)
+        else:
+            if self._autres is None:
+                self._autres = {}
+            self._autres[cle] = valeur
+
+    def __contains__(self, cle):
+        return cle in CLES_ATTRIBUTS or bool(self._autres and cle in self._autres)
+
+    def get(self, cle, defaut=None):
+        """Méthode pour lire une valeur comme `dict.get`."""
+        try:
+            return self[cle]
+        except KeyError:
+            return defaut
+
+    def keys(self):
+        """Méthode pour lister les clés comme `dict.keys` (permet `dict(livre)`)."""
+        return list(CLES_ATTRIBUTS) + list(self._autres or ())
+
+    def __repr__(self):
+        return f"Livre({self.en_dict()!r})"
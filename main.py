@@ -11,14 +11,99 @@ Date : 2025
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
-from rich.align import Align
-from bibliotheque import ajouter_livre, afficher_tous_les_livres, rechercher_livre, emprunter_livre, retourner_livre, filtrer_par_genre, generer_rapport, supprimer_livre, charger_bibliotheque, sauvegarder_bibliotheque, noter_livre, export_csv
+from importation import importer_livres
+from sauvegarde import SauvegardeDifferee
+from instrumentation import activer, chemin_metriques, chronometrer, definir_jauge, ecrire_metriques, est_actif, instantane
+from bibliotheque import ajouter_livre, afficher_tous_les_livres, rechercher_livre, rechercher_approchee, filtrer_livres, emprunter_livre, retourner_livre, filtrer_par_genre, generer_rapport, supprimer_livre, charger_bibliotheque, sauvegarder_bibliotheque, noter_livre, export_csv, FICHIER_BIBLIOTHEQUE
 
 # Définition des constantes
 VERSION = "1.2"
 console = Console()
 
 # Définition des fonctions
+def parcourir_livres(livres, critere_tri="ID"):
+    """Fonction pour afficher les livres page par page avec navigation interactive.
+
+    Args:
+        livres (list): Liste des livres à afficher.
+        critere_tri (str): Critère de tri ("ID", "titre", "auteur", "prix").
+    """
+    page = 1
+    while True:
+        nombre_pages = afficher_tous_les_livres(livres, critere_tri, page) # Affichage de la page courante
+        if nombre_pages <= 1: # Une seule page : pas de navigation
+            return
+        # Demander l'action de navigation
+        action = Prompt.ask("[s]uivante, [p]récédente, [a]ller à la page, [q]uitter", choices=["s", "p", "a", "q"], default="s" if page < nombre_pages else "q")
+        if action == "s": # Page suivante
+            page = min(page + 1, nombre_pages)
+        elif action == "p": # Page précédente
+            page = max(page - 1, 1)
+        elif action == "a": # Aller à une page précise
+            try:
+                page = int(Prompt.ask(f"Numéro de page (1 à {nombre_pages})"))
+            except ValueError:
+                console.print("[red]Erreur : Le numéro de page doit être un entier.[/red]")
+        else: # Fin de la navigation
+            return
+
+
+def afficher_diagnostics():
+    """Fonction pour afficher les mesures de performance collectées depuis le lancement."""
+    if not est_actif(): # Mesures facultatives, désactivées par défaut
+        console.print("[yellow]Les mesures sont désactivées (variable d'environnement BIBLIOTHEQUE_METRIQUES=1 pour les activer au lancement).[/yellow]")
+        if Prompt.ask("Activer les mesures maintenant ?", choices=["Oui", "Non"], default="Non").lower() == "oui":
+            activer()
+            console.print(f"[green]Mesures activées : elles seront écrites dans '{chemin_metriques()}'.[/green]")
+        return
+    mesures = instantane()
+    # Tableau des latences par opération
+    from rich.table import Table
+    table = Table(title="⏱️ Durée des opérations")
+    table.add_column("Opération")
+    table.add_column("Appels", justify="right")
+    table.add_column("Moyenne (ms)", justify="right")
+    table.add_column("p50 (ms)", justify="right")
+    table.add_column("p95 (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    for nom, latence in sorted(mesures["latences"].items(), key=lambda element: element[1]["somme"], reverse=True): # Opérations les plus coûteuses en premier
+        table.add_row(nom, str(latence["appels"]), f"{latence['somme'] / latence['appels'] * 1000:.2f}", f"{latence['p50'] * 1000:.2f}", f"{latence['p95'] * 1000:.2f}", f"{latence['maximum'] * 1000:.2f}")
+    console.print(table)
+    console.print(f"Taille du catalogue : [bold]{len(livres)}[/bold] livres")
+    for destination, nombre in mesures["octets_ecrits"].items():
+        console.print(f"Octets écrits ({destination}) : [bold]{nombre}[/bold]")
+    ecrire_metriques()
+    console.print(f"[blue]Mesures écrites dans '{chemin_metriques()}'.[/blue]")
+
+
+def recherche_multicritere():
+    """Fonction pour rechercher les livres qui vérifient plusieurs critères à la fois (champs vides ignorés)."""
+    criteres = {}
+    genre = Prompt.ask("Genre (vide pour tous)", default="").strip()
+    auteur = Prompt.ask("Auteur, ou partie du nom (vide pour tous)", default="").strip()
+    if genre:
+        criteres["genre"] = genre
+    if auteur:
+        criteres["auteur"] = auteur
+    # Bornes numériques, incluses
+    try:
+        for cle, message, conversion in (("annee_min", "Année minimale", int), ("annee_max", "Année maximale", int), ("prix_min", "Prix minimal (€)", float), ("prix_max", "Prix maximal (€)", float), ("note_min", "Note moyenne minimale (1 à 5)", float)):
+            valeur = Prompt.ask(f"{message} (vide pour ignorer)", default="").strip()
+            if valeur:
+                criteres[cle] = conversion(valeur.replace(",", "."))
+    except ValueError:
+        console.print("[red]Erreur : Les années doivent être des entiers, les prix et la note des nombres.[/red]")
+        return
+    disponibilite = Prompt.ask("Disponibilité", choices=["tous", "disponibles", "empruntés"], default="tous")
+    if disponibilite != "tous":
+        criteres["disponible"] = disponibilite == "disponibles"
+    resultats = filtrer_livres(livres, expliquer=True, **criteres) # Combinaison des critères par les index
+    if resultats: # Afficher les résultats si trouvés
+        parcourir_livres(resultats)
+    else:
+        console.print("[yellow]Aucun livre ne correspond à ces critères.[/yellow]")
+
+
 def fonctionnalites_avancees():
     """Fonction pour gérer les fonctionnalités avancées de la bibliothèque numérique."""
     # Afficher le menu des fonctionnalités avancées
@@ -26,8 +111,11 @@ def fonctionnalites_avancees():
         "\n".join([
             "[bold]======= FONCTIONNALITÉS AVANCÉES ========[/bold]",
             "[cyan]1[/cyan]. Noter un livre (1 à 5 étoiles)",
-            "[cyan]2[/cyan]. Exporter la bibliothèque au format CSV",
-            "[cyan]3[/cyan]. Retour au menu principal"
+            "[cyan]2[/cyan]. Exporter la bibliothèque (CSV ou JSON Lines, .gz/.xz pour compresser)",
+            "[cyan]3[/cyan]. Importer des livres en masse (CSV ou JSON Lines)",
+            "[cyan]4[/cyan]. Diagnostics (durée des opérations, octets écrits)",
+            "[cyan]5[/cyan]. Recherche multicritère (genre, auteur, année, prix, disponibilité, note)",
+            "[cyan]6[/cyan]. Retour au menu principal"
         ]),
         title="Menu",
         subtitle="Entrez le numéro de l'option",
@@ -35,16 +123,38 @@ def fonctionnalites_avancees():
     )
     console.print(menu_panel)
     # Gérer le choix de l'utilisateur
-    choix = Prompt.ask("Choisissez une option", choices=["1", "2", "3"], default="3")
+    choix = Prompt.ask("Choisissez une option", choices=["1", "2", "3", "4", "5", "6"], default="6")
     if choix == '1': # Noter un livre
         try:
             id_livre = int(Prompt.ask("Entrez l'ID du livre à noter"))
             noter_livre(livres, id_livre)
         except ValueError:
             console.print("[red]Erreur : L'ID du livre et la note doivent être des entiers.[/red]")
-    elif choix == '2': # Exporter au format CSV
-        export_csv(livres)
-    elif choix == '3': # Retour au menu principal
+    elif choix == '2': # Exporter au format CSV ou JSON Lines
+        chemin = Prompt.ask("Fichier de destination", default="bibliotheque.csv").strip()
+        genre = Prompt.ask("Genre à exporter (vide pour tous les livres)", default="").strip()
+        export_csv(filtrer_par_genre(livres, genre) if genre else livres, chemin)
+    elif choix == '3': # Importer des livres en masse
+        chemin = Prompt.ask("Fichier à importer (.csv ou .jsonl)").strip()
+        try:
+            with console.status("Import en cours..."):
+                resume = importer_livres(livres, chemin)
+        except (OSError, ValueError) as erreur: # Fichier absent ou colonnes manquantes
+            console.print(f"[red]Erreur : Import impossible ({erreur}).[/red]")
+            return
+        # Résumé unique de l'import
+        console.print(Panel.fit("\n".join([
+            f"Lignes lues : [bold]{resume['lus']}[/bold]",
+            f"Livres importés : [bold green]{resume['importes']}[/bold green]",
+            f"Lignes rejetées : [bold red]{resume['rejetes']}[/bold red] (dont {resume['doublons']} doublon(s))",
+            f"Durée : [bold]{resume['duree']:.2f} s[/bold]",
+            f"Détail des rejets : {resume['fichier_rejets']}",
+        ]), title="Import en masse", style="green"))
+    elif choix == '4': # Diagnostics
+        afficher_diagnostics()
+    elif choix == '5': # Recherche multicritère
+        recherche_multicritere()
+    elif choix == '6': # Retour au menu principal
         return
     else: # Option invalide
         console.print("[red]Erreur : Option invalide, veuillez réessayer.[/red]")
@@ -52,9 +162,11 @@ def fonctionnalites_avancees():
 # Programme principal
 if __name__ == "__main__":
     # Affichage du titre
+    from rich.align import Align
     console.print(Panel(Align.center(f"[bold]Bibliothèque Numérique — Version {VERSION}[/bold]", vertical="middle"), title="Bienvenue", subtitle="Cédric MARIYA CONSTANTINE", style="cyan"))
     # Initialisation de la bibliothèque
-    livres = charger_bibliotheque()
+    livres = charger_bibliotheque(ignorer_corrompus=True) # Les livres corrompus sont ignorés sans perdre le reste
+    sauvegarde_differee = SauvegardeDifferee(livres, FICHIER_BIBLIOTHEQUE) # Points de contrôle en arrière-plan
 
     # Boucle principale du menu
     while True:
@@ -81,84 +193,92 @@ if __name__ == "__main__":
         
         # Gérer le choix de l'utilisateur
         choix = Prompt.ask("Choisissez une option", choices=[str(i) for i in range(1, 11)], default="2")
-        if choix == '1': # Ajouter un livre
-            console.print(Panel.fit("[bold]Ajout d'un nouveau livre[/bold]", style="green"))
-            titre = Prompt.ask("Titre") # Titre du livre
-            auteur = Prompt.ask("Auteur") # Auteur du livre
-            genre = Prompt.ask("Genre") # Genre du livre
-            # Validation de l'année et du prix
-            try:
-                annee = int(Prompt.ask("Année de publication"))
-            except ValueError:
-                console.print("[red]Erreur : L'année de publication doit être un entier.[/red]")
-                continue
-            try:
-                prix = float(Prompt.ask("Prix"))
-            except ValueError:
-                console.print("[red]Erreur : Le prix doit être un nombre.[/red]")
-                continue
-            ajouter_livre(livres, titre, auteur, genre, annee, prix) # Appel de la fonction pour ajouter le livre
-
-        elif choix == '2': # Afficher tous les livres
-            # Demander le critère de tri
-            critere_tri = Prompt.ask("Critère de tri", choices=["ID", "titre", "auteur", "prix"], default="ID")
-            afficher_tous_les_livres(livres, critere_tri) # Appel de la fonction pour afficher les livres
-
-        elif choix == '3': # Rechercher un livre
-            # Demander le critère et la valeur de recherche
-            critere = Prompt.ask("Critère de recherche", choices=["titre", "auteur", "genre"], default="titre")
-            valeur = Prompt.ask("Valeur à rechercher").strip()
-            resultats = rechercher_livre(livres, critere, valeur) # Appel de la fonction pour rechercher les livres
-            if resultats: # Afficher les résultats si trouvés
-                afficher_tous_les_livres(resultats)
-            else:
-                # Afficher un message si aucun livre n'est trouvé
-                console.print("[yellow]Aucun livre trouvé correspondant à la recherche.[/yellow]")
+        with chronometrer(f"menu_{choix}"), sauvegarde_differee.verrou: # Durée de l'option choisie (si les mesures sont activées), sans sauvegarde pendant les modifications
+            if choix == '1': # Ajouter un livre
+                console.print(Panel.fit("[bold]Ajout d'un nouveau livre[/bold]", style="green"))
+                titre = Prompt.ask("Titre") # Titre du livre
+                auteur = Prompt.ask("Auteur") # Auteur du livre
+                genre = Prompt.ask("Genre") # Genre du livre
+                # Validation de l'année et du prix
+                try:
+                    annee = int(Prompt.ask("Année de publication"))
+                except ValueError:
+                    console.print("[red]Erreur : L'année de publication doit être un entier.[/red]")
+                    continue
+                try:
+                    prix = float(Prompt.ask("Prix"))
+                except ValueError:
+                    console.print("[red]Erreur : Le prix doit être un nombre.[/red]")
+                    continue
+                ajouter_livre(livres, titre, auteur, genre, annee, prix) # Appel de la fonction pour ajouter le livre
+
+            elif choix == '2': # Afficher tous les livres
+                # Demander le critère de tri
+                critere_tri = Prompt.ask("Critère de tri", choices=["ID", "titre", "auteur", "prix"], default="ID")
+                parcourir_livres(livres, critere_tri) # Appel de la fonction pour afficher les livres page par page
+
+            elif choix == '3': # Rechercher un livre
+                # Demander le critère et la valeur de recherche
+                critere = Prompt.ask("Critère de recherche (approchée : titre, auteur et genre, fautes de frappe tolérées)", choices=["titre", "auteur", "genre", "approchée"], default="titre")
+                valeur = Prompt.ask("Valeur à rechercher").strip()
+                if critere == "approchée": # Meilleurs résultats classés par pertinence
+                    resultats = rechercher_approchee(livres, valeur)
+                else:
+                    resultats = rechercher_livre(livres, critere, valeur) # Appel de la fonction pour rechercher les livres
+                if resultats: # Afficher les résultats si trouvés
+                    parcourir_livres(resultats, "pertinence" if critere == "approchée" else "ID")
+                else:
+                    # Afficher un message si aucun livre n'est trouvé
+                    console.print("[yellow]Aucun livre trouvé correspondant à la recherche.[/yellow]")
                 
-        elif choix == '4': # Emprunter un livre
-            try:
-                id_livre = int(Prompt.ask("Entrez l'ID du livre à emprunter")) # ID du livre à emprunter
-            except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
-                console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
-                continue
-            emprunter_livre(livres, id_livre) # Appel de la fonction pour emprunter le livre
+            elif choix == '4': # Emprunter un livre
+                try:
+                    id_livre = int(Prompt.ask("Entrez l'ID du livre à emprunter")) # ID du livre à emprunter
+                except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
+                    console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
+                    continue
+                emprunter_livre(livres, id_livre) # Appel de la fonction pour emprunter le livre
 
-        elif choix == '5': # Retourner un livre
-            try:
-                id_livre = int(Prompt.ask("Entrez l'ID du livre à retourner")) # ID du livre à retourner
-            except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
-                console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
-                continue
-            retourner_livre(livres, id_livre) # Appel de la fonction pour retourner le livre
+            elif choix == '5': # Retourner un livre
+                try:
+                    id_livre = int(Prompt.ask("Entrez l'ID du livre à retourner")) # ID du livre à retourner
+                except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
+                    console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
+                    continue
+                retourner_livre(livres, id_livre) # Appel de la fonction pour retourner le livre
             
-        elif choix == '6': # Filtrer par genre
-            genre = Prompt.ask("Entrez le genre à filtrer").strip() # Genre à filtrer
-            livres_genre = filtrer_par_genre(livres, genre) # Appel de la fonction pour filtrer par genre
-            if livres_genre: # Afficher les livres si trouvés
-                afficher_tous_les_livres(livres_genre)
-            else: # Afficher un message si aucun livre n'est trouvé
-                console.print(f"[yellow]Aucun livre trouvé dans le genre '{genre}'.[/yellow]")
-
-        elif choix == '7': # Générer un rapport
-            generer_rapport(livres) # Appel de la fonction pour générer le rapport
-
-        elif choix == '8': # Supprimer un livre
-            try:
-                id_livre = int(Prompt.ask("Entrez l'ID du livre à supprimer")) # ID du livre à supprimer
-            except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
-                console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
-                continue
-            supprimer_livre(livres, id_livre) # Appel de la fonction pour supprimer le livre
+            elif choix == '6': # Filtrer par genre
+                genre = Prompt.ask("Entrez le genre à filtrer").strip() # Genre à filtrer
+                livres_genre = filtrer_par_genre(livres, genre) # Appel de la fonction pour filtrer par genre
+                if livres_genre: # Afficher les livres si trouvés
+                    parcourir_livres(livres_genre)
+                else: # Afficher un message si aucun livre n'est trouvé
+                    console.print(f"[yellow]Aucun livre trouvé dans le genre '{genre}'.[/yellow]")
 
-        elif choix == '9': # Fonctionnalités avancées
-            fonctionnalites_avancees() # Appel de la fonction pour les fonctionnalités avancées
+            elif choix == '7': # Générer un rapport
+                generer_rapport(livres) # Appel de la fonction pour générer le rapport
 
-        elif choix == '10': # Quitter
-            console.print("Quitter le programme. Au revoir!") # Message de sortie
-            break
+            elif choix == '8': # Supprimer un livre
+                try:
+                    id_livre = int(Prompt.ask("Entrez l'ID du livre à supprimer")) # ID du livre à supprimer
+                except ValueError: # Gestion d'erreur si l'ID n'est pas un entier
+                    console.print("[red]Erreur : L'ID du livre doit être un entier.[/red]")
+                    continue
+                supprimer_livre(livres, id_livre) # Appel de la fonction pour supprimer le livre
 
-        else: # Option invalide
-            console.print("[red]Erreur : Option invalide, veuillez réessayer.[/red]")
-        
-        sauvegarder_bibliotheque(livres) # Sauvegarder la bibliothèque après chaque opération
-    sauvegarder_bibliotheque(livres) # Sauvegarder la bibliothèque à la fin du programme
\ No newline at end of file
+            elif choix == '9': # Fonctionnalités avancées
+                fonctionnalites_avancees() # Appel de la fonction pour les fonctionnalités avancées
+
+            elif choix == '10': # Quitter
+                console.print("Quitter le programme. Au revoir!") # Message de sortie
+                break
+
+            else: # Option invalide
+                console.print("[red]Erreur : Option invalide, veuillez réessayer.[/red]")
+
+        sauvegarde_differee.demander() # Point de contrôle en arrière-plan, regroupé avec les modifications suivantes
+        definir_jauge("taille_catalogue", len(livres))
+        ecrire_metriques() # Sans effet si les mesures sont désactivées
+    sauvegarde_differee.arreter() # Fin de la sauvegarde en cours
+    sauvegarder_bibliotheque(livres, forcer=True) # Compaction du journal dans l'instantané à la fin du programme
+    ecrire_metriques()
\ No newline at end of file
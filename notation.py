@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Notation
+Description : Notes des livres stockées sous forme de répartition (nombre de notes par
+              étoile) avec moyenne en cache, migration de l'ancien format (liste de
+              notes) et historique détaillé facultatif.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import datetime
+import json
+import os
+
+# Définition des constantes
+NOMBRE_ETOILES = 5
+
+
+# Définition des fonctions
+def repartition_vide():
+    """Fonction pour créer une répartition de notes vide.
+
+    Returns:
+        list: Nombre de notes pour 1, 2, 3, 4 et 5 étoiles.
+    """
+    return [0] * NOMBRE_ETOILES
+
+
+def calculer_moyenne(repartition):
+    """Fonction pour calculer la moyenne d'une répartition de notes.
+
+    Args:
+        repartition (list): Nombre de notes par étoile.
+    Returns:
+        float: Note moyenne, ou None si aucune note.
+    """
+    nombre = sum(repartition)
+    if not nombre:
+        return None
+    return sum(etoiles * compte for etoiles, compte in enumerate(repartition, start=1)) / nombre
+
+
+def migrer_notes(livre):
+    """Fonction pour convertir la liste de notes d'un livre (ancien format) en répartition.
+
+    Un livre déjà au nouveau format est laissé tel quel. Les notes qui ne sont pas des
+    entiers de 1 à `NOMBRE_ETOILES` sont ignorées.
+
+    Args:
+        livre (dict): Livre à migrer, modifié sur place.
+    Returns:
+        list: Notes valides de l'ancien format retirées du livre (liste vide si rien à migrer).
+    """
+    anciennes_notes = [note for note in livre.pop("notes", None) or [] if type(note) is int and 1 <= note <= NOMBRE_ETOILES]
+    if "repartition_notes" not in livre:
+        repartition = repartition_vide()
+        for note in anciennes_notes:
+            repartition[note - 1] += 1
+        livre["repartition_notes"] = repartition
+        livre["note_moyenne"] = calculer_moyenne(repartition)
+    return anciennes_notes
+
+
+def ajouter_note(livre, note):
+    """Fonction pour ajouter une note à la répartition d'un livre et mettre à jour la moyenne.
+
+    Args:
+        livre (dict): Livre noté.
+        note (int): Note de 1 à 5.
+    """
+    repartition = livre.get("repartition_notes")
+    if repartition is None: # Livre encore à l'ancien format
+        migrer_notes(livre)
+        repartition = livre["repartition_notes"]
+    repartition[note - 1] += 1
+    livre["note_moyenne"] = calculer_moyenne(repartition)
+
+
+def note_moyenne(livre):
+    """Fonction pour obtenir la note moyenne d'un livre, sans parcourir ses notes.
+
+    Args:
+        livre (dict): Livre (nouveau format, ou ancien format avec une liste `notes`).
+    Returns:
+        float: Note moyenne, ou None si le livre n'a pas de note.
+    """
+    if "repartition_notes" in livre:
+        return livre.get("note_moyenne")
+    notes = livre.get("notes")
+    return sum(notes) / len(notes) if notes else None
+
+
+def nombre_notes(livre):
+    """Fonction pour obtenir le nombre de notes d'un livre.
+
+    Args:
+        livre (dict): Livre.
+    Returns:
+        int: Nombre de notes reçues.
+    """
+    if "repartition_notes" in livre:
+        return sum(livre["repartition_notes"])
+    return len(livre.get("notes") or [])
+
+
+# Définition des classes
+class HistoriqueNotes:
+    """Classe représentant l'historique détaillé des notes, stocké à part du catalogue.
+
+    Chaque note est ajoutée sur une ligne JSON (ID, note, date) : le catalogue ne garde
+    que la répartition, et l'historique complet reste disponible pour des analyses.
+    """
+
+    def __init__(self, chemin):
+        """Constructeur de l'historique.
+
+        Args:
+            chemin (str): Chemin du fichier d'historique (JSON Lines).
+        """
+        self.chemin = chemin
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "note":
+            self.enregistrer([(livre["id"], details["note"])], datetime.datetime.now().isoformat(timespec="seconds"))
+
+    def enregistrer(self, notes, date=None):
+        """Méthode pour ajouter des notes à l'historique.
+
+        Args:
+            notes (iterable): Couples (ID du livre, note).
+            date (str): Date ISO des notes, ou None si elle est inconnue (notes migrées).
+        """
+        lignes = [json.dumps({"id": id_livre, "note": note, "date": date}) + "\n" for id_livre, note in notes]
+        if lignes:
+            with open(self.chemin, "a", encoding="utf-8") as f:
+                f.writelines(lignes)
+
+    def lire(self, id_livre=None):
+        """Méthode pour relire l'historique, éventuellement pour un seul livre.
+
+        Args:
+            id_livre (int): ID du livre, ou None pour tous les livres.
+        Returns:
+            list: Entrées de l'historique (dictionnaires `id`, `note`, `date`).
+        """
+        if not os.path.exists(self.chemin):
+            return []
+        with open(self.chemin, "r", encoding="utf-8") as f:
+            entrees = (json.loads(ligne) for ligne in f if ligne.strip())
+            return [entree for entree in entrees if id_livre is None or entree["id"] == id_livre]
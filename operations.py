@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Opérations
+Description : Opérations de la bibliothèque sans interaction (ni confirmation ni affichage),
+              décrites par un dictionnaire et appliquées de façon atomique au catalogue. Elles
+              sont utilisées par le service multi-postes et par le traitement par lot.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import math
+import re
+import sqlite3
+from livre import Livre, valider_livre
+
+# Définition des constantes
+ENTIER = re.compile(r"-?\d+") # Entier écrit en toutes lettres dans une cellule CSV
+
+
+# Définition des fonctions
+def changer_disponibilite(livres, id_livre, disponible):
+    """Fonction pour emprunter (False) ou retourner (True) un livre par comparer-et-échanger.
+
+    La disponibilité n'est changée que si le livre est dans l'état inverse, sans attente
+    entre la vérification et la modification : deux demandes simultanées pour le même
+    livre ne peuvent pas réussir toutes les deux. Avec le stockage SQLite, la comparaison
+    est faite dans la base, partagée entre les postes, et le catalogue est remis à jour
+    s'il était en retard.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        id_livre (int): ID du livre.
+        disponible (bool): Nouvelle disponibilité.
+    Returns:
+        bool: True si la disponibilité a changé.
+    Raises:
+        sqlite3.Error: Si la base refuse la mise à jour (le catalogue n'est alors pas modifié).
+    """
+    stockage = getattr(livres, "stockage", None)
+    if stockage is not None:
+        change = stockage.changer_disponibilite(id_livre, disponible)
+        with stockage.deja_ecrit(): # La base est déjà dans cet état
+            livres.definir_disponibilite(id_livre, disponible)
+        return change
+    if livres.get(id_livre)["disponible"] == disponible:
+        return False
+    livres.definir_disponibilite(id_livre, disponible)
+    return True
+
+
+def retirer_livre(livres, id_livre):
+    """Fonction pour supprimer un livre du catalogue par son ID.
+
+    Avec le stockage SQLite, le livre est supprimé de la base avant de l'être du
+    catalogue : si la suppression échoue, le catalogue n'est pas modifié.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        id_livre (int): ID du livre.
+    Returns:
+        Livre: Le livre supprimé, ou None si l'ID est inconnu.
+    Raises:
+        sqlite3.Error: Si la base refuse la suppression.
+    """
+    stockage = getattr(livres, "stockage", None)
+    if stockage is None:
+        return livres.supprimer(id_livre)
+    stockage.supprimer(id_livre)
+    with stockage.deja_ecrit():
+        return livres.supprimer(id_livre)
+
+
+def attribuer_note(livres, id_livre, note):
+    """Fonction pour ajouter une note (1 à 5) à un livre du catalogue par son ID.
+
+    Avec le stockage SQLite, la note est ajoutée dans la base avant de l'être au
+    catalogue : si la mise à jour échoue, le catalogue n'est pas modifié.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        id_livre (int): ID du livre.
+        note (int): Note à ajouter.
+    Returns:
+        Livre: Le livre modifié, ou None si l'ID est inconnu.
+    Raises:
+        sqlite3.Error: Si la base refuse la mise à jour.
+    """
+    stockage = getattr(livres, "stockage", None)
+    if stockage is None:
+        return livres.ajouter_note(id_livre, note)
+    stockage.noter(id_livre, note)
+    with stockage.deja_ecrit():
+        return livres.ajouter_note(id_livre, note)
+
+
+def creer_livre(livres, titre, auteur, genre, annee, prix):
+    """Fonction pour ajouter un nouveau livre au catalogue avec un ID jamais attribué.
+
+    Avec le stockage SQLite, l'ID est attribué par la base, partagée entre les postes, et
+    le livre y est inséré avant d'entrer dans le catalogue : si l'insertion échoue, le
+    catalogue n'est pas modifié.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        titre (str): Titre du livre.
+        auteur (str): Auteur du livre.
+        genre (str): Genre du livre.
+        annee (int): Année de publication.
+        prix (float): Prix du livre.
+    Returns:
+        Livre: Livre ajouté (disponible, sans note).
+    Raises:
+        sqlite3.Error: Si la base refuse l'insertion.
+    """
+    stockage = getattr(livres, "stockage", None)
+    if stockage is not None:
+        livre = stockage.inserer(lambda id_livre: Livre(id_livre, titre, auteur, genre, annee, prix))
+        livres.avancer_ids(livre["id"])
+    else:
+        livre = Livre(livres.prochain_id(), titre, auteur, genre, annee, prix)
+    livres.append(livre)
+    return livre
+
+
+def _entier(valeur, nom):
+    """Fonction pour lire un paramètre entier, sans conversion implicite.
+
+    Seuls un entier JSON ou une chaîne de chiffres (cellule CSV) sont acceptés : un
+    booléen ou un nombre à virgule est refusé plutôt qu'arrondi.
+
+    Args:
+        valeur: Valeur reçue (None ou "" : paramètre absent, renvoyé tel quel).
+        nom (str): Nom du paramètre, pour le message d'erreur.
+    Returns:
+        int: Valeur entière.
+    Raises:
+        ValueError: Si la valeur n'est pas un entier.
+    """
+    if valeur is None or valeur == "":
+        return valeur
+    if isinstance(valeur, str) and ENTIER.fullmatch(valeur.strip()):
+        return int(valeur)
+    if isinstance(valeur, bool) or not isinstance(valeur, int):
+        raise ValueError(f"'{nom}' doit être un entier, pas {valeur!r}.")
+    return valeur
+
+
+def _nombre(valeur, nom):
+    """Fonction pour lire un paramètre numérique (prix), sans conversion implicite.
+
+    Args:
+        valeur: Valeur reçue : nombre JSON ou chaîne (cellule CSV), None ou "" si absente.
+        nom (str): Nom du paramètre, pour le message d'erreur.
+    Returns:
+        float: Valeur numérique.
+    Raises:
+        ValueError: Si la valeur n'est pas un nombre fini (un booléen n'en est pas un).
+    """
+    if valeur is None or valeur == "":
+        return valeur
+    if isinstance(valeur, str):
+        valeur = float(valeur)
+    elif isinstance(valeur, bool) or not isinstance(valeur, (int, float)):
+        raise ValueError(f"'{nom}' doit être un nombre, pas {valeur!r}.")
+    if not math.isfinite(valeur):
+        raise ValueError(f"'{nom}' doit être un nombre fini.")
+    return float(valeur)
+
+
+def _echec(erreur):
+    return {"ok": False, "erreur": erreur}
+
+
+def _livre_existant(livres, operation):
+    """Fonction pour lire l'ID de l'opération et vérifier que le livre existe.
+
+    Returns:
+        tuple: (ID, livre), le livre valant None s'il n'existe pas.
+    """
+    id_livre = _entier(operation["id"], "id")
+    if id_livre in (None, ""):
+        raise KeyError("id")
+    return id_livre, livres.get(id_livre)
+
+
+def _ajouter(livres, operation):
+    titre, auteur, genre = operation.get("titre"), operation.get("auteur"), operation.get("genre")
+    annee, prix = operation.get("année_publication"), operation.get("prix")
+    annee = _entier(annee, "année_publication")
+    prix = _nombre(prix, "prix")
+    erreur = valider_livre(titre, auteur, genre, annee, prix)
+    if erreur:
+        return _echec(erreur)
+    try:
+        livre = creer_livre(livres, titre, auteur, genre, annee, prix)
+    except sqlite3.Error as erreur_base:
+        return _echec(f"Ajout refusé par la base : {erreur_base}")
+    return {"ok": True, "id": livre["id"]}
+
+
+def _supprimer(livres, operation):
+    id_livre, livre = _livre_existant(livres, operation)
+    if livre is None:
+        return _echec(f"Livre avec ID {id_livre} non trouvé.")
+    try:
+        retirer_livre(livres, id_livre)
+    except sqlite3.Error as erreur_base:
+        return _echec(f"Suppression refusée par la base : {erreur_base}")
+    return {"ok": True, "id": id_livre}
+
+
+def _emprunter(livres, operation):
+    id_livre, livre = _livre_existant(livres, operation)
+    if livre is None:
+        return _echec(f"Livre avec ID {id_livre} non trouvé.")
+    try:
+        change = changer_disponibilite(livres, id_livre, False)
+    except sqlite3.Error as erreur_base:
+        return _echec(f"Emprunt refusé par la base : {erreur_base}")
+    if not change:
+        return _echec(f"Le livre '{livre['titre']}' (ID {id_livre}) n'est pas disponible pour l'emprunt.")
+    return {"ok": True, "id": id_livre}
+
+
+def _retourner(livres, operation):
+    id_livre, livre = _livre_existant(livres, operation)
+    if livre is None:
+        return _echec(f"Livre avec ID {id_livre} non trouvé.")
+    note = operation.get("note")
+    note = _entier(note, "note")
+    note = None if note == "" else note # Note facultative donnée au retour
+    if note is not None and not 1 <= note <= 5:
+        return _echec("La note doit être entre 1 et 5.")
+    try:
+        change = changer_disponibilite(livres, id_livre, True)
+    except sqlite3.Error as erreur_base:
+        return _echec(f"Retour refusé par la base : {erreur_base}")
+    if not change:
+        return _echec(f"Le livre '{livre['titre']}' (ID {id_livre}) n'était pas emprunté.")
+    if note is not None:
+        try:
+            attribuer_note(livres, id_livre, note)
+        except sqlite3.Error as erreur_base: # Retour déjà validé
+            return _echec(f"Livre retourné, mais note refusée par la base : {erreur_base}")
+    return {"ok": True, "id": id_livre}
+
+
+def _noter(livres, operation):
+    id_livre, livre = _livre_existant(livres, operation)
+    note = _entier(operation["note"], "note")
+    if note in (None, ""):
+        raise KeyError("note")
+    if not 1 <= note <= 5:
+        return _echec("La note doit être entre 1 et 5.")
+    if livre is None:
+        return _echec(f"Livre avec ID {id_livre} non trouvé.")
+    try:
+        attribuer_note(livres, id_livre, note)
+    except sqlite3.Error as erreur_base:
+        return _echec(f"Note refusée par la base : {erreur_base}")
+    return {"ok": True, "id": id_livre, "note_moyenne": livre["note_moyenne"]}
+
+
+def _consulter(livres, operation):
+    id_livre, livre = _livre_existant(livres, operation)
+    if livre is None:
+        return _echec(f"Livre avec ID {id_livre} non trouvé.")
+    return {"ok": True, "livre": livre.en_dict() if isinstance(livre, Livre) else dict(livre)}
+
+
+# Table des opérations disponibles
+OPERATIONS = {
+    "ajouter": _ajouter,
+    "supprimer": _supprimer,
+    "emprunter": _emprunter,
+    "retourner": _retourner,
+    "noter": _noter,
+    "consulter": _consulter,
+}
+MODIFICATIONS = frozenset(("ajouter", "supprimer", "emprunter", "retourner", "noter")) # Opérations qui modifient le catalogue
+
+
+def est_modification(operation):
+    """Fonction pour savoir si une opération reçue modifie le catalogue.
+
+    Args:
+        operation: Opération décodée, éventuellement mal formée.
+    Returns:
+        bool: True pour un ajout, une suppression, un emprunt, un retour ou une note.
+    """
+    return isinstance(operation, dict) and isinstance(operation.get("op"), str) and operation["op"] in MODIFICATIONS
+
+
+def appliquer_operation(livres, operation):
+    """Fonction pour appliquer une opération au catalogue, sans confirmation ni affichage.
+
+    L'opération est un dictionnaire dont la clé "op" donne le nom ("ajouter", "supprimer",
+    "emprunter", "retourner", "noter" ou "consulter"), accompagné de ses paramètres :
+    "id", "note" (facultative au retour), ou "titre", "auteur", "genre",
+    "année_publication" et "prix" pour un ajout. Les valeurs peuvent être des chaînes
+    (lignes CSV). L'opération est appliquée d'un seul tenant, sans point d'attente :
+    exécutée dans une boucle asyncio, elle est atomique vis-à-vis des autres clients.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        operation (dict): Opération à appliquer.
+    Returns:
+        dict: Résultat, avec "ok" à True (et l'"id" du livre concerné) ou à False et un
+            message d'"erreur".
+    """
+    nom = operation.get("op") if isinstance(operation, dict) else None
+    traitement = OPERATIONS.get(nom) if isinstance(nom, str) else None # Une liste, par exemple, n'est pas une clé valide
+    if traitement is None:
+        return _echec(f"Opération inconnue : {nom if isinstance(operation, dict) else operation!r}")
+    try:
+        return traitement(livres, operation)
+    except (KeyError, TypeError, ValueError) as erreur: # Paramètre manquant ou mal formé
+        return _echec(f"Paramètres invalides pour '{operation['op']}' : {erreur!r}")
+    except OSError as erreur: # Catalogue modifié, mais journal non écrit
+        return _echec(f"Modification appliquée mais non journalisée : {erreur}")
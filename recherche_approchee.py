@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Recherche approchée
+Description : Index de trigrammes sans accents sur le titre, l'auteur et le genre, pour une
+              recherche tolérante aux fautes de frappe dont seuls les meilleurs résultats sont
+              classés par pertinence.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import functools
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from index_texte import CHAMPS_INDEXES, TAILLE_NGRAMME
+
+# Définition des constantes
+NOMBRE_RESULTATS = 20 # Nombre de résultats classés renvoyés par défaut
+SEUIL_MOT = 0.45 # Similarité minimale (coefficient de Dice sur les trigrammes) entre deux mots
+SEUIL_SIMILARITE = 0.5 # Similarité moyenne minimale des mots de la recherche pour retenir un livre
+PENALITE_RESTE = 0.05 # Poids des mots du livre absents de la recherche (préférence aux textes courts)
+MOTS = re.compile(r"\w+")
+
+
+# Définition des fonctions
+def normaliser(texte):
+    """Fonction pour normaliser un texte : minuscules et accents retirés ("Élève" → "eleve").
+
+    Args:
+        texte (str): Texte à normaliser.
+    Returns:
+        str: Texte normalisé.
+    """
+    decompose = unicodedata.normalize("NFKD", str(texte).casefold())
+    return "".join(caractere for caractere in decompose if not unicodedata.combining(caractere))
+
+
+@functools.lru_cache(maxsize=1 << 16) # Auteurs et genres reviennent d'un livre à l'autre
+def mots(texte):
+    """Fonction pour découper un texte en mots normalisés.
+
+    Args:
+        texte (str): Texte tel que saisi.
+    Returns:
+        frozenset: Mots distincts du texte, normalisés.
+    """
+    return frozenset(MOTS.findall(normaliser(texte)))
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def trigrammes_mot(mot):
+    """Fonction pour extraire les trigrammes d'un mot normalisé, bordé d'espaces ("  mot ").
+
+    Le début et la fin du mot comptent, et une faute de frappe ne fait perdre que les
+    trigrammes qui la contiennent.
+
+    Args:
+        mot (str): Mot normalisé.
+    Returns:
+        frozenset: Trigrammes du mot.
+    """
+    mot = f"  {mot} "
+    return frozenset(mot[i:i + TAILLE_NGRAMME] for i in range(len(mot) - TAILLE_NGRAMME + 1))
+
+
+def mots_livre(livre):
+    """Fonction pour obtenir les mots du titre, de l'auteur et du genre d'un livre."""
+    return frozenset().union(*(mots(str(livre.get(champ, ""))) for champ in CHAMPS_INDEXES))
+
+
+# Définition des classes
+class IndexApproche:
+    """Classe représentant l'index de la recherche approchée.
+
+    L'index conserve, pour chaque mot du vocabulaire (titres, auteurs et genres), les IDs
+    des livres qui le contiennent, et pour chaque trigramme les mots qui le contiennent.
+    Chaque mot de la recherche est rapproché des mots du vocabulaire par leurs trigrammes
+    communs, puis chaque livre reçoit la moyenne des meilleures similarités de ses mots :
+    seul le vocabulaire, bien plus petit que le catalogue, est comparé à la recherche.
+    L'index est abonné au catalogue et mis à jour à chaque ajout ou suppression.
+    """
+
+    def __init__(self, livres=()):
+        """Constructeur de l'index.
+
+        Args:
+            livres (iterable): Livres à indexer.
+        """
+        self._ids = {} # mot → {IDs des livres}
+        self._mots = {} # trigramme → {mots du vocabulaire}
+        self._longueurs = {} # ID → nombre de mots du livre
+        for livre in livres:
+            self.indexer(livre)
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "ajout":
+            self.indexer(livre)
+        elif operation == "suppression":
+            self.retirer(livre)
+
+    def indexer(self, livre):
+        """Méthode pour ajouter un livre à l'index.
+
+        Args:
+            livre (Livre): Livre à indexer.
+        """
+        id_livre = livre["id"]
+        vocabulaire = mots_livre(livre)
+        self._longueurs[id_livre] = len(vocabulaire)
+        for mot in vocabulaire:
+            ids = self._ids.get(mot)
+            if ids is None: # Nouveau mot du vocabulaire
+                ids = self._ids[mot] = set()
+                for trigramme in trigrammes_mot(mot):
+                    self._mots.setdefault(trigramme, set()).add(mot)
+            ids.add(id_livre)
+
+    def retirer(self, livre):
+        """Méthode pour retirer un livre de l'index.
+
+        Args:
+            livre (Livre): Livre à retirer.
+        """
+        id_livre = livre["id"]
+        if self._longueurs.pop(id_livre, None) is None:
+            return
+        for mot in mots_livre(livre):
+            ids = self._ids.get(mot)
+            if ids is None:
+                continue
+            ids.discard(id_livre)
+            if not ids: # Mot disparu du catalogue
+                del self._ids[mot]
+                for trigramme in trigrammes_mot(mot):
+                    self._mots[trigramme].discard(mot)
+                    if not self._mots[trigramme]:
+                        del self._mots[trigramme]
+
+    def mots_proches(self, mot):
+        """Méthode pour trouver les mots du vocabulaire proches d'un mot.
+
+        Args:
+            mot (str): Mot normalisé.
+        Returns:
+            list: Couples (mot du vocabulaire, similarité), du plus proche au moins proche.
+        """
+        cibles = trigrammes_mot(mot)
+        # Dice ≥ SEUIL_MOT impose un nombre minimal de trigrammes communs : le mot proche figure dans l'une des listes les plus courtes
+        minimum = max(1, math.ceil(SEUIL_MOT * len(cibles) / (2 - SEUIL_MOT)))
+        listes = sorted((self._mots.get(trigramme, ()) for trigramme in cibles), key=len)
+        coupure = len(listes) - minimum + 1
+        compteur = Counter()
+        for voisins in listes[:coupure]:
+            compteur.update(voisins)
+        for voisins in listes[coupure:]: # Listes longues : seuls les candidats déjà trouvés sont comptés
+            if compteur:
+                compteur.update(compteur.keys() & voisins)
+        proches = []
+        for voisin, communs in compteur.items():
+            if communs >= minimum:
+                similarite = 2 * communs / (len(cibles) + len(trigrammes_mot(voisin)))
+                if similarite >= SEUIL_MOT:
+                    proches.append((voisin, similarite))
+        return sorted(proches, key=lambda proche: proche[1], reverse=True)
+
+    def rechercher(self, requete, nombre=NOMBRE_RESULTATS):
+        """Méthode pour trouver les livres les plus proches d'une recherche.
+
+        Args:
+            requete (str): Texte recherché, tel que saisi.
+            nombre (int): Nombre maximal de résultats.
+        Returns:
+            list: Couples (ID, score entre 0 et 1), du plus pertinent au moins pertinent.
+        """
+        mots_requete = mots(requete)
+        if not mots_requete or nombre <= 0:
+            return []
+        sommes = Counter() # ID → somme des meilleures similarités de chaque mot de la recherche
+        for mot in mots_requete:
+            meilleures = {} # ID → meilleure similarité pour ce mot
+            for voisin, similarite in self.mots_proches(mot): # Du plus proche au moins proche : la première similarité est la meilleure
+                nouveaux = self._ids[voisin] - meilleures.keys()
+                meilleures.update(dict.fromkeys(nouveaux, similarite))
+            sommes.update(meilleures)
+        # Classement des seuls meilleurs livres par un tas borné
+        total, longueurs, minimum = len(mots_requete), self._longueurs, SEUIL_SIMILARITE * len(mots_requete)
+        candidats = ((somme / (total + PENALITE_RESTE * max(longueurs[id_livre] - total, 0)), -id_livre) for id_livre, somme in sommes.items() if somme >= minimum)
+        return [(-id_negatif, score) for score, id_negatif in heapq.nlargest(nombre, candidats)]
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Requêtes multicritères
+Description : Index secondaires du catalogue (par hachage sur le genre et la disponibilité,
+              triés sur l'année et le prix) et planificateur qui combine les critères d'une
+              recherche en partant de l'index le plus sélectif.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+from bisect import bisect_left, bisect_right
+from notation import note_moyenne
+
+# Définition des constantes
+CRITERES = ("genre", "auteur", "annee_min", "annee_max", "prix_min", "prix_max", "disponible", "note_min")
+
+
+# Définition des classes
+class IndexTrie:
+    """Classe représentant un index trié sur un champ numérique, pour les recherches par intervalle.
+
+    Les valeurs triées et les IDs correspondants sont conservés dans deux listes
+    parallèles : les bornes d'un intervalle sont trouvées par dichotomie (`bisect`).
+    """
+
+    def __init__(self, champ, livres=()):
+        """Constructeur de l'index, trié en une seule fois.
+
+        Args:
+            champ (str): Champ indexé ("année_publication", "prix").
+            livres (iterable): Livres à indexer.
+        """
+        self.champ = champ
+        paires = sorted((livre[champ], livre["id"]) for livre in livres)
+        self.cles = [cle for cle, _ in paires] # Valeurs du champ, triées
+        self.ids = [id_livre for _, id_livre in paires] # IDs dans le même ordre
+
+    def __len__(self):
+        return len(self.ids)
+
+    def ajouter(self, livre):
+        """Méthode pour insérer un livre à sa place dans l'index."""
+        position = bisect_right(self.cles, livre[self.champ])
+        self.cles.insert(position, livre[self.champ])
+        self.ids.insert(position, livre["id"])
+
+    def retirer(self, livre):
+        """Méthode pour retirer un livre de l'index, parmi ceux de même valeur."""
+        cle = livre[self.champ]
+        try:
+            position = self.ids.index(livre["id"], bisect_left(self.cles, cle), bisect_right(self.cles, cle))
+        except ValueError: # Livre absent de l'index
+            return
+        del self.cles[position]
+        del self.ids[position]
+
+    def intervalle(self, minimum=None, maximum=None):
+        """Méthode pour trouver les positions des livres dont la valeur est dans un intervalle.
+
+        Args:
+            minimum (float): Borne inférieure incluse (None : pas de borne).
+            maximum (float): Borne supérieure incluse (None : pas de borne).
+        Returns:
+            tuple: Positions (début, fin) dans `ids`, fin exclue.
+        """
+        debut = 0 if minimum is None else bisect_left(self.cles, minimum)
+        fin = len(self.cles) if maximum is None else bisect_right(self.cles, maximum)
+        return debut, max(debut, fin)
+
+
+class IndexRequetes:
+    """Classe représentant les index secondaires des requêtes multicritères.
+
+    Le genre et la disponibilité sont indexés par hachage (valeur → ensemble d'IDs),
+    l'année de publication et le prix par des index triés. Pour une requête, le nombre
+    de livres de chaque index utilisable est connu sans parcourir le catalogue (taille
+    d'un ensemble, ou écart entre deux positions trouvées par dichotomie) : le plus
+    sélectif fournit les candidats, les autres index par hachage sont intersectés, puis
+    les critères restants (intervalles, auteur, note) sont vérifiés sur ces seuls candidats.
+    L'index est abonné au catalogue et mis à jour à chaque modification.
+    """
+
+    def __init__(self, livres=()):
+        """Constructeur des index.
+
+        Args:
+            livres (Catalogue | list): Livres à indexer.
+        """
+        self._genres = {} # Genre normalisé (casefold) → {IDs}
+        self._disponibilites = {True: set(), False: set()} # Disponibilité → {IDs}
+        for livre in livres:
+            self._indexer_hachage(livre)
+        self._annees = IndexTrie("année_publication", livres)
+        self._prix = IndexTrie("prix", livres)
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "ajout":
+            self._indexer_hachage(livre)
+            self._annees.ajouter(livre)
+            self._prix.ajouter(livre)
+        elif operation == "suppression":
+            self._genres.get(livre["genre"].casefold(), set()).discard(livre["id"])
+            self._disponibilites[bool(livre["disponible"])].discard(livre["id"])
+            self._annees.retirer(livre)
+            self._prix.retirer(livre)
+        elif operation in ("emprunt", "retour"):
+            disponible = operation == "retour"
+            self._disponibilites[not disponible].discard(livre["id"])
+            self._disponibilites[disponible].add(livre["id"])
+
+    def _indexer_hachage(self, livre):
+        self._genres.setdefault(livre["genre"].casefold(), set()).add(livre["id"])
+        self._disponibilites[bool(livre["disponible"])].add(livre["id"])
+
+    def _acces(self, criteres, index_texte):
+        """Méthode pour lister les index utilisables par une requête.
+
+        Returns:
+            list: Accès (estimation du nombre de livres, nom, ensemble ou fonction qui fournit les IDs).
+        """
+        acces = []
+        if criteres.get("genre") is not None:
+            ids = self._genres.get(criteres["genre"].strip().casefold(), set())
+            acces.append((len(ids), "genre", ids))
+        if criteres.get("disponible") is not None:
+            ids = self._disponibilites[bool(criteres["disponible"])]
+            acces.append((len(ids), "disponibilité", ids))
+        for nom, index, minimum, maximum in (("année", self._annees, "annee_min", "annee_max"), ("prix", self._prix, "prix_min", "prix_max")):
+            if criteres.get(minimum) is not None or criteres.get(maximum) is not None:
+                debut, fin = index.intervalle(criteres.get(minimum), criteres.get(maximum))
+                acces.append((fin - debut, nom, lambda index=index, debut=debut, fin=fin: index.ids[debut:fin]))
+        if criteres.get("auteur") and hasattr(index_texte, "estimer"): # Index de trigrammes du catalogue
+            cible = criteres["auteur"].strip().casefold()
+            acces.append((index_texte.estimer("auteur", cible), "auteur", lambda: index_texte.rechercher("auteur", cible)))
+        return sorted(acces, key=lambda element: element[0])
+
+    def rechercher(self, criteres, obtenir, index_texte=None):
+        """Méthode pour trouver les livres qui vérifient tous les critères d'une requête.
+
+        Args:
+            criteres (dict): Critères parmi `CRITERES` (None ou absent : critère ignoré).
+            obtenir (callable): Fonction qui renvoie le livre d'un ID.
+            index_texte (IndexTrigrammes): Index de trigrammes pour le critère sur l'auteur, le cas échéant.
+        Returns:
+            tuple: IDs des livres trouvés (croissants) et plan d'exécution, liste d'étapes
+                (nom du critère, "index", "intersection" ou "vérification", livres restants).
+        """
+        acces = self._acces(criteres, index_texte)
+        plan = []
+        if acces: # Candidats fournis par l'index le plus sélectif
+            _, nom, source = acces.pop(0)
+            candidats = set(source if isinstance(source, set) else source())
+            plan.append((nom, "index", len(candidats)))
+            appliques = {nom}
+        else: # Aucun critère indexé : parcours complet
+            candidats = self._disponibilites[True] | self._disponibilites[False]
+            plan.append(("catalogue", "parcours", len(candidats)))
+            appliques = set()
+        # Intersection avec les autres index par hachage
+        for _, nom, source in acces:
+            if isinstance(source, set):
+                candidats &= source
+                appliques.add(nom)
+                plan.append((nom, "intersection", len(candidats)))
+        # Vérification des critères restants sur les seuls candidats
+        for nom, predicat in self._predicats(criteres):
+            if nom not in appliques and candidats:
+                candidats = {id_livre for id_livre in candidats if predicat(obtenir(id_livre))}
+                plan.append((nom, "vérification", len(candidats)))
+        return sorted(candidats), plan
+
+    @staticmethod
+    def _predicats(criteres):
+        """Méthode pour obtenir les critères d'une requête sous forme de tests sur un livre."""
+        predicats = []
+        if criteres.get("genre") is not None:
+            genre = criteres["genre"].strip().casefold()
+            predicats.append(("genre", lambda livre: livre["genre"].casefold() == genre))
+        if criteres.get("disponible") is not None:
+            disponible = bool(criteres["disponible"])
+            predicats.append(("disponibilité", lambda livre: bool(livre["disponible"]) == disponible))
+        for nom, champ, minimum, maximum in (("année", "année_publication", "annee_min", "annee_max"), ("prix", "prix", "prix_min", "prix_max")):
+            bas, haut = criteres.get(minimum), criteres.get(maximum)
+            if bas is not None or haut is not None:
+                predicats.append((nom, lambda livre, champ=champ, bas=bas, haut=haut: (bas is None or livre[champ] >= bas) and (haut is None or livre[champ] <= haut)))
+        if criteres.get("auteur"):
+            auteur = criteres["auteur"].strip().casefold()
+            predicats.append(("auteur", lambda livre: auteur in livre["auteur"].casefold()))
+        if criteres.get("note_min") is not None: # Notes modifiées à chaque notation : pas d'index
+            note_min = criteres["note_min"]
+            predicats.append(("note", lambda livre: (note_moyenne(livre) or 0) >= note_min))
+        return predicats
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Sauvegarde
+Description : Écriture atomique de l'instantané `bibliotheque.json` (fichier temporaire
+              synchronisé puis renommé) et sauvegarde différée dans un fil d'exécution
+              séparé, qui regroupe les modifications rapprochées en un seul point de contrôle.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import json
+import os
+import threading
+import time
+from livre import Livre
+from chargement import CLE_LIVRES
+from journal import empreinte_instantane
+from cache_instantane import ecrire_cache
+from instrumentation import compter_octets
+
+# Définition des constantes
+DELAI_SAUVEGARDE = 2.0 # Secondes sans modification avant la sauvegarde différée
+DELAI_MAXIMAL = 30.0 # Secondes au plus entre la première modification et la sauvegarde
+
+
+# Définition des fonctions
+def synchroniser_dossier(chemin):
+    """Fonction pour rendre durable le renommage d'un fichier (synchronisation de son dossier).
+
+    Args:
+        chemin (str): Chemin du fichier renommé.
+    """
+    if not hasattr(os, "O_DIRECTORY"): # Windows : le renommage est journalisé par le système de fichiers
+        return
+    descripteur = os.open(os.path.dirname(os.path.abspath(chemin)), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descripteur)
+    finally:
+        os.close(descripteur)
+
+
+def ecrire_instantane_atomique(chemin, livres, remplacer=True, id_max=None):
+    """Fonction pour écrire un instantané JSON sans jamais laisser de fichier tronqué.
+
+    Les livres sont écrits dans `<chemin>.tmp`, synchronisé sur disque, qui remplace
+    ensuite l'instantané (`os.replace`) : un arrêt pendant l'écriture laisse l'ancien
+    instantané intact. L'instantané est un objet qui donne le plus grand ID attribué
+    (`id_max`) avant la liste des livres : un ID supprimé n'est pas réattribué, même si
+    le journal et le cache sont effacés.
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+        livres (iterable): Livres à écrire.
+        remplacer (bool): Renommer le fichier temporaire ; sinon l'appelant s'en charge.
+        id_max (int): Plus grand ID attribué, y compris à des livres supprimés (par défaut le plus grand ID écrit).
+    Returns:
+        str: Chemin du fichier temporaire (déjà renommé si `remplacer` est vrai).
+    Raises:
+        OSError: Si le fichier ne peut pas être écrit (le fichier temporaire est supprimé).
+    """
+    temporaire = chemin + ".tmp"
+    try:
+        with open(temporaire, "w", encoding="utf-8") as f:
+            livres = list(livres)
+            if id_max is None:
+                id_max = max((livre["id"] for livre in livres), default=0)
+            json.dump({"id_max": id_max, CLE_LIVRES: livres}, f, ensure_ascii=False, indent=4, default=Livre.en_dict)
+            f.flush()
+            os.fsync(f.fileno())
+        compter_octets("instantane", os.path.getsize(temporaire))
+        if remplacer:
+            os.replace(temporaire, chemin)
+            synchroniser_dossier(chemin)
+    except OSError:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+    return temporaire
+
+
+def _livre_fige(etat):
+    """Fonction pour recréer un livre à partir de son état copié (`Livre.__getstate__`)."""
+    livre = Livre.__new__(Livre)
+    livre.__setstate__(etat)
+    return livre
+
+
+def copier_catalogue(livres):
+    """Fonction pour copier l'état des livres avant d'écrire un instantané hors du fil qui modifie le catalogue.
+
+    Les emplacements laissés par les suppressions sont d'abord retirés. La copie ne prend
+    que quelques dizaines de millisecondes pour 100 000 livres ; l'écriture de
+    l'instantané, bien plus longue, peut ensuite se faire dans un autre fil d'exécution.
+
+    Args:
+        livres (Catalogue): Catalogue relié à son journal, qui ne doit pas changer pendant l'appel.
+    Returns:
+        tuple: (livres copiés, nombre d'opérations du journal intégrées, plus grand ID attribué).
+    """
+    livres.compacter()
+    etats = [livre.__getstate__() for livre in livres]
+    return map(_livre_fige, etats), livres.journal.nombre_entrees, livres.id_max
+
+
+def installer_instantane(chemin, temporaire, journal=None, entrees=0, id_max=0):
+    """Fonction pour remplacer l'instantané par un fichier temporaire complet, en faisant repartir le journal.
+
+    Le journal annonce d'abord l'empreinte du nouvel instantané et le nombre d'opérations
+    qu'il intègre (`Journal.marquer`) : quel que soit le moment d'un arrêt, le rejeu sait
+    quelles opérations l'instantané présent sur le disque contient déjà. L'appelant doit
+    être seul à écrire dans le journal pendant l'appel.
+
+    Args:
+        chemin (str): Chemin de l'instantané JSON.
+        temporaire (str): Fichier temporaire écrit par `ecrire_instantane_atomique(..., remplacer=False)`.
+        journal (Journal): Journal du catalogue, le cas échéant.
+        entrees (int): Nombre d'opérations du journal intégrées au nouvel instantané.
+        id_max (int): Plus grand ID attribué au moment de la copie.
+    Returns:
+        str: Empreinte du nouvel instantané, à réutiliser pour la clé du cache.
+    Raises:
+        OSError: Si l'instantané ne peut pas être remplacé (le fichier temporaire est supprimé).
+    """
+    try:
+        empreinte = empreinte_instantane(temporaire) # Conservée par le renommage
+        if journal is not None:
+            journal.marquer(empreinte, entrees, id_max)
+        os.replace(temporaire, chemin)
+        synchroniser_dossier(chemin)
+    except OSError:
+        if os.path.exists(temporaire):
+            os.remove(temporaire)
+        raise
+    if journal is not None:
+        journal.rebaser(empreinte, entrees, id_max) # Opérations faites pendant l'écriture conservées
+    return empreinte
+
+
+# Définition des classes
+class SauvegardeDifferee:
+    """Classe représentant la sauvegarde de l'instantané en arrière-plan (write-behind).
+
+    Chaque modification est déjà durable dans le journal ; la sauvegarde différée se
+    charge du point de contrôle (réécriture de l'instantané et remise à zéro du journal)
+    sans bloquer l'interface. Les demandes rapprochées sont regroupées : la sauvegarde a
+    lieu `DELAI_SAUVEGARDE` secondes après la dernière demande, et au plus tard
+    `DELAI_MAXIMAL` secondes après la première.
+
+    Le catalogue ne doit être modifié que sous `verrou` : la sauvegarde ne le prend que
+    pour copier l'état des livres (quelques dizaines de millisecondes pour 100 000
+    livres), puis écrit l'instantané sans le verrou.
+    """
+
+    def __init__(self, livres, chemin, delai=DELAI_SAUVEGARDE, delai_maximal=DELAI_MAXIMAL):
+        """Constructeur de la sauvegarde différée, dont le fil d'exécution démarre aussitôt.
+
+        Args:
+            livres (Catalogue): Catalogue relié à son journal.
+            chemin (str): Chemin de l'instantané JSON.
+            delai (float): Secondes sans nouvelle demande avant de sauvegarder.
+            delai_maximal (float): Secondes au plus entre la première demande et la sauvegarde.
+        """
+        self.livres = livres
+        self.chemin = chemin
+        self.delai = delai
+        self.delai_maximal = delai_maximal
+        self.verrou = threading.RLock() # Pris pour toute modification du catalogue
+        self.erreur = None # Dernière erreur d'écriture, la sauvegarde étant retentée à la demande suivante
+        self.sauvegardes = 0 # Nombre d'instantanés écrits en arrière-plan
+        self._condition = threading.Condition()
+        self._premiere_demande = None # Date (monotone) de la première demande en attente
+        self._derniere_demande = None
+        self._arret = False
+        self._sans_cache = None # Empreinte de l'instantané écrit en arrière-plan, sans son cache binaire
+        self._fil = threading.Thread(target=self._executer, name="sauvegarde-differee", daemon=True)
+        self._fil.start()
+
+    def demander(self):
+        """Méthode pour demander une sauvegarde, regroupée avec les demandes rapprochées."""
+        if getattr(self.livres, "stockage", None) is not None: # Moteur SQLite : rien à réécrire
+            return
+        with self._condition:
+            maintenant = time.monotonic()
+            if self._premiere_demande is None:
+                self._premiere_demande = maintenant
+            self._derniere_demande = maintenant
+            self._condition.notify()
+
+    def _executer(self):
+        while True:
+            with self._condition:
+                while not self._arret:
+                    if self._premiere_demande is None: # Aucune demande : attente
+                        self._condition.wait()
+                        continue
+                    echeance = min(self._derniere_demande + self.delai, self._premiere_demande + self.delai_maximal)
+                    attente = echeance - time.monotonic()
+                    if attente <= 0:
+                        break
+                    self._condition.wait(attente)
+                if self._arret:
+                    return
+                self._premiere_demande = self._derniere_demande = None
+            try:
+                self.point_de_controle()
+                self.erreur = None
+            except OSError as erreur: # Le journal reste complet : rien n'est perdu
+                self.erreur = erreur
+
+    def point_de_controle(self):
+        """Méthode pour intégrer le journal dans un nouvel instantané, sans bloquer les modifications.
+
+        Returns:
+            bool: True si un instantané a été écrit.
+        """
+        journal = self.livres.journal
+        with self.verrou: # Copie cohérente de l'état des livres
+            if journal is None or journal.nombre_entrees == 0:
+                return False
+            copie, entrees, id_max = copier_catalogue(self.livres)
+        temporaire = ecrire_instantane_atomique(self.chemin, copie, remplacer=False, id_max=id_max)
+        with self.verrou:
+            self._sans_cache = installer_instantane(self.chemin, temporaire, journal, entrees, id_max)
+        self.sauvegardes += 1
+        return True
+
+    def arreter(self):
+        """Méthode pour arrêter le fil d'exécution après la sauvegarde en cours.
+
+        Le cache binaire, que le fil d'exécution n'écrit pas, est mis à jour si le
+        catalogue correspond exactement au dernier instantané. La sauvegarde finale
+        (`sauvegarder_bibliotheque(..., forcer=True)`) reste à faire par l'appelant.
+        """
+        with self._condition:
+            self._arret = True
+            self._condition.notify()
+        self._fil.join()
+        journal = self.livres.journal
+        if self._sans_cache and journal is not None and journal.nombre_entrees == 0:
+            ecrire_cache(self.livres, self.chemin, self._sans_cache)
+            self._sans_cache = None
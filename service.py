@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Service multi-postes
+Description : Service local asyncio qui expose les opérations de la bibliothèque à de nombreux
+              postes simultanés (une requête JSON par ligne, sur un socket Unix ou en TCP
+              local), avec validation groupée des écritures, et client de test de charge.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import signal
+import time
+from operations import appliquer_operation, est_modification
+from bibliotheque import FICHIER_BIBLIOTHEQUE, MOTEUR_STOCKAGE, SEUIL_POINT_CONTROLE, charger_bibliotheque, chemin_journal, console, sauvegarder_bibliotheque
+from sauvegarde import copier_catalogue, ecrire_instantane_atomique, installer_instantane
+from stockage import MOTEURS
+
+# Définition des constantes
+CHEMIN_SOCKET = "bibliotheque.sock" # Socket Unix par défaut du service
+HOTE = "127.0.0.1" # Adresse d'écoute en TCP (postes de la même machine uniquement)
+
+
+# Définition des classes
+class ServiceBibliotheque:
+    """Classe représentant le service multi-postes de la bibliothèque.
+
+    Chaque requête est une ligne JSON au format de `appliquer_operation` (par exemple
+    `{"op": "emprunter", "id": 3}`) et reçoit une ligne JSON en réponse. Les opérations
+    s'exécutent dans la boucle asyncio, sans point d'attente entre la vérification et la
+    modification : l'emprunt et le retour sont des comparer-et-échanger atomiques par livre.
+
+    Les écritures sont validées par groupe : les modifications reçues pendant un même tour
+    de boucle sont rendues durables par une seule synchronisation (journal) ou une seule
+    transaction (SQLite), et chaque client ne reçoit sa réponse qu'une fois la sienne durable.
+    Le lot n'est ouvert qu'à la première modification du tour et fermé à sa fin : un
+    service inactif ne garde aucune transaction SQLite ouverte, et les autres postes
+    peuvent écrire dans la base.
+    Le point de contrôle (réécriture de l'instantané lorsque le journal atteint
+    `SEUIL_POINT_CONTROLE` opérations) est écrit dans un autre fil d'exécution, sans
+    retarder les validations.
+    """
+
+    def __init__(self, livres, chemin=FICHIER_BIBLIOTHEQUE):
+        """Constructeur du service.
+
+        Args:
+            livres (Catalogue): Catalogue chargé par `charger_bibliotheque`.
+            chemin (str): Chemin de l'instantané JSON du catalogue.
+        """
+        self.livres = livres
+        self.chemin = chemin
+        self.nombre_requetes = 0
+        self.nombre_validations = 0 # Nombre de validations groupées
+        self.nombre_points_de_controle = 0
+        self._lot = None # Lot d'écriture en cours sur le catalogue
+        self._validation = None # Validation groupée programmée, attendue par les clients
+        self._point_de_controle = None # Tâche du point de contrôle en cours
+
+    # Validation groupée
+    def _ouvrir_lot(self):
+        """Méthode pour ouvrir le lot du tour de boucle à la première modification, et programmer sa validation.
+
+        Returns:
+            Future: Validation du lot, terminée une fois ses modifications durables.
+        """
+        if self._lot is None:
+            lot = contextlib.ExitStack()
+            lot.enter_context(self.livres.lot()) # Transaction SQLite ouverte pour ce seul tour
+            self._lot = lot
+            boucle = asyncio.get_running_loop()
+            self._validation = boucle.create_future()
+            boucle.call_soon(self._valider) # Validation à la fin du tour
+        return self._validation
+
+    def _valider(self):
+        """Méthode pour rendre durables toutes les modifications du lot en cours, puis le refermer."""
+        if self._lot is None: # Lot déjà validé (arrêt du service)
+            return
+        lot, self._lot = self._lot, None
+        validation, self._validation = self._validation, None
+        try:
+            lot.close() # Synchronisation du journal ou validation de la transaction SQLite
+        except Exception as erreur:
+            validation.set_exception(erreur)
+        else:
+            validation.set_result(None)
+        finally:
+            self.nombre_validations += 1
+        journal = getattr(self.livres, "journal", None)
+        if journal is not None and journal.nombre_entrees >= SEUIL_POINT_CONTROLE and self._point_de_controle is None:
+            self._point_de_controle = asyncio.ensure_future(self._ecrire_point_de_controle())
+
+    async def _ecrire_point_de_controle(self):
+        """Méthode pour intégrer le journal dans un nouvel instantané sans bloquer la boucle.
+
+        La copie des livres et la mise à jour du journal se font dans la boucle, seule à
+        modifier le catalogue ; l'écriture de l'instantané se fait dans un fil d'exécution
+        du pool par défaut. Les opérations validées pendant l'écriture restent dans le journal.
+        """
+        try:
+            copie, entrees, id_max = copier_catalogue(self.livres)
+            temporaire = await asyncio.get_running_loop().run_in_executor(None, ecrire_instantane_atomique, self.chemin, copie, False, id_max)
+            installer_instantane(self.chemin, temporaire, self.livres.journal, entrees, id_max)
+            self.nombre_points_de_controle += 1
+        except OSError as erreur: # Le journal reste complet : le point de contrôle sera retenté
+            console.print(f"[red]Erreur : Impossible d'écrire le point de contrôle dans '{self.chemin}' ({erreur}).[/red]")
+        finally:
+            self._point_de_controle = None
+
+    async def _traiter(self, operation):
+        """Méthode pour appliquer une opération, et attendre qu'elle soit durable si elle modifie le catalogue."""
+        if not est_modification(operation): # Consultation : aucun lot
+            return appliquer_operation(self.livres, operation)
+        try:
+            validation = self._ouvrir_lot()
+        except Exception as erreur: # Base verrouillée par un autre poste au-delà du délai d'attente
+            return {"ok": False, "erreur": f"Stockage indisponible : {erreur}"}
+        reponse = appliquer_operation(self.livres, operation)
+        if reponse["ok"]:
+            await asyncio.shield(validation) # Réponse envoyée une fois la modification durable
+        return reponse
+
+    # Connexions
+    async def _servir_client(self, lecteur, ecrivain):
+        """Méthode pour traiter les requêtes d'un poste jusqu'à sa déconnexion."""
+        try:
+            while ligne := await lecteur.readline():
+                try:
+                    operation = json.loads(ligne)
+                except ValueError:
+                    reponse = {"ok": False, "erreur": "Requête illisible : une ligne JSON est attendue."}
+                else:
+                    reponse = await self._traiter(operation)
+                self.nombre_requetes += 1
+                ecrivain.write(json.dumps(reponse, ensure_ascii=False).encode("utf-8") + b"\n")
+                await ecrivain.drain()
+        except (ConnectionError, asyncio.IncompleteReadError): # Poste déconnecté brutalement
+            pass
+        finally:
+            ecrivain.close()
+
+    async def executer(self, chemin_socket=CHEMIN_SOCKET, port=None):
+        """Méthode pour lancer le service jusqu'à son interruption (Ctrl+C ou SIGTERM).
+
+        Args:
+            chemin_socket (str): Chemin du socket Unix, si aucun port n'est donné.
+            port (int): Port TCP local, à la place du socket Unix.
+        """
+        if port is not None:
+            serveur = await asyncio.start_server(self._servir_client, HOTE, port)
+            adresse = f"{HOTE}:{port}"
+        else:
+            with contextlib.suppress(FileNotFoundError): # Socket laissé par un arrêt précédent
+                os.remove(chemin_socket)
+            serveur = await asyncio.start_unix_server(self._servir_client, chemin_socket)
+            adresse = chemin_socket
+        console.print(f"[green]Service de la bibliothèque à l'écoute sur '{adresse}' ({len(self.livres)} livres).[/green]")
+        boucle, tache = asyncio.get_running_loop(), asyncio.current_task()
+        for signal_arret in (signal.SIGINT, signal.SIGTERM): # Arrêt propre, y compris lancé en arrière-plan
+            with contextlib.suppress(NotImplementedError): # Signaux non gérés par la boucle sous Windows
+                boucle.add_signal_handler(signal_arret, tache.cancel)
+        try:
+            async with serveur:
+                await serveur.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._point_de_controle is not None: # Point de contrôle en cours terminé avant la sauvegarde finale
+                await self._point_de_controle
+            self._valider() # Lot du dernier tour, s'il n'est pas encore validé
+            sauvegarder_bibliotheque(self.livres, self.chemin, forcer=True)
+            if port is None:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(chemin_socket)
+            console.print(f"[blue]Service arrêté : {self.nombre_requetes} requête(s), {self.nombre_validations} validation(s) groupée(s), {self.nombre_points_de_controle} point(s) de contrôle.[/blue]")
+
+
+# Définition des fonctions
+async def _ouvrir_connexion(chemin_socket, port):
+    if port is not None:
+        return await asyncio.open_connection(HOTE, port)
+    return await asyncio.open_unix_connection(chemin_socket)
+
+
+async def _envoyer(lecteur, ecrivain, operation):
+    ecrivain.write(json.dumps(operation, ensure_ascii=False).encode("utf-8") + b"\n")
+    return json.loads(await lecteur.readline())
+
+
+async def _poste_de_charge(chemin_socket, port, operations, resultats):
+    """Fonction pour simuler un poste qui envoie ses opérations l'une après l'autre."""
+    lecteur, ecrivain = await _ouvrir_connexion(chemin_socket, port)
+    try:
+        for operation in operations:
+            debut = time.perf_counter()
+            reponse = await _envoyer(lecteur, ecrivain, operation)
+            resultats.append((operation, reponse["ok"], time.perf_counter() - debut))
+    finally:
+        ecrivain.close()
+
+
+async def tester_charge(chemin_socket=CHEMIN_SOCKET, port=None, postes=50, requetes=20000, ids=range(1, 101), graine=0):
+    """Fonction pour mesurer le débit du service et vérifier l'atomicité des emprunts et retours.
+
+    Chaque poste envoie un mélange d'emprunts, de retours et de consultations sur les
+    mêmes livres. À la fin, l'état de chaque livre doit correspondre à son état initial
+    et au nombre d'emprunts et de retours acceptés : un double emprunt serait compté
+    comme une incohérence.
+
+    Args:
+        chemin_socket (str): Socket Unix du service.
+        port (int): Port TCP local du service, à la place du socket.
+        postes (int): Nombre de postes simultanés.
+        requetes (int): Nombre total de requêtes.
+        ids (range): IDs des livres sollicités (ils doivent exister).
+        graine (int): Graine du générateur aléatoire, pour un scénario reproductible.
+    Returns:
+        dict: `requetes`, `duree`, `requetes_par_seconde`, `acceptees`, `refusees`,
+            `latence_mediane`, `latence_p99` (secondes) et `incoherences`.
+    """
+    generateur = random.Random(graine)
+    ids = list(ids)
+    lecteur, ecrivain = await _ouvrir_connexion(chemin_socket, port)
+    initial = {id_livre: (await _envoyer(lecteur, ecrivain, {"op": "consulter", "id": id_livre}))["livre"]["disponible"] for id_livre in ids}
+    scenarios = [[{"op": generateur.choice(("emprunter", "retourner", "consulter")), "id": generateur.choice(ids)} for _ in range(requetes // postes)] for _ in range(postes)]
+
+    resultats = []
+    debut = time.perf_counter()
+    await asyncio.gather(*(_poste_de_charge(chemin_socket, port, scenario, resultats) for scenario in scenarios))
+    duree = time.perf_counter() - debut
+
+    # Vérification : chaque livre a alterné emprunts et retours acceptés
+    ecarts = dict.fromkeys(ids, 0)
+    for operation, accepte, _ in resultats:
+        if accepte and operation["op"] == "emprunter":
+            ecarts[operation["id"]] += 1
+        elif accepte and operation["op"] == "retourner":
+            ecarts[operation["id"]] -= 1
+    incoherences = 0
+    for id_livre in ids:
+        final = (await _envoyer(lecteur, ecrivain, {"op": "consulter", "id": id_livre}))["livre"]["disponible"]
+        attendu_valide = ecarts[id_livre] in ((0, 1) if initial[id_livre] else (0, -1))
+        if not attendu_valide or final != (initial[id_livre] if ecarts[id_livre] == 0 else not initial[id_livre]):
+            incoherences += 1
+    ecrivain.close()
+
+    latences = sorted(latence for _, _, latence in resultats)
+    acceptees = sum(1 for _, accepte, _ in resultats if accepte)
+    return {
+        "requetes": len(resultats),
+        "duree": duree,
+        "requetes_par_seconde": len(resultats) / duree if duree else 0.0,
+        "acceptees": acceptees,
+        "refusees": len(resultats) - acceptees,
+        "latence_mediane": latences[len(latences) // 2] if latences else 0.0,
+        "latence_p99": latences[int(len(latences) * 0.99)] if latences else 0.0,
+        "incoherences": incoherences,
+    }
+
+
+def main():
+    """Fonction principale : lancement du service ou du client de test de charge."""
+    analyseur = argparse.ArgumentParser(description="Service multi-postes de la bibliothèque numérique.")
+    sous_commandes = analyseur.add_subparsers(dest="commande", required=True)
+    serveur = sous_commandes.add_parser("serveur", help="Lancer le service")
+    serveur.add_argument("--moteur", choices=MOTEURS, default=MOTEUR_STOCKAGE, help="Moteur de stockage")
+    serveur.add_argument("--fichier", default=FICHIER_BIBLIOTHEQUE, help="Instantané JSON de la bibliothèque")
+    charge = sous_commandes.add_parser("charge", help="Tester la charge d'un service lancé")
+    charge.add_argument("--postes", type=int, default=50, help="Nombre de postes simultanés")
+    charge.add_argument("--requetes", type=int, default=20000, help="Nombre total de requêtes")
+    charge.add_argument("--livres", type=int, default=10, help="Nombre de livres sollicités (IDs 1 à N)")
+    for commande in (serveur, charge):
+        commande.add_argument("--socket", default=CHEMIN_SOCKET, help="Socket Unix du service")
+        commande.add_argument("--port", type=int, help="Port TCP local (à la place du socket Unix)")
+    arguments = analyseur.parse_args()
+
+    if arguments.commande == "serveur":
+        livres = charger_bibliotheque(arguments.fichier, chemin_journal(arguments.fichier), ignorer_corrompus=True, moteur=arguments.moteur)
+        with contextlib.suppress(KeyboardInterrupt):
+            asyncio.run(ServiceBibliotheque(livres, arguments.fichier).executer(arguments.socket, arguments.port))
+    else:
+        resultat = asyncio.run(tester_charge(arguments.socket, arguments.port, arguments.postes, arguments.requetes, range(1, arguments.livres + 1)))
+        console.print_json(json.dumps(resultat))
+
+
+# Programme principal
+if __name__ == "__main__":
+    main()
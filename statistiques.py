@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Statistiques
+Description : Agrégats du rapport (totaux, genres, extrêmes de prix et de notes) tenus à
+              jour à chaque modification du catalogue.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import heapq
+from notation import note_moyenne
+
+
+# Définition des classes
+class _TasParesseux:
+    """Classe représentant un tas binaire à suppression paresseuse.
+
+    Les entrées périmées (livre supprimé, valeur modifiée) restent dans le tas et sont
+    écartées lorsqu'elles arrivent au sommet ; le tas est reconstruit lorsqu'elles
+    deviennent majoritaires.
+    """
+
+    def __init__(self, est_valide):
+        """Constructeur du tas.
+
+        Args:
+            est_valide (callable): Fonction indiquant si une entrée est toujours à jour.
+        """
+        self._entrees = []
+        self._est_valide = est_valide
+
+    def ajouter(self, entree, nombre_valides):
+        """Méthode pour ajouter une entrée au tas.
+
+        Args:
+            entree (tuple): Entrée dont le premier élément est la clé de tri.
+            nombre_valides (int): Nombre d'entrées encore valides, pour décider d'un nettoyage.
+        """
+        heapq.heappush(self._entrees, entree)
+        if len(self._entrees) > 2 * nombre_valides + 64: # Trop d'entrées périmées : reconstruction
+            self._entrees = [e for e in self._entrees if self._est_valide(e)]
+            heapq.heapify(self._entrees)
+
+    def sommet(self):
+        """Méthode pour obtenir la plus petite entrée valide.
+
+        Returns:
+            tuple: L'entrée au sommet, ou None si le tas ne contient aucune entrée valide.
+        """
+        while self._entrees and not self._est_valide(self._entrees[0]):
+            heapq.heappop(self._entrees)
+        return self._entrees[0] if self._entrees else None
+
+
+class Statistiques:
+    """Classe représentant les statistiques du catalogue, tenues à jour de façon incrémentale.
+
+    L'objet est abonné au catalogue : chaque ajout, suppression, emprunt, retour ou note
+    met à jour les compteurs en O(log n), et la lecture d'une statistique ne parcourt
+    plus les livres. À valeur égale, les extrêmes renvoient le livre ajouté en premier,
+    comme `max` et `min` sur la liste.
+    """
+
+    def __init__(self, livres=()):
+        """Constructeur des statistiques.
+
+        Args:
+            livres (iterable): Livres déjà présents à prendre en compte.
+        """
+        self.total = 0
+        self.disponibles = 0
+        self.prix_total = 0.0
+        self.genres = {} # Genre → nombre de livres
+        self._ordre_genres = {} # Genre → ordre de première apparition
+        self._livres = {} # ID → (livre, ordre d'ajout)
+        self._notes = {} # ID → version de la moyenne de ses notes
+        self._compteur = 0
+        self._version_notes = 0 # Versions des moyennes, uniques pour tout le catalogue
+        self._tas_genres = _TasParesseux(self._entree_genre_valide)
+        self._tas_prix_max = _TasParesseux(self._entree_prix_valide)
+        self._tas_prix_min = _TasParesseux(self._entree_prix_valide)
+        self._tas_notes_max = _TasParesseux(self._entree_note_valide)
+        self._tas_notes_min = _TasParesseux(self._entree_note_valide)
+        for livre in livres:
+            self.ajouter(livre)
+
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if operation == "ajout":
+            self.ajouter(livre)
+        elif operation == "suppression":
+            self.retirer(livre)
+        elif operation == "emprunt":
+            self.disponibles -= 1
+        elif operation == "retour":
+            self.disponibles += 1
+        elif operation == "note":
+            self.noter(livre)
+
+    # Validité des entrées des tas (méthodes plutôt que lambdas : les statistiques sont mises en cache avec pickle)
+    def _entree_genre_valide(self, entree):
+        return self.genres.get(entree[2]) == -entree[0] and self._ordre_genres.get(entree[2]) == entree[1]
+
+    def _entree_prix_valide(self, entree):
+        present = self._livres.get(entree[2])
+        return present is not None and present[1] == entree[1]
+
+    def _entree_note_valide(self, entree):
+        return self._notes.get(entree[2]) == entree[3] # Seule la version courante de la moyenne est valide
+
+    # Mise à jour
+    def ajouter(self, livre):
+        """Méthode pour prendre en compte un nouveau livre.
+
+        Args:
+            livre (Livre): Livre ajouté.
+        """
+        id_livre, ordre = livre["id"], self._compteur
+        self._compteur += 1
+        self._livres[id_livre] = (livre, ordre)
+        self.total += 1
+        self.disponibles += 1 if livre["disponible"] else 0
+        self.prix_total += livre["prix"]
+        genre = livre["genre"]
+        self._ordre_genres.setdefault(genre, ordre)
+        self._changer_genre(genre, 1)
+        self._tas_prix_max.ajouter((-livre["prix"], ordre, id_livre), self.total)
+        self._tas_prix_min.ajouter((livre["prix"], ordre, id_livre), self.total)
+        if note_moyenne(livre) is not None:
+            self._pousser_note(livre)
+
+    def retirer(self, livre):
+        """Méthode pour prendre en compte la suppression d'un livre.
+
+        Args:
+            livre (Livre): Livre supprimé.
+        """
+        if self._livres.pop(livre["id"], None) is None: # Livre inconnu
+            return
+        self._notes.pop(livre["id"], None)
+        self.total -= 1
+        self.disponibles -= 1 if livre["disponible"] else 0
+        self.prix_total -= livre["prix"]
+        self._changer_genre(livre["genre"], -1)
+
+    def noter(self, livre):
+        """Méthode pour prendre en compte une nouvelle note, déjà ajoutée au livre.
+
+        Args:
+            livre (Livre): Livre noté.
+        """
+        self._pousser_note(livre) # Nouvelle version : les anciennes entrées des tas deviennent périmées
+
+    def _changer_genre(self, genre, delta):
+        nombre = self.genres.get(genre, 0) + delta
+        if nombre:
+            self.genres[genre] = nombre
+            self._tas_genres.ajouter((-nombre, self._ordre_genres[genre], genre), len(self.genres))
+        else: # Plus aucun livre de ce genre
+            del self.genres[genre]
+            del self._ordre_genres[genre]
+
+    def _pousser_note(self, livre):
+        id_livre, moyenne = livre["id"], note_moyenne(livre)
+        self._version_notes += 1
+        version = self._notes[id_livre] = self._version_notes
+        ordre = self._livres[id_livre][1]
+        self._tas_notes_max.ajouter((-moyenne, ordre, id_livre, version), len(self._notes))
+        self._tas_notes_min.ajouter((moyenne, ordre, id_livre, version), len(self._notes))
+
+    # Lecture
+    def genre_plus_represente(self):
+        """Méthode pour obtenir le genre comptant le plus de livres.
+
+        Returns:
+            str: Genre le plus représenté, ou None si le catalogue est vide.
+        """
+        sommet = self._tas_genres.sommet()
+        return None if sommet is None else sommet[2]
+
+    def _livre_au_sommet(self, tas):
+        sommet = tas.sommet()
+        return None if sommet is None else self._livres[sommet[2]][0]
+
+    def livre_plus_cher(self):
+        """Méthode pour obtenir le livre le plus cher (None si le catalogue est vide)."""
+        return self._livre_au_sommet(self._tas_prix_max)
+
+    def livre_moins_cher(self):
+        """Méthode pour obtenir le livre le moins cher (None si le catalogue est vide)."""
+        return self._livre_au_sommet(self._tas_prix_min)
+
+    def livre_plus_apprecie(self):
+        """Méthode pour obtenir le livre à la meilleure note moyenne (None si aucune note)."""
+        return self._livre_au_sommet(self._tas_notes_max)
+
+    def livre_moins_apprecie(self):
+        """Méthode pour obtenir le livre à la moins bonne note moyenne (None si aucune note)."""
+        return self._livre_au_sommet(self._tas_notes_min)
+
+    def note_moyenne(self, id_livre):
+        """Méthode pour obtenir la note moyenne d'un livre.
+
+        Args:
+            id_livre (int): ID du livre.
+        Returns:
+            float: Note moyenne, ou 0 si le livre n'a pas de note.
+        """
+        present = self._livres.get(id_livre)
+        return (present and note_moyenne(present[0])) or 0
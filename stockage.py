@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Stockage SQLite
+Description : Moteur de stockage SQLite (module standard `sqlite3`) : chaque modification du
+              catalogue est écrite dans une transaction, les emprunts et retours sont des
+              comparer-et-échanger, et la recherche, le filtre par genre et le rapport sont
+              calculés par des requêtes SQL indexées.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import contextlib
+import json
+import sqlite3
+from livre import CLES_ATTRIBUTS, Livre
+
+# Définition des constantes
+MOTEURS = ("json", "sqlite") # Moteurs de stockage disponibles ("json" par défaut)
+COLONNES = ("id", "titre", "auteur", "genre", "annee_publication", "prix", "disponible", "notes_1", "notes_2", "notes_3", "notes_4", "notes_5", "note_moyenne", "autres", "titre_cle", "auteur_cle", "genre_cle")
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS livres (
+    id INTEGER PRIMARY KEY,
+    titre TEXT NOT NULL,
+    auteur TEXT NOT NULL,
+    genre TEXT NOT NULL,
+    annee_publication INTEGER NOT NULL,
+    prix REAL NOT NULL,
+    disponible INTEGER NOT NULL,
+    notes_1 INTEGER NOT NULL DEFAULT 0,
+    notes_2 INTEGER NOT NULL DEFAULT 0,
+    notes_3 INTEGER NOT NULL DEFAULT 0,
+    notes_4 INTEGER NOT NULL DEFAULT 0,
+    notes_5 INTEGER NOT NULL DEFAULT 0,
+    note_moyenne REAL,
+    autres TEXT,
+    titre_cle TEXT NOT NULL,
+    auteur_cle TEXT NOT NULL,
+    genre_cle TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS livres_genre ON livres (genre_cle);
+CREATE INDEX IF NOT EXISTS livres_auteur ON livres (auteur_cle);
+CREATE INDEX IF NOT EXISTS livres_disponible ON livres (disponible);
+CREATE INDEX IF NOT EXISTS livres_prix ON livres (prix);
+CREATE INDEX IF NOT EXISTS livres_note ON livres (note_moyenne);
+CREATE TABLE IF NOT EXISTS compteurs (
+    nom TEXT PRIMARY KEY,
+    valeur INTEGER NOT NULL
+);
+"""
+CHAMPS_RECHERCHE = {"titre": "titre_cle", "auteur": "auteur_cle", "genre": "genre_cle"}
+# Somme des notes et nombre de notes, calculés par SQL à partir de la répartition (valeurs avant la mise à jour)
+NOTES_PONDEREES = "(notes_1 + 2 * notes_2 + 3 * notes_3 + 4 * notes_4 + 5 * notes_5)"
+NOTES_TOTAL = "(notes_1 + notes_2 + notes_3 + notes_4 + notes_5)"
+TAILLE_PAQUET = 500 # Nombre maximal d'IDs par requête `IN (...)`
+
+
+# Définition des fonctions
+def _ligne(livre):
+    """Fonction pour convertir un livre en ligne de la table `livres`, dans l'ordre de `COLONNES`."""
+    autres = {cle: livre[cle] for cle in livre.keys() if cle not in CLES_ATTRIBUTS}
+    return (
+        livre["id"], livre["titre"], livre["auteur"], livre["genre"], livre["année_publication"], livre["prix"], bool(livre["disponible"]),
+        *livre["repartition_notes"], livre["note_moyenne"], json.dumps(autres, ensure_ascii=False) if autres else None,
+        livre["titre"].casefold(), livre["auteur"].casefold(), livre["genre"].casefold(),
+    )
+
+
+def _livre(ligne):
+    """Fonction pour reconstruire un livre à partir d'une ligne de la table `livres`."""
+    livre = Livre(ligne[0], ligne[1], ligne[2], ligne[3], ligne[4], ligne[5], bool(ligne[6]), ligne[7:12], ligne[12])
+    if ligne[13]:
+        livre._autres = json.loads(ligne[13])
+    return livre
+
+
+# Définition des classes
+class StockageSQLite:
+    """Classe représentant le moteur de stockage SQLite de la bibliothèque.
+
+    L'objet est abonné au catalogue comme le journal : chaque modification est écrite
+    dans sa propre transaction, ou dans une seule transaction au sein de `lot()`. Il n'y
+    a donc ni instantané à réécrire ni journal à rejouer. Il remplace aussi l'index de
+    recherche (`rechercher`) et fournit le filtre par genre et les statistiques du
+    rapport par des requêtes indexées.
+    """
+
+    def __init__(self, chemin):
+        """Constructeur du stockage.
+
+        Args:
+            chemin (str): Chemin de la base SQLite (créée si nécessaire).
+        """
+        self.chemin = chemin
+        # Transactions gérées explicitement (BEGIN / COMMIT), mode WAL pour des lectures non bloquantes
+        self._connexion = sqlite3.connect(chemin, isolation_level=None)
+        self._connexion.execute("PRAGMA journal_mode = WAL")
+        self._connexion.execute("PRAGMA synchronous = FULL")
+        self._connexion.executescript(SCHEMA)
+        self._lot = 0 # Profondeur des lots en cours : la validation est alors différée
+        self._inseres = set() # IDs des livres déjà présents dans la base (`inserer`, `obtenir_livres`), dont l'ajout n'est pas réécrit
+        self._deja_ecrit = 0 # Profondeur des blocs `deja_ecrit()` : les notifications reçues ne sont pas réécrites
+        self._notes_lues = {} # Répartition et moyenne relues par `noter`, à reporter dans le catalogue
+
+    # Transactions
+    @contextlib.contextmanager
+    def transaction(self):
+        """Méthode (gestionnaire de contexte) pour exécuter un bloc dans une transaction.
+
+        La transaction est validée à la sortie du bloc, ou annulée en cas d'exception.
+        Au sein d'un `lot()`, le bloc fait partie de la transaction du lot.
+        """
+        if self._lot:
+            yield self._connexion
+            return
+        self._connexion.execute("BEGIN IMMEDIATE") # Verrou d'écriture pris dès le début
+        try:
+            yield self._connexion
+        except BaseException:
+            self._connexion.execute("ROLLBACK")
+            raise
+        self._connexion.execute("COMMIT")
+
+    @contextlib.contextmanager
+    def lot(self):
+        """Méthode (gestionnaire de contexte) pour regrouper plusieurs opérations en une seule transaction."""
+        with self.transaction():
+            self._lot += 1
+            try:
+                yield self
+            finally:
+                self._lot -= 1
+
+    @contextlib.contextmanager
+    def deja_ecrit(self):
+        """Méthode (gestionnaire de contexte) pour reporter dans le catalogue une modification déjà validée dans la base.
+
+        Les notifications reçues pendant le bloc ne sont pas réécrites dans la base.
+        """
+        self._deja_ecrit += 1
+        try:
+            yield self
+        finally:
+            self._deja_ecrit -= 1
+
+    # Écriture
+    def __call__(self, operation, livre, **details):
+        """Méthode appelée par le catalogue après chaque modification."""
+        if self._deja_ecrit: # Modification déjà validée par `supprimer`, `noter` ou `changer_disponibilite`
+            lue = self._notes_lues.pop(livre["id"], None) if operation == "note" else None
+            if lue is not None: # Catalogue remis à jour à partir de la base
+                self._reporter_notes(livre, lue)
+            return
+        if operation == "ajout" and livre["id"] in self._inseres: # Livre déjà validé dans la base par `inserer`
+            self._inseres.discard(livre["id"])
+            return
+        with self.transaction() as connexion:
+            if operation == "ajout":
+                connexion.execute(f"INSERT INTO livres ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})", _ligne(livre))
+                self._avancer_ids(connexion, livre["id"])
+            elif operation == "suppression":
+                connexion.execute("DELETE FROM livres WHERE id = ?", (livre["id"],))
+            elif operation in ("emprunt", "retour"): # Sans effet si `changer_disponibilite` l'a déjà écrit
+                disponible = operation == "retour"
+                connexion.execute("UPDATE livres SET disponible = ? WHERE id = ? AND disponible != ?", (disponible, livre["id"], disponible))
+            elif operation == "note": # Moyenne recalculée dans la base, qui tient compte des notes des autres postes
+                note = details["note"]
+                connexion.execute(f"UPDATE livres SET notes_{note} = notes_{note} + 1, note_moyenne = ({NOTES_PONDEREES} + ?) * 1.0 / ({NOTES_TOTAL} + 1) WHERE id = ?", (note, livre["id"]))
+                ligne = connexion.execute("SELECT notes_1, notes_2, notes_3, notes_4, notes_5, note_moyenne FROM livres WHERE id = ?", (livre["id"],)).fetchone()
+                if ligne is not None: # Catalogue remis à jour à partir de la base
+                    self._reporter_notes(livre, ligne)
+
+    @staticmethod
+    def _reporter_notes(livre, ligne):
+        for position, compte in enumerate(ligne[:5]):
+            livre["repartition_notes"][position] = compte
+        livre["note_moyenne"] = ligne[5]
+
+    def inserer(self, creer):
+        """Méthode pour insérer un nouveau livre dont l'ID est attribué par la base.
+
+        L'ID est pris dans le compteur partagé, dans la même transaction que l'insertion :
+        deux postes qui ajoutent un livre en même temps obtiennent des IDs différents. Le
+        livre n'est à ajouter au catalogue qu'une fois la méthode terminée, la transaction
+        étant alors validée ; la notification d'ajout qui suit ne l'insère pas une seconde fois.
+
+        Args:
+            creer (callable): Fonction qui reçoit l'ID attribué et renvoie le livre.
+        Returns:
+            Livre: Livre inséré.
+        Raises:
+            sqlite3.Error: Si l'insertion échoue (rien n'est alors écrit).
+        """
+        with self.transaction() as connexion:
+            livre = creer(self._reserver(connexion, 1)[0])
+            connexion.execute(f"INSERT INTO livres ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})", _ligne(livre))
+        self._inseres.add(livre["id"])
+        return livre
+
+    def supprimer(self, id_livre):
+        """Méthode pour supprimer un livre de la base avant de le retirer du catalogue.
+
+        Le catalogue n'est à modifier qu'une fois la méthode terminée, dans un bloc
+        `deja_ecrit()` : si la suppression échoue, il reste inchangé.
+
+        Args:
+            id_livre (int): ID du livre.
+        Raises:
+            sqlite3.Error: Si la suppression échoue (rien n'est alors écrit).
+        """
+        with self.transaction() as connexion:
+            connexion.execute("DELETE FROM livres WHERE id = ?", (id_livre,))
+
+    def noter(self, id_livre, note):
+        """Méthode pour ajouter une note à un livre dans la base avant de l'ajouter au catalogue.
+
+        La moyenne est recalculée dans la base, qui tient compte des notes des autres postes ;
+        la répartition relue est reportée dans le catalogue lors de la notification reçue
+        dans le bloc `deja_ecrit()` qui suit.
+
+        Args:
+            id_livre (int): ID du livre.
+            note (int): Note à ajouter (1 à 5).
+        Raises:
+            sqlite3.Error: Si la mise à jour échoue (rien n'est alors écrit).
+        """
+        with self.transaction() as connexion:
+            connexion.execute(f"UPDATE livres SET notes_{note} = notes_{note} + 1, note_moyenne = ({NOTES_PONDEREES} + ?) * 1.0 / ({NOTES_TOTAL} + 1) WHERE id = ?", (note, id_livre))
+            ligne = connexion.execute("SELECT notes_1, notes_2, notes_3, notes_4, notes_5, note_moyenne FROM livres WHERE id = ?", (id_livre,)).fetchone()
+        if ligne is not None:
+            self._notes_lues[id_livre] = ligne
+
+    def reserver_ids(self, nombre):
+        """Méthode pour attribuer un bloc d'IDs consécutifs à partir du compteur partagé de la base.
+
+        Args:
+            nombre (int): Nombre d'IDs à réserver.
+        Returns:
+            range: IDs réservés, qu'aucun autre poste ne peut plus obtenir.
+        """
+        with self.transaction() as connexion:
+            return self._reserver(connexion, nombre)
+
+    def _reserver(self, connexion, nombre):
+        premier = self.id_max() + 1 # Lu sous le verrou d'écriture de la transaction
+        self._avancer_ids(connexion, premier + nombre - 1)
+        return range(premier, premier + nombre)
+
+    def importer(self, livres, id_max=0):
+        """Méthode pour insérer des livres en une seule transaction (création de la base).
+
+        Args:
+            livres (iterable): Livres à insérer.
+            id_max (int): Plus grand ID déjà attribué, y compris à des livres supprimés.
+        Returns:
+            int: Nombre de livres insérés.
+        """
+        with self.transaction() as connexion:
+            curseur = connexion.executemany(f"INSERT OR REPLACE INTO livres ({', '.join(COLONNES)}) VALUES ({', '.join('?' * len(COLONNES))})", map(_ligne, livres))
+            self._avancer_ids(connexion, id_max)
+            return curseur.rowcount
+
+    @staticmethod
+    def _avancer_ids(connexion, id_livre):
+        connexion.execute("INSERT INTO compteurs (nom, valeur) VALUES ('id_max', ?) ON CONFLICT (nom) DO UPDATE SET valeur = max(valeur, excluded.valeur)", (id_livre,))
+
+    def changer_disponibilite(self, id_livre, disponible):
+        """Méthode pour emprunter (False) ou retourner (True) un livre de façon atomique.
+
+        La mise à jour n'a lieu que si le livre est dans l'état inverse : deux postes
+        partageant la base ne peuvent pas emprunter le même exemplaire.
+
+        Args:
+            id_livre (int): ID du livre.
+            disponible (bool): Nouvelle disponibilité.
+        Returns:
+            bool: True si la disponibilité a changé, False si le livre était déjà dans cet état (ou absent).
+        """
+        with self.transaction() as connexion:
+            curseur = connexion.execute("UPDATE livres SET disponible = ? WHERE id = ? AND disponible = ?", (disponible, id_livre, not disponible))
+            return curseur.rowcount == 1
+
+    # Lecture
+    def id_max(self):
+        """Méthode pour obtenir le plus grand ID attribué, y compris à des livres supprimés depuis.
+
+        Returns:
+            int: Plus grand ID attribué (0 si aucun).
+        """
+        ligne = self._connexion.execute("SELECT max(coalesce((SELECT valeur FROM compteurs WHERE nom = 'id_max'), 0), coalesce((SELECT max(id) FROM livres), 0))").fetchone()
+        return ligne[0]
+
+    def est_vide(self):
+        """Méthode pour savoir si la base ne contient encore aucun livre."""
+        return self._connexion.execute("SELECT NOT EXISTS (SELECT 1 FROM livres)").fetchone()[0] == 1
+
+    def __iter__(self):
+        """Méthode pour parcourir tous les livres de la base, par ID croissant."""
+        curseur = self._connexion.execute(f"SELECT {', '.join(COLONNES[:14])} FROM livres ORDER BY id")
+        return map(_livre, curseur)
+
+    def rechercher(self, champ, cible):
+        """Méthode pour rechercher les livres dont le champ contient la valeur cible.
+
+        Même interface que `IndexTrigrammes.rechercher` : la comparaison porte sur les
+        valeurs normalisées (`casefold`) stockées dans la base.
+
+        Args:
+            champ (str): "titre", "auteur" ou "genre".
+            cible (str): Valeur recherchée, déjà normalisée.
+        Returns:
+            list: IDs des livres correspondants, par ID croissant.
+        """
+        colonne = CHAMPS_RECHERCHE[champ]
+        curseur = self._connexion.execute(f"SELECT id FROM livres WHERE instr({colonne}, ?) > 0 ORDER BY id", (cible,))
+        return [id_livre for id_livre, in curseur]
+
+    def filtrer_genre(self, genre_cible):
+        """Méthode pour obtenir les livres d'un genre, par l'index sur le genre.
+
+        Args:
+            genre_cible (str): Genre recherché, déjà normalisé (`casefold`).
+        Returns:
+            list: IDs des livres du genre, par ID croissant.
+        """
+        curseur = self._connexion.execute("SELECT id FROM livres WHERE genre_cle = ? ORDER BY id", (genre_cible,))
+        return [id_livre for id_livre, in curseur]
+
+    def obtenir_livres(self, livres, ids):
+        """Méthode pour obtenir les livres du catalogue correspondant aux IDs renvoyés par une requête.
+
+        Les livres ajoutés à la base par un autre poste depuis le chargement sont lus dans la
+        base et ajoutés au catalogue, sans être réinsérés ; les IDs introuvables sont ignorés.
+
+        Args:
+            livres (Catalogue): Catalogue abonné au stockage.
+            ids (list): IDs des livres, dans l'ordre voulu.
+        Returns:
+            list: Livres correspondants, dans l'ordre des IDs.
+        """
+        manquants = [id_livre for id_livre in ids if not livres.contient_id(id_livre)]
+        for debut in range(0, len(manquants), TAILLE_PAQUET): # Lecture par paquets (nombre de paramètres limité)
+            paquet = manquants[debut:debut + TAILLE_PAQUET]
+            curseur = self._connexion.execute(f"SELECT {', '.join(COLONNES[:14])} FROM livres WHERE id IN ({', '.join('?' * len(paquet))}) ORDER BY id", paquet)
+            for livre in map(_livre, curseur.fetchall()):
+                self._inseres.add(livre["id"]) # Déjà dans la base : la notification d'ajout ne l'écrit pas
+                livres.append(livre)
+                livres.avancer_ids(livre["id"])
+        return [livres.get(id_livre) for id_livre in ids if livres.contient_id(id_livre)]
+
+    def synchroniser(self):
+        """Méthode pour intégrer le journal WAL à la base (point de contrôle SQLite)."""
+        self._connexion.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def fermer(self):
+        """Méthode pour fermer la connexion à la base."""
+        self._connexion.close()
+
+
+class StatistiquesSQLite:
+    """Classe représentant les statistiques du rapport, calculées par SQL à chaque lecture.
+
+    Même interface que `Statistiques` : les extrêmes sont obtenus par les index sur le
+    prix et la note, puis renvoyés sous forme de livres du catalogue.
+    """
+
+    def __init__(self, stockage, livres):
+        """Constructeur des statistiques.
+
+        Args:
+            stockage (StockageSQLite): Base interrogée.
+            livres (Catalogue): Catalogue dont les livres sont renvoyés.
+        """
+        self._stockage = stockage
+        self._livres = livres
+
+    def _valeur(self, requete):
+        return self._stockage._connexion.execute(requete).fetchone()
+
+    def _livre(self, requete):
+        ligne = self._valeur(requete)
+        trouves = self._stockage.obtenir_livres(self._livres, [ligne[0]]) if ligne else []
+        return trouves[0] if trouves else None
+
+    @property
+    def total(self):
+        return self._valeur("SELECT COUNT(*) FROM livres")[0]
+
+    @property
+    def disponibles(self):
+        return self._valeur("SELECT COUNT(*) FROM livres WHERE disponible")[0]
+
+    @property
+    def prix_total(self):
+        return self._valeur("SELECT TOTAL(prix) FROM livres")[0]
+
+    def genre_plus_represente(self):
+        """Méthode pour obtenir le genre comptant le plus de livres (le premier apparu en cas d'égalité)."""
+        ligne = self._valeur("SELECT genre FROM livres GROUP BY genre ORDER BY COUNT(*) DESC, MIN(id) LIMIT 1")
+        return ligne[0] if ligne else None
+
+    def livre_plus_cher(self):
+        """Méthode pour obtenir le livre le plus cher."""
+        return self._livre("SELECT id FROM livres ORDER BY prix DESC, id LIMIT 1")
+
+    def livre_moins_cher(self):
+        """Méthode pour obtenir le livre le moins cher."""
+        return self._livre("SELECT id FROM livres ORDER BY prix, id LIMIT 1")
+
+    def livre_plus_apprecie(self):
+        """Méthode pour obtenir le livre à la meilleure note moyenne (livres notés uniquement)."""
+        return self._livre("SELECT id FROM livres WHERE note_moyenne IS NOT NULL ORDER BY note_moyenne DESC, id LIMIT 1")
+
+    def livre_moins_apprecie(self):
+        """Méthode pour obtenir le livre à la moins bonne note moyenne (livres notés uniquement)."""
+        return self._livre("SELECT id FROM livres WHERE note_moyenne IS NOT NULL ORDER BY note_moyenne, id LIMIT 1")
+
+    def note_moyenne(self, id_livre):
+        """Méthode pour obtenir la note moyenne d'un livre.
+
+        Args:
+            id_livre (int): ID du livre, ou None.
+        Returns:
+            float: Note moyenne, ou 0 si le livre n'a pas de note.
+        """
+        ligne = self._stockage._connexion.execute("SELECT note_moyenne FROM livres WHERE id = ?", (id_livre,)).fetchone()
+        return ligne[0] if ligne and ligne[0] is not None else 0
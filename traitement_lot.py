@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module : Bibliothèque Numérique - Traitement par lot
+Description : Application sans interaction d'un flux d'opérations (JSON Lines ou CSV), par
+              exemple la feuille des prêts de la journée, avec une seule sauvegarde pour tout
+              le lot, le résultat de chaque opération et le débit obtenu.
+Auteur : Cédric MARIYA CONSTANTINE
+Date : 2025
+"""
+
+# Importation des modules nécessaires
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+from operations import appliquer_operation
+from bibliotheque import FICHIER_BIBLIOTHEQUE, MOTEUR_STOCKAGE, charger_bibliotheque, chemin_journal, console, sauvegarder_bibliotheque
+from stockage import MOTEURS
+
+# Définition des constantes
+ENTREE_STANDARD = "-"
+
+
+# Définition des fonctions
+def lire_operations(fichier, format_source):
+    """Fonction pour lire les opérations d'un flux, une par ligne, sans le charger entièrement.
+
+    En CSV, la première ligne donne les colonnes (`op`, `id`, `note`, `titre`...) et les
+    cellules vides sont ignorées.
+
+    Args:
+        fichier (file): Flux texte ouvert en lecture.
+        format_source (str): "jsonl" ou "csv".
+    Yields:
+        tuple: (numéro de ligne, opération). L'opération vaut None si la ligne est illisible.
+    """
+    if format_source == "csv":
+        for numero, ligne in enumerate(csv.DictReader(fichier), start=2): # La ligne 1 est l'en-tête
+            yield numero, {cle: valeur for cle, valeur in ligne.items() if cle and valeur not in (None, "")}
+        return
+    for numero, ligne in enumerate(fichier, start=1):
+        if ligne.strip():
+            try:
+                yield numero, json.loads(ligne)
+            except ValueError:
+                yield numero, None
+
+
+def traiter_operations(livres, operations, resultats, chemin=FICHIER_BIBLIOTHEQUE):
+    """Fonction pour appliquer un flux d'opérations au catalogue, en un seul lot.
+
+    Les écritures sont regroupées (`Catalogue.lot()`) : le journal n'est synchronisé, ou
+    la transaction SQLite validée, qu'une seule fois à la fin du lot, puis la
+    bibliothèque est sauvegardée une seule fois.
+
+    Args:
+        livres (Catalogue): Catalogue des livres.
+        operations (iterable): Couples (numéro de ligne, opération) de `lire_operations`.
+        resultats (file): Flux texte où écrire le résultat de chaque opération (JSON Lines).
+        chemin (str): Chemin de l'instantané JSON d'où le catalogue a été chargé.
+    Returns:
+        dict: Résumé (`operations`, `reussies`, `echouees`, `duree`, `operations_par_seconde`).
+    """
+    debut = time.perf_counter()
+    nombre = reussies = 0
+    with livres.lot():
+        for numero, operation in operations:
+            if operation is None:
+                resultat = {"ok": False, "erreur": "Ligne illisible : un objet JSON est attendu."}
+            else:
+                resultat = appliquer_operation(livres, operation)
+            nombre += 1
+            reussies += resultat["ok"]
+            operation_nom = operation.get("op") if isinstance(operation, dict) else None
+            resultats.write(json.dumps({"ligne": numero, "op": operation_nom, **resultat}, ensure_ascii=False) + "\n")
+    sauvegarder_bibliotheque(livres, chemin, forcer=True) # Une seule sauvegarde pour tout le lot
+    duree = time.perf_counter() - debut
+    return {
+        "operations": nombre,
+        "reussies": reussies,
+        "echouees": nombre - reussies,
+        "duree": duree,
+        "operations_par_seconde": nombre / duree if duree else 0.0,
+    }
+
+
+def main():
+    """Fonction principale : application d'un fichier d'opérations en ligne de commande."""
+    analyseur = argparse.ArgumentParser(description="Applique un lot d'opérations (JSON Lines ou CSV) à la bibliothèque, sans confirmation.")
+    analyseur.add_argument("source", help="Fichier d'opérations (.jsonl ou .csv), ou '-' pour l'entrée standard")
+    analyseur.add_argument("--format", choices=("jsonl", "csv"), help="Format du fichier (déduit de l'extension par défaut)")
+    analyseur.add_argument("--resultats", help="Fichier des résultats (par défaut <source>.resultats.jsonl, '-' pour la sortie standard)")
+    analyseur.add_argument("--moteur", choices=MOTEURS, default=MOTEUR_STOCKAGE, help="Moteur de stockage")
+    analyseur.add_argument("--fichier", default=FICHIER_BIBLIOTHEQUE, help="Instantané JSON de la bibliothèque")
+    arguments = analyseur.parse_args()
+    format_source = arguments.format or ("csv" if arguments.source.lower().endswith(".csv") else "jsonl")
+    chemin_resultats = arguments.resultats or ("-" if arguments.source == ENTREE_STANDARD else arguments.source + ".resultats.jsonl")
+
+    if chemin_resultats == "-": # Les messages passent sur la sortie d'erreur pour ne pas se mêler aux résultats
+        console.stderr = True
+    livres = charger_bibliotheque(arguments.fichier, chemin_journal(arguments.fichier), ignorer_corrompus=True, moteur=arguments.moteur)
+    with contextlib.ExitStack() as pile:
+        if arguments.source == ENTREE_STANDARD:
+            source = sys.stdin
+        else:
+            source = pile.enter_context(open(arguments.source, "r", encoding="utf-8", newline=""))
+        if chemin_resultats == "-":
+            resultats = sys.stdout
+        else:
+            resultats = pile.enter_context(open(chemin_resultats, "w", encoding="utf-8"))
+        resume = traiter_operations(livres, lire_operations(source, format_source), resultats, arguments.fichier)
+    console.print(f"[green]{resume['reussies']} opération(s) réussie(s)[/green], [red]{resume['echouees']} échouée(s)[/red] sur {resume['operations']} en {resume['duree']:.2f} s ({resume['operations_par_seconde']:.0f} opérations/s).")
+    if chemin_resultats != "-":
+        console.print(f"Résultat de chaque opération : {chemin_resultats}")
+
+
+# Programme principal
+if __name__ == "__main__":
+    main()